@@ -0,0 +1,108 @@
+"""Import-time report for the application's startup path.
+
+Run with: python -m benchmarks.bench_import
+Each run imports the target module in a fresh interpreter under ``-X importtime`` and
+the report shows the median over runs. --save and --compare work as in bench_search,
+so import cost can be tracked against a baseline as the project grows.
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .stats import Results, compare
+
+IMPORT_TARGET = "main"
+IMPORT_RUNS = 5
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+ImportRecord = Tuple[str, int, int, int]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parses -X importtime output into (module, self us, cumulative us, depth) records."""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def run_importtime(module: str) -> List[ImportRecord]:
+    """Imports module in a fresh interpreter and returns its import records."""
+    root = Path(__file__).resolve().parent.parent
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=root, capture_output=True, text=True)
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        raise RuntimeError(f"Importing {module} failed: {error[-1] if error else completed.returncode}")
+    return parse_importtime(completed.stderr)
+
+
+def measure_imports(module: str, runs: int) -> Results:
+    """Returns median self time per module, per top-level package and in total."""
+    samples: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        per_key: Dict[str, float] = {}
+        for name, self_us, _, _ in run_importtime(module):
+            package = name.split(".")[0]
+            per_key[f"module/{name}"] = per_key.get(f"module/{name}", 0) + self_us
+            per_key[f"package/{package}"] = per_key.get(f"package/{package}", 0) + self_us
+            per_key["total"] = per_key.get("total", 0) + self_us
+        for key, value in per_key.items():
+            samples.setdefault(key, []).append(value)
+
+    return {key: {"self_us": statistics.median(values)} for key, values in samples.items()}
+
+
+def print_report(results: Results, top: int) -> None:
+    """Prints the total and the most expensive packages and modules."""
+    total = results.get("total", {}).get("self_us", 0.0)
+    print(f"Total import time: {total / 1000:.1f} ms\n")
+
+    for kind in ("package", "module"):
+        entries = sorted(((key.split("/", 1)[1], result["self_us"]) for key, result in results.items()
+                          if key.startswith(f"{kind}/")), key=lambda entry: entry[1], reverse=True)
+        print(f"{kind:<40} {'self ms':>9} {'share':>7}")
+        for name, self_us in entries[:top]:
+            share = self_us / total if total else 0.0
+            print(f"{name:<40} {self_us / 1000:>9.1f} {share:>7.1%}")
+        print()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=IMPORT_TARGET, help="module to import")
+    parser.add_argument("--runs", type=int, default=IMPORT_RUNS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    results = measure_imports(args.module, args.runs)
+    print_report(results, args.top)
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        tracked = {key: result for key, result in results.items() if not key.startswith("module/")}
+        print(f"Comparing self_us against {args.compare} (threshold {args.threshold:.0%})")
+        regressions = compare(tracked, baseline, "self_us", args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
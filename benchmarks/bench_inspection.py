@@ -0,0 +1,73 @@
+"""Compares sequential and batched window inspection on the fake backend.
+
+Run with: python -m benchmarks.bench_inspection --windows 500 --process-latency 0.0005
+Cold passes drop the process cache first, as on the first enumeration after launch or
+after every cached entry has expired; warm passes reuse it.
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.window import Window
+from src.core.window_manager import WindowManager
+
+from .stats import summarize
+
+
+def _manager(source: FakeWindowSource, workers: int) -> WindowManager:
+    """Returns a polling-free manager over the source with the given inspection workers."""
+    return WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                         frecency=FrecencyStore(), use_warm_start=False, inspection_workers=workers)
+
+
+def time_passes(manager: WindowManager, repeats: int, cold: bool) -> Dict[str, float]:
+    """Times repeated enumeration passes, optionally with an empty process cache."""
+    latencies: List[float] = []
+    for _ in range(repeats):
+        if cold:
+            manager.process_cache.invalidate()
+        start = time.perf_counter()
+        manager._get_windows_now()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def _fields(windows: List[Window]) -> List[tuple]:
+    return [(w.handle, w.title, w.process_id, w.process_name) for w in windows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=500)
+    parser.add_argument("--noise-ratio", type=float, default=1.0, help="hidden/filtered windows per app window")
+    parser.add_argument("--process-latency", type=float, default=0.0005, help="seconds per process lookup")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = FakeWindowSource(seed=args.seed, process_latency=args.process_latency)
+    source.populate(args.windows, noise_ratio=args.noise_ratio)
+
+    expected = _fields(_manager(source, 0)._get_windows_now())
+    print(f"{source.window_count} handles, {len(expected)} listed, "
+          f"{len(source.list_process_ids())} processes, {args.process_latency * 1e3:.2f} ms per lookup")
+    print(f"{'workers':>7} {'cache':>6} {'p50 ms':>9} {'p95 ms':>9} {'speedup':>8}")
+
+    baseline: Dict[bool, float] = {}
+    for workers in args.workers:
+        manager = _manager(source, workers)
+        if _fields(manager._get_windows_now()) != expected:
+            raise SystemExit(f"{workers} workers produced a different window list")
+        for cold in (True, False):
+            result = time_passes(manager, args.repeats, cold)
+            baseline.setdefault(cold, result["p50_us"])
+            speedup = baseline[cold] / result["p50_us"] if result["p50_us"] else 0.0
+            print(f"{workers:>7} {'cold' if cold else 'warm':>6} {result['p50_us'] / 1e3:>9.2f} "
+                  f"{result['p95_us'] / 1e3:>9.2f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compares a script enumerating windows itself with queries to the IPC server.
+
+Run with: python -m benchmarks.bench_ipc --windows 500 --queries 200
+Each typed prefix of the sample queries is one request. "enumerate" builds a fresh
+manager and enumerates per request, as a script without the server would; "ipc"
+sends one request per prefix over a persistent connection; "batch" sends the
+prefixes of each query in one frame.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.ipc_client import IpcClient
+from src.core.ipc_server import IpcServer
+from src.core.search_engine import search_windows
+from src.core.window_manager import WindowManager
+
+from .stats import summarize
+
+QUERIES = ["chrome", "code main", "term", "slack", "readme", "zz"]
+
+
+def _manager(source: FakeWindowSource) -> WindowManager:
+    """Returns a polling-free manager over the source."""
+    return WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                         frecency=FrecencyStore(), use_warm_start=False)
+
+
+def _address() -> str:
+    """Returns a private address so the benchmark never meets a running instance."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\tabber-bench-{os.getpid()}"
+    return os.path.join(tempfile.gettempdir(), f"tabber-bench-{os.getpid()}.sock")
+
+
+def _prefixes() -> List[List[str]]:
+    return [[query[:end] for end in range(1, len(query) + 1)] for query in QUERIES]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200, help="requests timed per mode")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = FakeWindowSource(seed=args.seed)
+    source.populate(args.windows)
+    manager = _manager(source)
+    manager.get_all_windows(force_refresh=True)
+    sequences = _prefixes()
+
+    latencies: List[float] = []
+    while len(latencies) < args.queries:
+        for prefixes in sequences:
+            for prefix in prefixes:
+                start = time.perf_counter()
+                search_windows(_manager(source)._get_windows_now(), prefix, limit=args.limit)
+                latencies.append(time.perf_counter() - start)
+    results = {"enumerate": summarize(latencies)}
+
+    server = IpcServer(manager, address=_address())
+    server.start()
+    try:
+        with IpcClient(server.address) as client:
+            latencies = []
+            while len(latencies) < args.queries:
+                for prefixes in sequences:
+                    for prefix in prefixes:
+                        start = time.perf_counter()
+                        client.search(prefix, limit=args.limit)
+                        latencies.append(time.perf_counter() - start)
+            results["ipc"] = summarize(latencies)
+
+            latencies = []
+            while len(latencies) < args.queries:
+                for prefixes in sequences:
+                    start = time.perf_counter()
+                    client.batch([("search", {"query": prefix, "limit": args.limit}) for prefix in prefixes])
+                    elapsed = (time.perf_counter() - start) / len(prefixes)
+                    latencies.extend([elapsed] * len(prefixes))
+            results["batch"] = summarize(latencies)
+    finally:
+        server.stop()
+
+    print(f"{len(manager.get_all_windows())} windows, limit {args.limit}")
+    print(f"{'mode':<10} {'p50 us':>10} {'p95 us':>10} {'req/s':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['p50_us']:>10.1f} {result['p95_us']:>10.1f} {result['ops_per_sec']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compares rebuilding the results list per keystroke with the diffing results model.
+
+Run with: python -m benchmarks.bench_results_view --limits 3 10 50
+Each keystroke's results are computed up front, so only the list update, layout and
+repaint are timed. Rows painted counts delegate paint calls, the repaint work the
+update caused. Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+from PyQt5.QtWidgets import QApplication, QListView, QListWidget, QListWidgetItem, QStyledItemDelegate
+
+from src.core.search_engine import SearchCache
+from src.core.search_index import SearchIndex
+from src.core.window import Window
+from src.ui.results_model import ROW_HEIGHT, HandleRole, ResultsModel, format_title
+
+from .corpus import KEYSTROKE_SESSIONS, generate_corpus, replay
+from .stats import summarize
+
+LIST_WIDTH = 480
+LIST_MAX_HEIGHT = 300
+
+
+class CountingDelegate(QStyledItemDelegate):
+    """Item delegate that counts the rows it paints."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.painted = 0
+
+    def paint(self, painter, option, index) -> None:
+        self.painted += 1
+        super().paint(painter, option, index)
+
+
+class RebuiltList:
+    """The previous design: clear the QListWidget and add one item per result."""
+
+    def __init__(self):
+        self.view = QListWidget()
+        self.delegate = CountingDelegate(self.view)
+        self.view.setItemDelegate(self.delegate)
+
+    def update(self, windows: List[Window]) -> None:
+        self.view.clear()
+        for window in windows:
+            item = QListWidgetItem(format_title(window))
+            item.setData(HandleRole, window.handle)
+            self.view.addItem(item)
+        self.view.resize(LIST_WIDTH, min(len(windows) * ROW_HEIGHT + 10, LIST_MAX_HEIGHT))
+        if windows:
+            self.view.setCurrentRow(0)
+
+
+class ModelList:
+    """A QListView over ResultsModel with uniform, fixed-height rows."""
+
+    def __init__(self):
+        self.model = ResultsModel()
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.delegate = CountingDelegate(self.view)
+        self.view.setItemDelegate(self.delegate)
+
+    def update(self, windows: List[Window]) -> None:
+        self.model.set_windows(windows)
+        height = min(len(windows) * ROW_HEIGHT + 10, LIST_MAX_HEIGHT)
+        if self.view.height() != height:
+            self.view.resize(LIST_WIDTH, height)
+        if windows and self.view.currentIndex().row() != 0:
+            self.view.setCurrentIndex(self.model.index(0))
+
+
+def keystroke_results(size: int, limit: int, seed: int) -> List[List[Window]]:
+    """Returns the results of every keystroke in every recorded session."""
+    index = SearchIndex(generate_corpus(size, seed), 1)
+    cache = SearchCache()
+    return [cache.search(index, query, limit=limit)
+            for session in KEYSTROKE_SESSIONS for query in replay(session) if query.strip()]
+
+
+def time_updates(app: QApplication, target, results: List[List[Window]], repeats: int) -> Dict[str, float]:
+    """Times each update plus the event processing that lays out and paints it."""
+    target.view.show()
+    clock = time.perf_counter
+    latencies: List[float] = []
+    target.delegate.painted = 0
+    for _ in range(repeats):
+        for windows in results:
+            start = clock()
+            target.update(windows)
+            app.processEvents()
+            latencies.append(clock() - start)
+    summary = summarize(latencies)
+    summary["rows_painted"] = target.delegate.painted / max(1, len(latencies))
+    target.view.hide()
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[3, 10, 50])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    print(f"{'list':<10} {'limit':>5} {'p50 us':>9} {'p95 us':>9} {'rows painted':>13}")
+    for limit in args.limits:
+        results = keystroke_results(args.size, limit, args.seed)
+        for name, target in (("rebuild", RebuiltList()), ("model", ModelList())):
+            summary = time_updates(app, target, results, args.repeats)
+            print(f"{name:<10} {limit:>5} {summary['p50_us']:>9.1f} {summary['p95_us']:>9.1f} "
+                  f"{summary['rows_painted']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
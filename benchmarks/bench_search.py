@@ -0,0 +1,169 @@
+"""Per-keystroke search latency benchmark over synthetic window corpora.
+
+Run with: python -m benchmarks.bench_search --sizes 10 100 1000 10000
+Save a baseline with --save baseline.json and check a change against it with
+--compare baseline.json; the command exits non-zero when any result regresses.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.search_engine import SearchCache, _calculate_score, search_windows, search_windows_reference
+from src.core.search_index import SearchIndex
+from src.core.window import Window
+from src.core.window_manager import WindowManager
+
+from .corpus import CORPUS_SIZES, KEYSTROKE_SESSIONS, STRUCTURED_SESSIONS, generate_corpus, replay
+from .stats import Results, compare, summarize
+
+ENGINES = ("batch", "cache", "reference")
+
+
+def _search_function(engine: str, windows: List[Window], limit: Optional[int]) -> Callable[[str], object]:
+    """Returns a per-keystroke search callable for the named engine."""
+    if engine == "reference":
+        return lambda query: search_windows_reference(windows, query)[:limit]
+
+    index = SearchIndex(windows, 1)
+    if engine == "batch":
+        return lambda query: search_windows(index, query, limit=limit)
+
+    cache = SearchCache()
+    return lambda query: cache.search(index, query, limit=limit)
+
+
+def bench_search(engine: str, windows: List[Window], sessions: Sequence[str], repeats: int,
+                 measure_allocations: bool, limit: Optional[int] = None) -> Dict[str, float]:
+    """Replays every keystroke session and times each keystroke."""
+    clock = time.perf_counter
+    latencies: List[float] = []
+    for _ in range(repeats):
+        for session in sessions:
+            search = _search_function(engine, windows, limit)
+            for query in replay(session):
+                start = clock()
+                search(query)
+                latencies.append(clock() - start)
+
+    result = summarize(latencies)
+    if measure_allocations:
+        result["alloc_kib"] = _allocations_per_keystroke(engine, windows, sessions, limit)
+    return result
+
+
+def _allocations_per_keystroke(engine: str, windows: List[Window], sessions: Sequence[str],
+                               limit: Optional[int]) -> float:
+    """Returns the mean peak traced allocation per keystroke in KiB."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for session in sessions:
+            search = _search_function(engine, windows, limit)
+            for query in replay(session):
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                search(query)
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024 if peaks else 0.0
+
+
+def bench_score(windows: List[Window], query: str = "chrome") -> Dict[str, float]:
+    """Times single _calculate_score calls, the reference scorer's unit of work."""
+    clock = time.perf_counter
+    latencies = []
+    for window in windows:
+        start = clock()
+        _calculate_score(window, query)
+        latencies.append(clock() - start)
+    return summarize(latencies)
+
+
+def bench_enumerate(size: int, seed: int, repeats: int) -> Dict[str, float]:
+    """Times full get_all_windows refreshes against an equally sized fake source."""
+    source = FakeWindowSource(seed=seed)
+    source.populate(size)
+    manager = WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                            frecency=FrecencyStore())
+
+    clock = time.perf_counter
+    latencies = []
+    for _ in range(max(repeats, 5)):
+        start = clock()
+        manager.get_all_windows(force_refresh=True)
+        latencies.append(clock() - start)
+    return summarize(latencies)
+
+
+def run_suite(sizes: Sequence[int], engines: Sequence[str], repeats: int, seed: int,
+              measure_allocations: bool, limit: Optional[int] = None) -> Results:
+    """Runs every benchmark for every corpus size and returns results by key."""
+    results: Results = {}
+    for size in sizes:
+        windows = generate_corpus(size, seed)
+        for engine in engines:
+            results[f"search/{engine}/{size}"] = bench_search(engine, windows, KEYSTROKE_SESSIONS,
+                                                              repeats, measure_allocations, limit)
+        for engine in engines:
+            if engine != "reference":
+                results[f"query/{engine}/{size}"] = bench_search(engine, windows, STRUCTURED_SESSIONS,
+                                                                 repeats, measure_allocations, limit)
+        results[f"score/{size}"] = bench_score(windows)
+        results[f"enumerate/{size}"] = bench_enumerate(size, seed, repeats)
+    return results
+
+
+def print_results(results: Results) -> None:
+    """Prints a results table."""
+    print(f"{'benchmark':<28} {'count':>7} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} "
+          f"{'ops/s':>12} {'alloc KiB':>10}")
+    for key, result in results.items():
+        alloc = result.get("alloc_kib")
+        alloc_text = f"{alloc:>10.1f}" if alloc is not None else f"{'-':>10}"
+        print(f"{key:<28} {result['count']:>7.0f} {result['p50_us']:>10.1f} {result['p95_us']:>10.1f} "
+              f"{result['p99_us']:>10.1f} {result['ops_per_sec']:>12,.0f} {alloc_text}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES))
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, help="return only the best N results per keystroke")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against a saved JSON baseline")
+    parser.add_argument("--metric", default="p95_us")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    results = run_suite(args.sizes, args.engines, args.repeats, args.seed, not args.no_alloc, args.limit)
+    print_results(results)
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"\nComparing {args.metric} against {args.compare} (threshold {args.threshold:.0%})")
+        regressions = compare(results, baseline, args.metric, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Compares the old locked window cache with snapshot publishing under concurrent readers.
+
+Run with: python -m benchmarks.bench_snapshot_contention --windows 2000 --readers 4
+"""
+import argparse
+import threading
+import time
+from typing import Callable, Dict, List
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.window import Window
+from src.core.window_manager import WindowManager
+
+from .stats import percentile
+
+
+class LockedWindowCache:
+    """The previous design: readers take the refresh lock and copy the list."""
+
+    def __init__(self, manager: WindowManager):
+        self._manager = manager
+        self._lock = threading.Lock()
+        self._windows: List[Window] = []
+
+    def refresh(self) -> None:
+        """Enumerates while holding the lock, as get_all_windows used to."""
+        with self._lock:
+            self._windows = self._manager._get_windows_now()
+
+    def read(self) -> List[Window]:
+        """Waits for any refresh in progress, then copies the list."""
+        with self._lock:
+            return self._windows.copy()
+
+
+def run_contention(read: Callable[[], object], refresh: Callable[[], None], source: FakeWindowSource,
+                   readers: int, duration: float) -> Dict[str, float]:
+    """Runs reader threads against a continuously refreshing writer and times every read."""
+    stop = threading.Event()
+    latencies: List[List[float]] = [[] for _ in range(readers)]
+    refreshes = [0]
+
+    def writer() -> None:
+        while not stop.is_set():
+            source.churn(5)
+            refresh()
+            refreshes[0] += 1
+
+    def reader(samples: List[float]) -> None:
+        clock = time.perf_counter
+        while not stop.is_set():
+            start = clock()
+            read()
+            samples.append(clock() - start)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader, args=(samples,)) for samples in latencies]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    merged = sorted(sample for samples in latencies for sample in samples)
+    return {
+        "reads_per_sec": len(merged) / duration,
+        "refreshes": refreshes[0],
+        "p50_us": percentile(merged, 0.50) * 1e6,
+        "p99_us": percentile(merged, 0.99) * 1e6,
+        "max_us": (merged[-1] if merged else 0.0) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = FakeWindowSource(seed=args.seed)
+    source.populate(args.windows)
+    manager = WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                            frecency=FrecencyStore())
+    manager.get_all_windows(force_refresh=True)
+
+    locked = LockedWindowCache(manager)
+    locked.refresh()
+
+    designs = [
+        ("locked copy", locked.read, locked.refresh),
+        ("snapshot", manager.get_snapshot, lambda: manager.get_all_windows(force_refresh=True)),
+    ]
+
+    print(f"{args.windows} windows, {args.readers} readers, {args.duration:.1f}s per design")
+    print(f"{'design':<12} {'reads/s':>12} {'refreshes':>10} {'p50 us':>9} {'p99 us':>10} {'max us':>10}")
+    for name, read, refresh in designs:
+        result = run_contention(read, refresh, source, args.readers, args.duration)
+        print(f"{name:<12} {result['reads_per_sec']:>12,.0f} {result['refreshes']:>10} "
+              f"{result['p50_us']:>9.1f} {result['p99_us']:>10.1f} {result['max_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
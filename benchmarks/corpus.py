@@ -0,0 +1,105 @@
+"""Synthetic window corpora and recorded keystroke sessions for search benchmarks."""
+import random
+from typing import List, Tuple
+
+from src.core.fake_source import FAKE_CHANNELS, FAKE_FILES, FAKE_PAGES, FAKE_PROJECTS, FAKE_SHELLS
+from src.core.window import Window
+
+CORPUS_SIZES = (10, 100, 1000, 10000)
+MINIMIZED_RATIO = 0.15
+
+LONG_TITLE_PARTS = ["Quarterly planning notes", "Incident review 2024-03-14", "Untitled spreadsheet",
+                    "feature/search-index-rework", "Meeting recording (transcript)", "Draft reply"]
+UNICODE_TITLES = ["Données météo – Zürich", "東京の天気 - Yahoo!天気", "Привет, мир — Telegram",
+                  "Ελληνικά έγγραφα", "naïve café résumé.docx - Word", "😀 Emoji picker"]
+
+# Each entry is (kind, process name, weight). Kinds map to title builders below.
+CORPUS_MIX: List[Tuple[str, str, int]] = [
+    ("browser", "chrome.exe", 30),
+    ("browser", "firefox.exe", 10),
+    ("browser", "msedge.exe", 5),
+    ("ide", "Code.exe", 15),
+    ("ide", "devenv.exe", 5),
+    ("terminal", "WindowsTerminal.exe", 10),
+    ("chat", "slack.exe", 5),
+    ("explorer", "explorer.exe", 10),
+    ("long", "WINWORD.EXE", 5),
+    ("unicode", "notepad.exe", 5),
+]
+
+BROWSER_SUFFIX = {"chrome.exe": "Google Chrome", "firefox.exe": "Mozilla Firefox", "msedge.exe": "Microsoft Edge"}
+IDE_SUFFIX = {"Code.exe": "Visual Studio Code", "devenv.exe": "Microsoft Visual Studio"}
+
+# Keystroke sessions recorded from typical use; "\b" is a backspace.
+KEYSTROKE_SESSIONS = [
+    "chrome",
+    "vsc",
+    "main.py",
+    "tabber",
+    "slack #dev",
+    "termi\b\b\b\bminal",
+    "zürich",
+    "東京",
+    "pull request",
+    "xyzzy",
+    "exp\blorer",
+    "quarterly",
+]
+
+
+# Sessions using query fields; replayed by the engines that parse them.
+STRUCTURED_SESSIONS = [
+    "p:chrome stack",
+    "-p:explorer main",
+    "is:minimized code",
+    't:"google chrome" pull',
+    "p:slack #dev",
+]
+
+
+def _title(kind: str, process_name: str, rng: random.Random) -> str:
+    """Builds one realistic title for a corpus entry."""
+    if kind == "browser":
+        return f"{rng.choice(FAKE_PAGES)} - {BROWSER_SUFFIX[process_name]}"
+    if kind == "ide":
+        return f"{rng.choice(FAKE_FILES)} - {rng.choice(FAKE_PROJECTS)} - {IDE_SUFFIX[process_name]}"
+    if kind == "terminal":
+        return f"{rng.choice(FAKE_SHELLS)} - {rng.choice(FAKE_PROJECTS)}"
+    if kind == "chat":
+        return f"Slack | {rng.choice(FAKE_CHANNELS)} | Acme"
+    if kind == "explorer":
+        return rng.choice(FAKE_PROJECTS)
+    if kind == "long":
+        parts = rng.sample(LONG_TITLE_PARTS, 3)
+        return " - ".join(parts) + " - " + "x" * rng.randint(40, 160) + " - Word"
+    return rng.choice(UNICODE_TITLES)
+
+
+def generate_corpus(size: int, seed: int = 0) -> List[Window]:
+    """Returns size windows drawn from the weighted corpus mix, deterministically.
+
+    Minimized states come from a second generator, so titles match corpora made
+    before windows had a state.
+    """
+    rng = random.Random(seed)
+    state_rng = random.Random(~seed)
+    kinds = [(kind, process_name) for kind, process_name, _ in CORPUS_MIX]
+    weights = [weight for _, _, weight in CORPUS_MIX]
+    pids = {process_name: 1000 + 4 * i for i, (_, process_name, _) in enumerate(CORPUS_MIX)}
+
+    windows = []
+    for i in range(size):
+        kind, process_name = rng.choices(kinds, weights)[0]
+        windows.append(Window(0x10000 + 2 * i, _title(kind, process_name, rng), pids[process_name], process_name,
+                              state_rng.random() < MINIMIZED_RATIO))
+    return windows
+
+
+def replay(session: str) -> List[str]:
+    """Expands a recorded session into the query text seen after each keystroke."""
+    queries = []
+    text = ""
+    for key in session:
+        text = text[:-1] if key == "\b" else text + key
+        queries.append(text)
+    return queries
@@ -0,0 +1,41 @@
+from typing import Dict, List
+
+Results = Dict[str, Dict[str, float]]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    rank = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[rank]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Summarizes latencies in seconds as microsecond percentiles and throughput."""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "p50_us": percentile(ordered, 0.50) * 1e6,
+        "p95_us": percentile(ordered, 0.95) * 1e6,
+        "p99_us": percentile(ordered, 0.99) * 1e6,
+        "max_us": (ordered[-1] if ordered else 0.0) * 1e6,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+
+
+def compare(results: Results, baseline: Results, metric: str, threshold: float) -> List[str]:
+    """Returns descriptions of results whose metric grew by more than threshold."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key, {}).get(metric)
+        current = result.get(metric)
+        if not previous or current is None:
+            continue
+        change = current / previous - 1.0
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{key:<28} {previous:>12.1f} {current:>12.1f} {change:>+8.1%} {marker}")
+        if marker:
+            regressions.append(f"{key}: {metric} {previous:.1f} -> {current:.1f} ({change:+.1%})")
+    return regressions
@@ -1,13 +1,29 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
+import os
 import sys
+import threading
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
+from src.core.ipc_protocol import IPC_ENV_VAR
+from src.core.window_manager import WindowManager
 from src.ui.searchbar import SearchBar
-from src.utils.hotkey_listener import GlobalHotkeyListener
-from src.utils.logger import get_logger, log_exception, HotkeyError, UIError
+from src.utils.logger import get_logger, log_exception, setup_logging, HotkeyError, IpcError, UIError
+from src.utils.metrics import default_metrics_path, metrics
+from src.utils.startup_timer import StartupTimer
+
+STARTUP_REPORT_TIMEOUT = 30.0
 
 
 def main():
+    setup_logging()
     logger = get_logger("main")
+    startup_timer = StartupTimer(STARTED_AT)
+    startup_timer.mark("imports")
     
     try:
         logger.info("Starting Tabber")
@@ -15,26 +31,68 @@ def main():
         app = QApplication(sys.argv)
         app.setQuitOnLastWindowClosed(False)
         app.setApplicationName("Tabber")
+        startup_timer.mark("qt_ready")
         
-        searchbar = SearchBar()
-
-        try:
-            hotkey_listener = GlobalHotkeyListener()
-            hotkey_listener.hotkey_pressed.connect(searchbar.show_search)
-            hotkey_listener.quit_requested.connect(app.quit)
-            hotkey_listener.start_listening()
-        except HotkeyError as e:
-            logger.error(f"Hotkey setup failed: {e}")
-            raise
-        
-        logger.info("Application ready (Alt+W to open, Alt+Ctrl+Q to quit)")
+        window_manager = WindowManager(startup_timer=startup_timer)
+        startup_timer.mark("window_manager_ready")
+        searchbar = SearchBar(window_manager)
+        startup_timer.mark("searchbar_ready")
+
+        services = {}
+
+        def report_startup() -> None:
+            """Logs phase timings once the live window list has replaced the warm start."""
+            window_manager.reconciled.wait(STARTUP_REPORT_TIMEOUT)
+            logger.info("Startup timing:\n%s", startup_timer.report())
+
+        def start_services() -> None:
+            """Imports and starts hotkeys and the optional IPC server once the bar has been shown."""
+            try:
+                from src.utils.hotkey_listener import GlobalHotkeyListener
+
+                hotkey_listener = GlobalHotkeyListener()
+                hotkey_listener.hotkey_pressed.connect(searchbar.show_search)
+                hotkey_listener.quit_requested.connect(app.quit)
+                hotkey_listener.start_listening()
+                services["hotkeys"] = hotkey_listener
+                startup_timer.mark("hotkeys_ready")
+            except HotkeyError as e:
+                logger.error("Hotkey setup failed: %s", e)
+                app.exit(1)
+                return
+
+            if os.environ.get(IPC_ENV_VAR) == "1":
+                try:
+                    from src.core.ipc_server import IpcServer
+
+                    ipc_server = IpcServer(window_manager)
+                    ipc_server.start()
+                    services["ipc"] = ipc_server
+                    startup_timer.mark("ipc_ready")
+                except IpcError as e:
+                    logger.error("IPC server unavailable: %s", e)
+
+            logger.info("Application ready (%s)", hotkey_listener.registry.describe())
+            startup_timer.mark("interactive")
+            threading.Thread(target=report_startup, name="startup-report", daemon=True).start()
+
+        # Queued after the search bar's prewarm, so the first frame never waits on these imports.
+        QTimer.singleShot(0, start_services)
         
         def cleanup() -> None:
             """Handles application cleanup when shutting down."""
             try:
                 logger.info("Application shutting down")
-                hotkey_listener.stop_listening()
+                if "hotkeys" in services:
+                    services["hotkeys"].stop_listening()
+                if "ipc" in services:
+                    services["ipc"].stop()
+                searchbar.query_pipeline.shutdown()
+                searchbar.icon_cache.shutdown()
                 searchbar.window_manager.stop_monitoring()
+                if metrics.enabled:
+                    metrics.log_summary()
+                    metrics.dump(default_metrics_path())
                 logger.debug("Application cleanup complete")
             except Exception as e:
                 log_exception(logger, e, "application cleanup")
@@ -43,7 +101,7 @@ def main():
         sys.exit(app.exec_())
         
     except (UIError, HotkeyError) as e:
-        logger.error(f"Component failure: {e}")
+        logger.error("Component failure: %s", e)
         sys.exit(1)
     except Exception as e:
         log_exception(logger, e, "application startup")
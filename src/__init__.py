@@ -1,13 +1,21 @@
-from .core.window_manager import WindowManager
-from .core.window import Window
-from .core.search_engine import search_windows
-from .ui.searchbar import SearchBar
-from .utils.hotkey_listener import GlobalHotkeyListener
-
-__all__ = [
-    "WindowManager",
-    "Window", 
-    "search_windows",
-    "SearchBar",
-    "GlobalHotkeyListener",
-]
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .core.window_manager import WindowManager
+    from .core.window import Window
+    from .core.search_engine import search_windows
+    from .ui.searchbar import SearchBar
+    from .utils.hotkey_listener import GlobalHotkeyListener
+
+_EXPORTS = {
+    "WindowManager": ".core.window_manager",
+    "Window": ".core.window",
+    "search_windows": ".core.search_engine",
+    "SearchBar": ".ui.searchbar",
+    "GlobalHotkeyListener": ".utils.hotkey_listener",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,5 +1,31 @@
-from .window import Window
-from .window_manager import WindowManager
-from .search_engine import search_windows
+from typing import TYPE_CHECKING
 
-__all__ = ["Window", "WindowManager", "search_windows"]
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .window import Window
+    from .window_manager import WindowManager
+    from .search_index import SearchIndex
+    from .search_engine import search_windows, SearchCache
+    from .query import parse_query
+    from .frecency import FrecencyStore
+    from .window_rules import WindowFilter, WindowRule
+    from .ipc_server import IpcServer
+    from .ipc_client import IpcClient
+
+_EXPORTS = {
+    "Window": ".window",
+    "WindowManager": ".window_manager",
+    "SearchIndex": ".search_index",
+    "search_windows": ".search_engine",
+    "SearchCache": ".search_engine",
+    "parse_query": ".query",
+    "FrecencyStore": ".frecency",
+    "WindowFilter": ".window_rules",
+    "WindowRule": ".window_rules",
+    "IpcServer": ".ipc_server",
+    "IpcClient": ".ipc_client",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
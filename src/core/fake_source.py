@@ -0,0 +1,308 @@
+import random
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Set
+
+from .window_events import ScriptedEventSource, WindowEventSource, WindowEventType
+from .window_source import IconImage, ProcessInfo, Rect, WindowSource, WS_CAPTION, WS_EX_TOOLWINDOW, WS_VISIBLE
+
+DEFAULT_STYLE = WS_VISIBLE | WS_CAPTION
+DEFAULT_RECT = (100, 100, 1300, 900)
+
+FAKE_APPS = [
+    ("chrome.exe", "Chrome_WidgetWin_1", "{page} - Google Chrome"),
+    ("firefox.exe", "MozillaWindowClass", "{page} — Mozilla Firefox"),
+    ("Code.exe", "Chrome_WidgetWin_1", "{file} - {project} - Visual Studio Code"),
+    ("WindowsTerminal.exe", "CASCADIA_HOSTING_WINDOW_CLASS", "{shell} - {project}"),
+    ("explorer.exe", "CabinetWClass", "{project}"),
+    ("slack.exe", "Chrome_WidgetWin_1", "Slack | {channel} | Acme"),
+    ("OUTLOOK.EXE", "rctrl_renwnd32", "Inbox - user@example.com - Outlook"),
+    ("notepad.exe", "Notepad", "{file} - Notepad"),
+    ("Spotify.exe", "Chrome_WidgetWin_0", "Spotify Premium"),
+    ("devenv.exe", "HwndWrapper", "{project} - Microsoft Visual Studio"),
+]
+
+FAKE_PAGES = ["GitHub", "Pull request #4821 · acme/tabber", "Inbox (3) - Gmail", "Stack Overflow",
+              "Python 3 documentation", "YouTube", "Jira board", "Grafana dashboards",
+              "Données météo – Zürich", "東京の天気", "Google Docs — Quarterly planning"]
+FAKE_FILES = ["main.py", "window_manager.py", "search_engine.py", "README.md", "notes.txt",
+              "requirements.txt", "config.yaml", "index.ts"]
+FAKE_PROJECTS = ["tabber", "backend", "infra", "website", "C:\\Users\\dev\\Downloads", "scratch"]
+FAKE_SHELLS = ["PowerShell", "cmd", "Ubuntu", "Git Bash"]
+FAKE_CHANNELS = ["#general", "#dev", "#random", "#incidents"]
+
+
+class FakeWindowRecord:
+    """Mutable state of one simulated top-level window."""
+
+    __slots__ = ("handle", "title", "process_id", "class_name", "style", "ex_style",
+                 "owner", "rect", "minimized", "visible")
+
+    def __init__(self, handle: int, title: str, process_id: int, class_name: str, style: int,
+                 ex_style: int, owner: int, rect: Rect, minimized: bool, visible: bool):
+        self.handle = handle
+        self.title = title
+        self.process_id = process_id
+        self.class_name = class_name
+        self.style = style
+        self.ex_style = ex_style
+        self.owner = owner
+        self.rect = rect
+        self.minimized = minimized
+        self.visible = visible
+
+
+class FakeWindowSource(WindowSource):
+    """Deterministic in-memory window source for load tests and off-Windows development.
+
+    All randomness comes from a seeded generator, so the same seed always produces the
+    same corpus and the same churn sequence. Mutations are reported through the event
+    source returned by create_event_source, mirroring what WinEvent hooks would send.
+    ``process_latency`` makes each process query sleep, standing in for the system
+    calls behind a real process lookup.
+    """
+
+    def __init__(self, seed: int = 0, process_latency: float = 0.0):
+        self._random = random.Random(seed)
+        self._process_latency = process_latency
+        self._lock = threading.RLock()
+        self._windows: Dict[int, FakeWindowRecord] = {}
+        self._z_order: List[int] = []
+        self._processes: Dict[int, ProcessInfo] = {}
+        self._app_processes: Dict[str, int] = {}
+        self._next_handle = 0x10000
+        self._next_process_id = 1000
+        self._clock = 0.0
+        self._events: Optional[ScriptedEventSource] = None
+
+    def _emit(self, event_type: WindowEventType, handle: int) -> None:
+        """Forwards a mutation to the attached event source, if any."""
+        if self._events is not None:
+            self._events.emit(event_type, handle)
+
+    def add_process(self, process_name: str, process_id: Optional[int] = None) -> int:
+        """Registers a simulated process and returns its id; an exited process's id may be reused."""
+        with self._lock:
+            if process_id is None:
+                process_id = self._next_process_id
+                self._next_process_id += 4
+            self._clock += 1.0
+            exe = f"C:\\Program Files\\{process_name.rsplit('.', 1)[0]}\\{process_name}"
+            self._processes[process_id] = ProcessInfo(process_id, self._clock, process_name, exe)
+            return process_id
+
+    def kill_process(self, process_id: int) -> None:
+        """Removes a process so name lookups for it fail, like an exited process."""
+        with self._lock:
+            self._processes.pop(process_id, None)
+
+    def add_window(self, title: str, process_name: str, process_id: Optional[int] = None,
+                   class_name: str = "FakeWindowClass", style: int = DEFAULT_STYLE, ex_style: int = 0,
+                   owner: int = 0, rect: Rect = DEFAULT_RECT, minimized: bool = False,
+                   visible: bool = True) -> int:
+        """Creates a window at the top of the z-order and returns its handle."""
+        with self._lock:
+            if process_id is None:
+                process_id = self._app_processes.get(process_name)
+                if process_id is None or process_id not in self._processes:
+                    process_id = self.add_process(process_name)
+                    self._app_processes[process_name] = process_id
+
+            handle = self._next_handle
+            self._next_handle += 2
+            self._windows[handle] = FakeWindowRecord(handle, title, process_id, class_name, style,
+                                                     ex_style, owner, rect, minimized, visible)
+            self._z_order.insert(0, handle)
+        self._emit(WindowEventType.CREATED, handle)
+        return handle
+
+    def close_window(self, handle: int) -> None:
+        """Destroys a window."""
+        with self._lock:
+            if self._windows.pop(handle, None) is None:
+                return
+            self._z_order.remove(handle)
+        self._emit(WindowEventType.DESTROYED, handle)
+
+    def set_title(self, handle: int, title: str) -> None:
+        """Changes a window title."""
+        with self._lock:
+            self._windows[handle].title = title
+        self._emit(WindowEventType.NAME_CHANGED, handle)
+
+    def set_minimized(self, handle: int, minimized: bool) -> None:
+        """Minimizes or restores a window; minimizing moves it to the bottom of the z-order, as on Windows."""
+        with self._lock:
+            self._windows[handle].minimized = minimized
+            if minimized:
+                self._z_order.remove(handle)
+                self._z_order.append(handle)
+        self._emit(WindowEventType.STATE_CHANGED, handle)
+
+    def set_visible(self, handle: int, visible: bool) -> None:
+        """Shows or hides a window."""
+        with self._lock:
+            self._windows[handle].visible = visible
+        self._emit(WindowEventType.SHOWN if visible else WindowEventType.HIDDEN, handle)
+
+    def focus(self, handle: int) -> None:
+        """Moves a window to the top of the z-order."""
+        with self._lock:
+            self._z_order.remove(handle)
+            self._z_order.insert(0, handle)
+        self._emit(WindowEventType.FOREGROUND, handle)
+
+    def _random_title(self, template: str) -> str:
+        """Fills a title template with random corpus values."""
+        choice = self._random.choice
+        return template.format(page=choice(FAKE_PAGES), file=choice(FAKE_FILES),
+                               project=choice(FAKE_PROJECTS), shell=choice(FAKE_SHELLS),
+                               channel=choice(FAKE_CHANNELS))
+
+    def add_random_window(self) -> int:
+        """Adds one realistic application window."""
+        process_name, class_name, template = self._random.choice(FAKE_APPS)
+        return self.add_window(self._random_title(template), process_name, class_name=class_name,
+                               minimized=self._random.random() < 0.15)
+
+    def add_noise_window(self) -> int:
+        """Adds one window the switcher should filter out."""
+        kind = self._random.randrange(5)
+        if kind == 0:
+            return self.add_window("", "explorer.exe", visible=False)
+        if kind == 1:
+            return self.add_window("Tooltip", "chrome.exe", ex_style=WS_EX_TOOLWINDOW)
+        if kind == 2:
+            return self.add_window("Program Manager", "explorer.exe", class_name="Progman")
+        if kind == 3:
+            return self.add_window("DWM Notification Window", "dwm.exe")
+        return self.add_window("Splash", "Code.exe", rect=(0, 0, 40, 20))
+
+    def populate(self, count: int, noise_ratio: float = 0.5) -> List[int]:
+        """Adds count application windows plus filtered-out noise windows."""
+        handles = []
+        for _ in range(count):
+            handles.append(self.add_random_window())
+            if self._random.random() < noise_ratio:
+                self.add_noise_window()
+        return handles
+
+    def churn(self, steps: int) -> None:
+        """Applies random opens, closes, retitles, minimizes and focus changes."""
+        for _ in range(steps):
+            with self._lock:
+                handles = list(self._z_order)
+            if not handles:
+                self.add_random_window()
+                continue
+
+            handle = self._random.choice(handles)
+            operation = self._random.random()
+            if operation < 0.2:
+                self.add_random_window()
+            elif operation < 0.4:
+                self.close_window(handle)
+            elif operation < 0.7:
+                record = self._windows.get(handle)
+                if record is not None and record.visible and record.title:
+                    process = self._processes.get(record.process_id)
+                    process_name = process.name if process is not None else ""
+                    template = next((t for p, c, t in FAKE_APPS if p == process_name), "{page}")
+                    self.set_title(handle, self._random_title(template))
+            elif operation < 0.8:
+                self.set_minimized(handle, not self._windows[handle].minimized)
+            else:
+                self.focus(handle)
+
+    @property
+    def window_count(self) -> int:
+        """Returns the number of simulated windows, including filtered ones."""
+        return len(self._windows)
+
+    def enumerate_handles(self) -> List[int]:
+        """Returns all top-level window handles in z-order."""
+        with self._lock:
+            return list(self._z_order)
+
+    def is_window(self, handle: int) -> bool:
+        """Returns whether the handle still refers to a window."""
+        return handle in self._windows
+
+    def is_visible(self, handle: int) -> bool:
+        """Returns whether the window is visible."""
+        record = self._windows.get(handle)
+        return record is not None and record.visible
+
+    def get_title(self, handle: int) -> str:
+        """Returns the window title text."""
+        record = self._windows.get(handle)
+        return record.title if record is not None else ""
+
+    def get_style(self, handle: int) -> int:
+        """Returns the window style bits."""
+        return self._windows[handle].style
+
+    def get_ex_style(self, handle: int) -> int:
+        """Returns the extended window style bits."""
+        return self._windows[handle].ex_style
+
+    def get_owner(self, handle: int) -> int:
+        """Returns the owner window handle, or 0 for unowned windows."""
+        return self._windows[handle].owner
+
+    def get_class_name(self, handle: int) -> str:
+        """Returns the window class name."""
+        return self._windows[handle].class_name
+
+    def is_minimized(self, handle: int) -> bool:
+        """Returns whether the window is minimized."""
+        return self._windows[handle].minimized
+
+    def get_rect(self, handle: int) -> Rect:
+        """Returns the window rectangle as (left, top, right, bottom)."""
+        return self._windows[handle].rect
+
+    def get_process_id(self, handle: int) -> int:
+        """Returns the id of the process that owns the window."""
+        return self._windows[handle].process_id
+
+    def get_process_info(self, process_id: int) -> Optional[ProcessInfo]:
+        """Returns metadata for a process, or None if it cannot be read."""
+        if self._process_latency:
+            time.sleep(self._process_latency)
+        return self._processes.get(process_id)
+
+    def get_process_create_time(self, process_id: int) -> Optional[float]:
+        """Returns the creation time of a process, or None if it has exited."""
+        process = self._processes.get(process_id)
+        return process.create_time if process is not None else None
+
+    def list_process_ids(self) -> Set[int]:
+        """Returns the ids of all running processes."""
+        return set(self._processes)
+
+    def activate(self, handle: int) -> bool:
+        """Restores and focuses a simulated window."""
+        record = self._windows.get(handle)
+        if record is None:
+            return False
+        if record.minimized:
+            self.set_minimized(handle, False)
+        self.focus(handle)
+        return True
+
+    def get_icon(self, exe: str, size: int) -> Optional[IconImage]:
+        """Returns a solid square whose color is derived from the exe path."""
+        if self._process_latency:
+            time.sleep(self._process_latency)
+        if not exe:
+            return None
+        color = zlib.crc32(exe.lower().encode("utf-8")).to_bytes(4, "little")
+        return IconImage(size, size, (color[:3] + b"\xff") * (size * size))
+
+    def create_event_source(self) -> Optional[WindowEventSource]:
+        """Returns an event source that reports this backend's mutations."""
+        if self._events is None:
+            self._events = ScriptedEventSource()
+        return self._events
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .window import Window
+from ..utils.logger import get_logger, log_exception
+
+FRECENCY_HALF_LIFE = 3 * 24 * 60 * 60.0
+FRECENCY_WEIGHT = 12.0
+FRECENCY_PROCESS_SHARE = 0.3
+FRECENCY_MIN_SCORE = 0.01
+FRECENCY_MAX_ENTRIES = 256
+FRECENCY_FORMAT_VERSION = 1
+
+
+def default_frecency_path() -> Path:
+    """Returns the default store location, next to the log directory."""
+    return Path(__file__).parent.parent / "data" / "frecency.json"
+
+
+class FrecencyStore:
+    """Exponentially decaying switch counts per window handle and per process.
+
+    Each switch adds one to the window's score and to its process's score, and every
+    score halves once per half-life. Entries hold a score and the time it was last
+    updated and are decayed when read, so recording a switch touches two entries.
+    With a path, the store is read from disk on first use and written by save;
+    without one it lives in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None, half_life: float = FRECENCY_HALF_LIFE,
+                 clock: Callable[[], float] = time.time):
+        self.logger = get_logger("frecency")
+        self._path = Path(path) if path is not None else None
+        self._half_life = half_life
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: Dict[int, Tuple[str, float, float]] = {}
+        self._processes: Dict[str, Tuple[float, float]] = {}
+        self._loaded = self._path is None
+        self.version = 0
+
+    def _decayed(self, score: float, stamp: float, now: float) -> float:
+        """Returns a score decayed from its stamp to now."""
+        return score * 0.5 ** (max(0.0, now - stamp) / self._half_life)
+
+    def _ensure_loaded(self) -> None:
+        """Reads the on-disk store the first time it is needed."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._load()
+
+    def _load(self) -> None:
+        """Parses the store file; a missing or unreadable file starts an empty store."""
+        if not self._path.exists():
+            return
+
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            if data.get("v") != FRECENCY_FORMAT_VERSION:
+                self.logger.info("Ignoring frecency store with unknown format %s", data.get('v'))
+                return
+            saved_at = float(data["t"])
+            self._windows = {int(handle): (process_name, float(score), saved_at)
+                             for handle, process_name, score in data["w"]}
+            self._processes = {name: (float(score), saved_at) for name, score in data["p"]}
+            self.logger.debug("Loaded frecency for %d windows, %d processes",
+                              len(self._windows), len(self._processes))
+        except Exception as e:
+            log_exception(self.logger, e, f"loading frecency store {self._path}")
+            self._windows.clear()
+            self._processes.clear()
+
+    def save(self) -> None:
+        """Writes decayed, pruned entries atomically as compact JSON."""
+        if self._path is None:
+            return
+
+        self._ensure_loaded()
+        now = self._clock()
+        with self._lock:
+            windows = sorted(((handle, process_name, self._decayed(score, stamp, now))
+                              for handle, (process_name, score, stamp) in self._windows.items()),
+                             key=lambda entry: entry[2], reverse=True)
+            processes = sorted(((name, self._decayed(score, stamp, now))
+                                for name, (score, stamp) in self._processes.items()),
+                               key=lambda entry: entry[1], reverse=True)
+
+        data = {
+            "v": FRECENCY_FORMAT_VERSION,
+            "t": round(now, 3),
+            "w": [[handle, process_name, round(score, 4)] for handle, process_name, score
+                  in windows[:FRECENCY_MAX_ENTRIES] if score >= FRECENCY_MIN_SCORE],
+            "p": [[name, round(score, 4)] for name, score
+                  in processes[:FRECENCY_MAX_ENTRIES] if score >= FRECENCY_MIN_SCORE],
+        }
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(temp_path, self._path)
+        except Exception as e:
+            log_exception(self.logger, e, f"saving frecency store {self._path}")
+
+    def record(self, window: Window) -> None:
+        """Counts a switch to window for both the window and its process."""
+        self._ensure_loaded()
+        now = self._clock()
+        process_name = window.process_name.lower()
+
+        with self._lock:
+            previous = self._windows.get(window.handle)
+            score = 0.0
+            if previous is not None and previous[0] == process_name:
+                score = self._decayed(previous[1], previous[2], now)
+            self._windows[window.handle] = (process_name, score + 1.0, now)
+
+            process_score, stamp = self._processes.get(process_name, (0.0, now))
+            self._processes[process_name] = (self._decayed(process_score, stamp, now) + 1.0, now)
+            self.version += 1
+
+        self.logger.debug("Recorded switch to %s (%s)", window.handle, process_name)
+
+    def score(self, window: Window) -> float:
+        """Returns the raw decayed frecency of a window, including its process share."""
+        self._ensure_loaded()
+        now = self._clock()
+        with self._lock:
+            return self._score(window, now)
+
+    def _score(self, window: Window, now: float) -> float:
+        """Sums the window and process entries; must be called with the lock held.
+
+        A handle entry only counts while it still belongs to the same process, so a
+        recycled handle does not inherit another application's history.
+        """
+        process_name = window.process_name.lower()
+        total = 0.0
+        entry = self._windows.get(window.handle)
+        if entry is not None and entry[0] == process_name:
+            total += self._decayed(entry[1], entry[2], now)
+        process_entry = self._processes.get(process_name)
+        if process_entry is not None:
+            total += FRECENCY_PROCESS_SHARE * self._decayed(process_entry[0], process_entry[1], now)
+        return total
+
+    def prior(self, windows: List[Window]) -> np.ndarray:
+        """Returns per-window ranking points in [0, FRECENCY_WEIGHT), saturating with use."""
+        self._ensure_loaded()
+        now = self._clock()
+        with self._lock:
+            raw = np.fromiter((self._score(window, now) for window in windows),
+                              dtype=np.float64, count=len(windows))
+        return FRECENCY_WEIGHT * raw / (raw + 1.0)
@@ -0,0 +1,118 @@
+from collections import deque
+from multiprocessing.connection import Client
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from .ipc_protocol import MAX_MESSAGE_BYTES, address_family, decode, default_ipc_address, encode, window_from_wire
+from .window import Window
+from ..utils.logger import IpcError
+
+IPC_TIMEOUT = 5.0
+
+Request = Tuple[str, dict]
+
+
+class IpcClient:
+    """Persistent connection to an IpcServer for scripts and external launchers.
+
+    Calls are synchronous. Change events that arrive while waiting for a response
+    are queued and returned by next_event, so a client needs no thread of its own.
+    """
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None,
+                 timeout: float = IPC_TIMEOUT):
+        self.address = address if address is not None else default_ipc_address()
+        self._timeout = timeout
+        self._next_id = 0
+        self._events: Deque[dict] = deque()
+        try:
+            self._connection = Client(self.address, family=address_family(self.address), authkey=authkey)
+        except Exception as e:
+            raise IpcError(f"Cannot connect to {self.address}") from e
+
+    def __enter__(self) -> "IpcClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._connection.close()
+
+    def call(self, op: str, **params) -> Any:
+        """Sends one request and returns its result, raising IpcError if it failed."""
+        request = self._request(op, params)
+        self._connection.send_bytes(encode(request))
+        return self._result(self._receive(request["id"]))
+
+    def batch(self, requests: Sequence[Request]) -> List[Any]:
+        """Sends several requests in one frame; failed ones come back as IpcError instances."""
+        batch = [self._request(op, params) for op, params in requests]
+        self._connection.send_bytes(encode(batch))
+        responses = self._receive(batch[0]["id"] if batch else None)
+        results: List[Any] = []
+        for response in responses:
+            try:
+                results.append(self._result(response))
+            except IpcError as e:
+                results.append(e)
+        return results
+
+    def hello(self) -> dict:
+        """Returns the server's protocol version and snapshot generation."""
+        return self.call("hello")
+
+    def search(self, query: str, limit: Optional[int] = None, min_score: float = 0.0) -> List[Window]:
+        """Ranks windows for a query, as the overlay does."""
+        return [window_from_wire(data) for data in self.call("search", query=query, limit=limit, min_score=min_score)]
+
+    def windows(self) -> List[Window]:
+        """Lists every window in z-order."""
+        return [window_from_wire(data) for data in self.call("windows")]
+
+    def switch(self, handle: int) -> bool:
+        """Switches to a window by handle and returns whether it succeeded."""
+        return bool(self.call("switch", handle=handle))
+
+    def subscribe(self) -> int:
+        """Starts receiving change events and returns the current snapshot generation."""
+        return self.call("subscribe")
+
+    def unsubscribe(self) -> None:
+        """Stops change events; events already received stay queued."""
+        self.call("unsubscribe")
+
+    def next_event(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Returns the next change event, waiting up to timeout seconds, or None."""
+        if not self._events and self._connection.poll(timeout):
+            self._queue_frame(decode(self._connection.recv_bytes(MAX_MESSAGE_BYTES)))
+        return self._events.popleft() if self._events else None
+
+    def _request(self, op: str, params: dict) -> dict:
+        """Builds a request with the next id."""
+        self._next_id += 1
+        return dict(params, id=self._next_id, op=op)
+
+    def _receive(self, request_id: Optional[int]) -> Any:
+        """Reads frames until the response to request_id arrives, queueing events."""
+        while True:
+            if not self._connection.poll(self._timeout):
+                raise IpcError(f"No response from {self.address} within {self._timeout}s")
+            message = decode(self._connection.recv_bytes(MAX_MESSAGE_BYTES))
+            if not self._queue_frame(message):
+                if isinstance(message, list) or message.get("id") in (request_id, None):
+                    return message
+
+    def _queue_frame(self, message: Any) -> bool:
+        """Queues a change event and returns whether the frame was one."""
+        if isinstance(message, dict) and "event" in message:
+            self._events.append(message)
+            return True
+        return False
+
+    @staticmethod
+    def _result(response: dict) -> Any:
+        """Unwraps a response, raising IpcError for a failed request."""
+        if not response.get("ok"):
+            raise IpcError(response.get("error", "Request failed"))
+        return response.get("result")
@@ -0,0 +1,75 @@
+import getpass
+import json
+import os
+import sys
+import tempfile
+from typing import Any, List, Optional
+
+from .window import Window
+from .window_diff import WindowDiff
+from ..utils.logger import IpcError
+
+PROTOCOL_VERSION = 1
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+IPC_ENV_VAR = "TABBER_IPC"
+
+EVENT_WINDOWS_CHANGED = "windows_changed"
+
+
+def default_ipc_address() -> str:
+    """Returns the per-user server address: a named pipe on Windows, a Unix socket elsewhere."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\tabber-{getpass.getuser()}"
+    return os.path.join(tempfile.gettempdir(), f"tabber-{os.getuid()}.sock")
+
+
+def address_family(address: str) -> str:
+    """Returns the multiprocessing.connection family of an address."""
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+def encode(message: Any) -> bytes:
+    """Serializes a message as compact UTF-8 JSON, the payload of one frame."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def decode(payload: bytes) -> Any:
+    """Parses the payload of one frame."""
+    try:
+        return json.loads(payload.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise IpcError(f"Malformed message: {e}") from e
+
+
+def window_to_wire(window: Window) -> list:
+    """Encodes a window as [handle, title, process id, process name, minimized]."""
+    return [window.handle, window.title, window.process_id, window.process_name, window.minimized]
+
+
+def window_from_wire(data: list) -> Window:
+    """Decodes a window encoded by window_to_wire."""
+    handle, title, process_id, process_name, minimized = data
+    return Window(handle, title, process_id, process_name, bool(minimized))
+
+
+def windows_to_wire(windows: List[Window]) -> List[list]:
+    """Encodes a list of windows."""
+    return [window_to_wire(window) for window in windows]
+
+
+def diff_to_wire(diff: WindowDiff) -> dict:
+    """Encodes a window diff as a change event; removed and refocused windows are sent as handles."""
+    return {
+        "event": EVENT_WINDOWS_CHANGED,
+        "generation": diff.generation,
+        "added": windows_to_wire(diff.added),
+        "removed": [window.handle for window in diff.removed],
+        "retitled": windows_to_wire(diff.retitled),
+        "refocused": [window.handle for window in diff.refocused],
+        "reordered": diff.reordered,
+    }
+
+
+def error_response(request_id: Optional[int], message: str) -> dict:
+    """Builds the response to a request that failed."""
+    return {"id": request_id, "ok": False, "error": message}
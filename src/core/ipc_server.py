@@ -0,0 +1,262 @@
+import os
+import queue
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .ipc_protocol import (MAX_MESSAGE_BYTES, PROTOCOL_VERSION, address_family, decode, default_ipc_address,
+                           diff_to_wire, encode, error_response, windows_to_wire)
+from .search_engine import SearchCache
+from .window_diff import WindowDiff
+from .window_manager import WindowManager
+from ..utils.logger import get_logger, log_exception, IpcError
+from ..utils.metrics import metrics
+
+SESSION_POLL_INTERVAL = 0.2
+
+
+class _ClientSession:
+    """State of one persistent connection."""
+
+    __slots__ = ("connection", "search_cache", "subscribed", "send_lock")
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.search_cache = SearchCache()
+        self.subscribed = False
+        self.send_lock = threading.Lock()
+
+    def send(self, message: Any) -> None:
+        """Writes one frame; change events and responses may come from different threads."""
+        payload = encode(message)
+        with self.send_lock:
+            self.connection.send_bytes(payload)
+
+
+class IpcServer:
+    """Local socket server exposing window search, listing and switching.
+
+    Clients connect over a Unix socket or a Windows named pipe, both through
+    multiprocessing.connection, which frames every message with a length prefix.
+    A frame holds one JSON request, ``{"id": 1, "op": "search", "query": "chr"}``,
+    or a JSON array of them answered by one array of responses. Connections are
+    persistent and each keeps its own SearchCache, so a client typing a query gets
+    incremental search like the overlay; every client reads the manager's shared
+    snapshot instead of enumerating windows itself. After ``subscribe`` a client
+    also receives a ``windows_changed`` event for every published window diff.
+    Events are written by their own thread, so a subscriber that stops reading can
+    delay other subscribers but never the window manager.
+    """
+
+    def __init__(self, window_manager: WindowManager, address: Optional[str] = None,
+                 authkey: Optional[bytes] = None):
+        self.logger = get_logger("ipc_server")
+        self.window_manager = window_manager
+        self.address = address if address is not None else default_ipc_address()
+        self._authkey = authkey
+        self._listener: Optional[Listener] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._event_thread: Optional[threading.Thread] = None
+        self._events: "queue.Queue[Optional[WindowDiff]]" = queue.Queue()
+        self._stopping = threading.Event()
+        self._sessions_lock = threading.Lock()
+        self._sessions: Set[_ClientSession] = set()
+        self._threads: List[threading.Thread] = []
+        self._operations: Dict[str, Callable[[_ClientSession, dict], Any]] = {
+            "hello": self._op_hello,
+            "search": self._op_search,
+            "windows": self._op_windows,
+            "switch": self._op_switch,
+            "subscribe": self._op_subscribe,
+            "unsubscribe": self._op_unsubscribe,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Returns whether the server is accepting connections."""
+        return self._listener is not None
+
+    def start(self) -> None:
+        """Binds the address and starts accepting connections on a background thread."""
+        if self._listener is not None:
+            return
+
+        try:
+            family = address_family(self.address)
+            if family == "AF_UNIX":
+                self._remove_stale_socket()
+            self._stopping.clear()
+            self._listener = Listener(self.address, family=family, authkey=self._authkey)
+            self.window_manager.add_change_callback(self._on_windows_changed)
+            self._accept_thread = threading.Thread(target=self._accept_loop, name="ipc-accept", daemon=True)
+            self._accept_thread.start()
+            self._event_thread = threading.Thread(target=self._event_loop, name="ipc-events", daemon=True)
+            self._event_thread.start()
+            self.logger.info("IPC server listening on %s", self.address)
+        except Exception as e:
+            self._listener = None
+            log_exception(self.logger, e, f"starting IPC server on {self.address}")
+            raise IpcError(f"Failed to start IPC server on {self.address}") from e
+
+    def _remove_stale_socket(self) -> None:
+        """Deletes a socket file left by a crashed server, refusing to replace a live one."""
+        if not os.path.exists(self.address):
+            return
+        try:
+            Client(self.address, family="AF_UNIX", authkey=self._authkey).close()
+        except OSError:
+            os.unlink(self.address)
+            self.logger.debug("Removed stale socket %s", self.address)
+            return
+        raise IpcError(f"Another server is already listening on {self.address}")
+
+    def stop(self) -> None:
+        """Stops accepting and waits for the worker threads, which close their connections."""
+        if self._listener is None:
+            return
+
+        self._stopping.set()
+        self.window_manager.remove_change_callback(self._on_windows_changed)
+        self._events.put(None)
+        try:
+            Client(self.address, family=address_family(self.address), authkey=self._authkey).close()
+        except Exception:
+            pass
+        if self._accept_thread is not None:
+            self._accept_thread.join(timeout=1)
+        self._listener.close()
+        self._listener = None
+
+        for thread in self._threads + [self._event_thread]:
+            thread.join(timeout=1)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        self.logger.info("IPC server stopped")
+
+    def _accept_loop(self) -> None:
+        """Accepts connections and serves each on its own thread until stopped."""
+        while not self._stopping.is_set():
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                if self._stopping.is_set():
+                    break
+                self.logger.error("Rejected IPC connection: %s", e)
+                continue
+
+            if self._stopping.is_set():
+                connection.close()
+                break
+
+            session = _ClientSession(connection)
+            with self._sessions_lock:
+                self._sessions.add(session)
+            thread = threading.Thread(target=self._serve, args=(session,), name="ipc-client", daemon=True)
+            self._threads = [existing for existing in self._threads if existing.is_alive()] + [thread]
+            thread.start()
+
+    def _serve(self, session: _ClientSession) -> None:
+        """Answers the frames of one connection until it closes."""
+        self.logger.debug("IPC client connected")
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if not session.connection.poll(SESSION_POLL_INTERVAL):
+                        continue
+                    payload = session.connection.recv_bytes(MAX_MESSAGE_BYTES)
+                except (EOFError, OSError):
+                    break
+
+                try:
+                    message = decode(payload)
+                except IpcError as e:
+                    session.send(error_response(None, str(e)))
+                    continue
+
+                with metrics.timer("ipc.request"):
+                    if isinstance(message, list):
+                        metrics.record("ipc.batch_size", len(message))
+                        response: Any = [self._handle(session, request) for request in message]
+                    else:
+                        response = self._handle(session, message)
+                session.send(response)
+        except Exception as e:
+            if not self._stopping.is_set():
+                log_exception(self.logger, e, "serving IPC client")
+        finally:
+            with self._sessions_lock:
+                self._sessions.discard(session)
+            session.connection.close()
+            self.logger.debug("IPC client disconnected")
+
+    def _handle(self, session: _ClientSession, request: Any) -> dict:
+        """Runs one request and returns its response."""
+        if not isinstance(request, dict):
+            return error_response(None, "Request must be an object")
+
+        request_id = request.get("id")
+        operation = self._operations.get(request.get("op"))
+        if operation is None:
+            return error_response(request_id, f"Unknown operation {request.get('op')!r}")
+
+        try:
+            return {"id": request_id, "ok": True, "result": operation(session, request)}
+        except (KeyError, TypeError, ValueError) as e:
+            return error_response(request_id, f"Invalid request: {e}")
+        except Exception as e:
+            log_exception(self.logger, e, f"IPC operation {request.get('op')}")
+            return error_response(request_id, str(e))
+
+    def _op_hello(self, session: _ClientSession, request: dict) -> dict:
+        """Reports the protocol version and the current snapshot generation."""
+        return {"version": PROTOCOL_VERSION, "generation": self.window_manager.get_snapshot().generation}
+
+    def _op_search(self, session: _ClientSession, request: dict) -> List[list]:
+        """Ranks windows for a query using the connection's own search cache."""
+        limit = request.get("limit")
+        results = session.search_cache.search(self.window_manager.get_search_index(), str(request["query"]),
+                                              min_score=float(request.get("min_score", 0.0)),
+                                              limit=int(limit) if limit is not None else None)
+        return windows_to_wire(results)
+
+    def _op_windows(self, session: _ClientSession, request: dict) -> List[list]:
+        """Lists every window in z-order."""
+        return windows_to_wire(self.window_manager.get_all_windows())
+
+    def _op_switch(self, session: _ClientSession, request: dict) -> bool:
+        """Switches to a window by handle."""
+        return self.window_manager.switch_to_window(int(request["handle"]))
+
+    def _op_subscribe(self, session: _ClientSession, request: dict) -> int:
+        """Starts change events for the connection and returns the current generation."""
+        session.subscribed = True
+        return self.window_manager.get_snapshot().generation
+
+    def _op_unsubscribe(self, session: _ClientSession, request: dict) -> bool:
+        """Stops change events for the connection."""
+        session.subscribed = False
+        return True
+
+    def _on_windows_changed(self, diff: WindowDiff) -> None:
+        """Queues a published diff for the event thread."""
+        self._events.put(diff)
+
+    def _event_loop(self) -> None:
+        """Sends each queued diff to every subscribed connection, encoding it once."""
+        while True:
+            diff = self._events.get()
+            if diff is None:
+                break
+
+            with self._sessions_lock:
+                subscribers = [session for session in self._sessions if session.subscribed]
+            if not subscribers:
+                continue
+
+            payload = encode(diff_to_wire(diff))
+            for session in subscribers:
+                try:
+                    with session.send_lock:
+                        session.connection.send_bytes(payload)
+                except Exception as e:
+                    self.logger.debug("Dropping IPC subscriber: %s", e)
+                    session.subscribed = False
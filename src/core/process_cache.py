@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .window_source import ProcessInfo, WindowSource
+from ..utils.logger import get_logger
+from ..utils.metrics import metrics
+
+PROCESS_REVALIDATE_INTERVAL = 30.0
+
+
+class ProcessCache:
+    """Caches process metadata across window refreshes, keyed by (pid, create time).
+
+    A cached entry is served without any system call until it is older than the
+    revalidation interval. After that, a single create-time lookup confirms the pid
+    has not been reused before the entry is trusted again. begin_pass drops every
+    process that has exited, using one process-list call per enumeration.
+    """
+
+    def __init__(self, source: WindowSource, revalidate_interval: float = PROCESS_REVALIDATE_INTERVAL):
+        self.logger = get_logger("process_cache")
+        self._source = source
+        self._revalidate_interval = revalidate_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[Optional[ProcessInfo], float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def begin_pass(self) -> None:
+        """Evicts processes that are no longer running before an enumeration pass."""
+        if not self._entries:
+            return
+
+        try:
+            live = self._source.list_process_ids()
+        except Exception as e:
+            self.logger.error("Failed to list processes: %s", e)
+            return
+
+        with self._lock:
+            exited = [pid for pid in self._entries if pid not in live]
+            for pid in exited:
+                del self._entries[pid]
+            self.evictions += len(exited)
+
+    def get(self, process_id: int) -> Optional[ProcessInfo]:
+        """Returns cached metadata for a process, loading it on a miss."""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(process_id)
+
+        if entry is not None:
+            info, checked_at = entry
+            if now - checked_at < self._revalidate_interval:
+                self.hits += 1
+                metrics.increment("process_cache.hits")
+                return info
+
+            if info is not None:
+                self.revalidations += 1
+                metrics.increment("process_cache.revalidations")
+                if self._source.get_process_create_time(process_id) == info.create_time:
+                    with self._lock:
+                        self._entries[process_id] = (info, now)
+                    self.hits += 1
+                    return info
+
+        self.misses += 1
+        metrics.increment("process_cache.misses")
+        info = self._source.get_process_info(process_id)
+        with self._lock:
+            self._entries[process_id] = (info, now)
+        return info
+
+    def peek(self, process_id: int) -> Optional[ProcessInfo]:
+        """Returns cached metadata without loading or revalidating, for callers that must not block."""
+        entry = self._entries.get(process_id)
+        return entry[0] if entry is not None else None
+
+    def needs_lookup(self, process_id: int) -> bool:
+        """Returns whether get would call into the source for this process."""
+        entry = self._entries.get(process_id)
+        return entry is None or time.monotonic() - entry[1] >= self._revalidate_interval
+
+    def seed(self, processes: Iterable[ProcessInfo]) -> None:
+        """Preloads metadata from an earlier run, due for revalidation on first use.
+
+        A seeded entry costs one create-time lookup instead of a full process query,
+        and is discarded if its pid now belongs to a different process.
+        """
+        with self._lock:
+            for info in processes:
+                self._entries.setdefault(info.process_id, (info, float("-inf")))
+
+    def known_processes(self) -> List[ProcessInfo]:
+        """Returns the cached metadata of every known process."""
+        with self._lock:
+            return [info for info, _ in self._entries.values() if info is not None]
+
+    def invalidate(self, process_id: Optional[int] = None) -> None:
+        """Drops one process, or every process when no id is given."""
+        with self._lock:
+            if process_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(process_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit, miss, revalidation and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
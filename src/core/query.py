@@ -0,0 +1,185 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .search_index import SearchIndex
+from ..utils.metrics import metrics
+
+QUERY_PLAN_CACHE_SIZE = 256
+
+PROCESS_FIELD = "p"
+TITLE_FIELD = "t"
+STATE_FIELD = "is"
+
+# State name -> (SearchIndex attribute listing the windows in it, attribute holding its per-window mask).
+STATES: Dict[str, Tuple[str, str]] = {
+    "minimized": ("minimized_windows", "minimized"),
+}
+
+_FIELD_PATTERN = re.compile(r'(?<!\S)(-?)(p|t|is):("[^"]*"?|\S*)')
+_EMPTY = np.zeros(0, dtype=np.intp)
+
+
+class QueryPlan:
+    """A parsed query: lowercased filters answered from the index, then free text to fuzzy-score."""
+
+    # A window passes with any of ``processes``, all of ``phrases`` and ``states``, and
+    # none of the ``excluded_`` values; empty tuples do not restrict anything.
+    __slots__ = ("text", "processes", "excluded_processes", "phrases", "excluded_phrases",
+                 "states", "excluded_states")
+
+    def __init__(self, text: str, processes: Tuple[str, ...] = (), excluded_processes: Tuple[str, ...] = (),
+                 phrases: Tuple[str, ...] = (), excluded_phrases: Tuple[str, ...] = (),
+                 states: Tuple[str, ...] = (), excluded_states: Tuple[str, ...] = ()):
+        self.text = text
+        self.processes = processes
+        self.excluded_processes = excluded_processes
+        self.phrases = phrases
+        self.excluded_phrases = excluded_phrases
+        self.states = states
+        self.excluded_states = excluded_states
+
+    @property
+    def filtered(self) -> bool:
+        """Returns whether the plan has any filter."""
+        return any(self.filter_key())
+
+    def filter_key(self) -> tuple:
+        """Returns the filters as a hashable key; plans with equal keys select the same windows."""
+        return (self.processes, self.excluded_processes, self.phrases, self.excluded_phrases,
+                self.states, self.excluded_states)
+
+    def candidates(self, index: SearchIndex) -> Optional[np.ndarray]:
+        """Returns the ascending positions passing the filters, cached per index, or None."""
+        if not self.filtered:
+            return None
+        key = self.filter_key()
+        positions = index.filter_cache.get(key)
+        if positions is None:
+            with metrics.timer("search.filter"):
+                positions = self._evaluate(index)
+            index.filter_cache[key] = positions
+        return positions
+
+    def _evaluate(self, index: SearchIndex) -> np.ndarray:
+        """Selects windows from the hash indexes, then tests the remaining filters on those only."""
+        narrower = self._phrase_prefix_candidates(index)
+        if narrower is not None:
+            return self._filter_titles(index, narrower)
+
+        positions: Optional[np.ndarray] = None
+        if self.processes:
+            slots = _process_slots(index, self.processes)
+            positions = _EMPTY
+            if slots:
+                positions = np.sort(np.concatenate([index.process_windows[slot] for slot in slots]))
+        for state in self.states:
+            columns = STATES.get(state)
+            selected = getattr(index, columns[0]) if columns is not None else _EMPTY
+            if positions is not None:
+                selected = np.intersect1d(positions, selected, assume_unique=True)
+            positions = selected
+        if positions is None:
+            positions = np.arange(len(index))
+
+        if self.excluded_processes and len(positions):
+            slots = _process_slots(index, self.excluded_processes)
+            if slots:
+                excluded = np.zeros(len(index.unique_processes), dtype=bool)
+                excluded[slots] = True
+                positions = positions[~excluded[index.process_slots[positions]]]
+        for state in self.excluded_states:
+            columns = STATES.get(state)
+            if columns is not None and len(positions):
+                positions = positions[~getattr(index, columns[1])[positions]]
+
+        return self._filter_titles(index, positions)
+
+    def _phrase_prefix_candidates(self, index: SearchIndex) -> Optional[np.ndarray]:
+        """Returns cached candidates of the same filters with the last phrase typed shorter."""
+        # A title containing a phrase contains its prefixes, so they can only narrow.
+        if not self.phrases:
+            return None
+        key = list(self.filter_key())
+        last = self.phrases[-1]
+        for end in range(len(last) - 1, 0, -1):
+            key[2] = self.phrases[:-1] + (last[:end],)
+            positions = index.filter_cache.get(tuple(key))
+            if positions is not None:
+                return positions
+        return None
+
+    def _filter_titles(self, index: SearchIndex, positions: np.ndarray) -> np.ndarray:
+        """Keeps the positions whose title contains every phrase and no excluded phrase."""
+        if not (self.phrases or self.excluded_phrases) or not len(positions):
+            return positions
+        whole = len(positions) == len(index)
+        titles = index.titles_lower if whole else [index.titles_lower[i] for i in positions.tolist()]
+        keep = np.ones(len(positions), dtype=bool)
+        for phrase in self.phrases:
+            keep &= np.fromiter((phrase in title for title in titles), dtype=bool, count=len(titles))
+        for phrase in self.excluded_phrases:
+            keep &= ~np.fromiter((phrase in title for title in titles), dtype=bool, count=len(titles))
+        return positions[keep]
+
+    def __repr__(self) -> str:
+        return (f"QueryPlan(text={self.text!r}, processes={self.processes}, "
+                f"excluded_processes={self.excluded_processes}, phrases={self.phrases}, "
+                f"excluded_phrases={self.excluded_phrases}, states={self.states}, "
+                f"excluded_states={self.excluded_states})")
+
+
+def _process_slots(index: SearchIndex, names: Tuple[str, ...]) -> List[int]:
+    """Returns the process slots matching any name: exactly, with or without extension, else by prefix."""
+    slots = set()
+    for name in names:
+        exact = index.process_lookup.get(name)
+        if exact is not None:
+            slots.update(exact)
+        else:
+            slots.update(slot for slot, process in enumerate(index.unique_processes)
+                         if process.startswith(name))
+    return sorted(slots)
+
+
+def _resolve_state(value: str) -> str:
+    """Completes a state name typed so far, e.g. 'min' to 'minimized'; unknown values are kept."""
+    matches = [state for state in STATES if state.startswith(value)]
+    return matches[0] if len(matches) == 1 else value
+
+
+@lru_cache(maxsize=QUERY_PLAN_CACHE_SIZE)
+def parse_query(query: str) -> QueryPlan:
+    """Parses a query into free text and ``p:``, ``t:`` and ``is:`` filters, ``-`` negating."""
+    # Fields with no value yet, as while typing ``p:``, are ignored, and a query
+    # without fields is its own text, so plain searches rank as before.
+    query_lower = query.lower().strip()
+    filters: Dict[Tuple[bool, str], List[str]] = {}
+
+    def take(match: "re.Match") -> str:
+        negated, field, value = match.groups()
+        if value.startswith('"'):
+            value = value[1:-1] if len(value) > 1 and value.endswith('"') else value[1:]
+        if field != TITLE_FIELD:
+            value = value.strip()
+        if value:
+            if field == STATE_FIELD:
+                value = _resolve_state(value)
+            values = filters.setdefault((bool(negated), field), [])
+            if value not in values:
+                values.append(value)
+        return " "
+
+    text, count = _FIELD_PATTERN.subn(take, query_lower)
+    if not count:
+        return QueryPlan(query_lower)
+
+    def values(negated: bool, field: str) -> Tuple[str, ...]:
+        return tuple(filters.get((negated, field), ()))
+
+    return QueryPlan(" ".join(text.split()),
+                     values(False, PROCESS_FIELD), values(True, PROCESS_FIELD),
+                     values(False, TITLE_FIELD), values(True, TITLE_FIELD),
+                     values(False, STATE_FIELD), values(True, STATE_FIELD))
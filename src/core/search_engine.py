@@ -1,8 +1,69 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import compress
+import numpy as np
+from rapidfuzz import process
 from rapidfuzz.fuzz import ratio, partial_ratio
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 
+from .query import QueryPlan, parse_query
+from .search_index import SearchIndex, acronym, tokenize
 from .window import Window
-from ..utils.logger import get_logger, log_exception, SearchEngineError
+from ..utils.logger import get_logger, log_exception, SampledLogger, SearchEngineError
+from ..utils.metrics import metrics
+
+TITLE_WEIGHT = 0.75
+PROCESS_WEIGHT = 0.25
+TITLE_MATCH_BONUS = 10.0
+PROCESS_MATCH_BONUS = 5.0
+WORD_MATCH_BASE = 65.0
+WORD_MATCH_RANGE = 30.0
+ACRONYM_EXACT_SCORE = 90.0
+ACRONYM_PREFIX_SCORE = 85.0
+ACRONYM_SCORE = 80.0
+MIN_ACRONYM_LENGTH = 2
+_MAX_CHAR = chr(0x10FFFF)
+SEARCH_CACHE_SIZE = 64
+TOP_K_CHUNK = 64
+_EPSILON = 1e-6
+
+_search_log = SampledLogger(get_logger("search_engine"))
+
+
+def _query_tokens(query_lower: str) -> Tuple[str, ...]:
+    """Returns the distinct word tokens of a query, in typed order."""
+    return tuple(dict.fromkeys(tokenize(query_lower)))
+
+
+def _acronym_score(query_tokens: Tuple[str, ...], title_acronym: str) -> float:
+    """Scores a single-word query against the initials of a title's words."""
+    if len(query_tokens) != 1 or len(query_tokens[0]) < MIN_ACRONYM_LENGTH:
+        return 0.0
+    query_token = query_tokens[0]
+    if title_acronym == query_token:
+        return ACRONYM_EXACT_SCORE
+    if title_acronym.startswith(query_token):
+        return ACRONYM_PREFIX_SCORE
+    return ACRONYM_SCORE if query_token in title_acronym else 0.0
+
+
+def _token_score(query_tokens: Tuple[str, ...], title_tokens: Tuple[str, ...], title_acronym: str) -> float:
+    """Scores word-prefix and acronym matches of a query against one title's tokens."""
+    # Every query token must start some title word; the score grows with how much of
+    # the matched words was typed, so "vis" ranks below "visual" for Visual Studio.
+    word_score = 0.0
+    if query_tokens:
+        total = 0.0
+        for query_token in query_tokens:
+            best = max((len(query_token) / len(token) for token in title_tokens
+                        if token.startswith(query_token)), default=0.0)
+            if not best:
+                break
+            total += best
+        else:
+            word_score = WORD_MATCH_BASE + WORD_MATCH_RANGE * (total / len(query_tokens))
+    return max(word_score, _acronym_score(query_tokens, title_acronym))
 
 
 def _calculate_score(window: Window, query: str) -> float:
@@ -10,59 +71,469 @@ def _calculate_score(window: Window, query: str) -> float:
     try:
         if not query.strip():
             return 0.0
-            
+
         query_lower = query.lower().strip()
         title_lower = window.title.lower()
         process_lower = window.process_name.lower()
-        
-        title_score = ratio(query_lower, title_lower)
+
+        title_tokens = tokenize(title_lower)
+        title_score = max(ratio(query_lower, title_lower),
+                          _token_score(_query_tokens(query_lower), title_tokens, acronym(title_tokens)))
         process_score = partial_ratio(query_lower, process_lower)
-        
-        final_score = (title_score * 0.75) + (process_score * 0.25)
-        
+
+        final_score = (title_score * TITLE_WEIGHT) + (process_score * PROCESS_WEIGHT)
+
         if query_lower in title_lower:
-            final_score = min(100.0, final_score + 10)
+            final_score = min(100.0, final_score + TITLE_MATCH_BONUS)
         elif query_lower in process_lower:
-            final_score = min(100.0, final_score + 5)
-        
+            final_score = min(100.0, final_score + PROCESS_MATCH_BONUS)
+
         return final_score
     except Exception as e:
         logger = get_logger("search_engine")
-        logger.error(f"Score calculation failed for window '{window.title}': {e}")
+        logger.error("Score calculation failed for window '%s': %s", window.title, e)
         return 0.0
 
 
-def search_windows(windows: List[Window], query: str, min_score: float = 0.0) -> List[Window]:
-    """Searches and ranks windows by relevance to the query string."""
+def _title_fields(query_lower: str, titles_lower: List[str],
+                  score_cutoff: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns ratio scores and substring flags for a batch of normalized titles."""
+    scores = process.cdist([query_lower], titles_lower, scorer=ratio,
+                           score_cutoff=score_cutoff, dtype=np.float64)[0]
+    in_title = np.fromiter((query_lower in title for title in titles_lower), dtype=bool, count=len(titles_lower))
+    return scores, in_title
+
+
+def _process_fields(query_lower: str, index: SearchIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores each distinct process name once and expands the result to one slot per window."""
+    names = index.unique_processes
+    if not names:
+        return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=bool)
+    scores = process.cdist([query_lower], names, scorer=partial_ratio, dtype=np.float64)[0]
+    contains = np.fromiter((query_lower in name for name in names), dtype=bool, count=len(names))
+    return scores[index.process_slots], contains[index.process_slots]
+
+
+def _token_fields(query_lower: str, index: SearchIndex) -> Optional[np.ndarray]:
+    """Computes _token_score for every window, or returns None if no window matches."""
+    # Scores are computed per token group and expanded to windows at the end. Each query
+    # token costs a bisect into the sorted vocabulary and one maximum.reduceat over the
+    # groups' vocabulary slots, however many words or windows it matches.
+    query_tokens = _query_tokens(query_lower)
+    if not query_tokens or not len(index):
+        return None
+
+    # With a single query token the word score grows with coverage alone, so it is
+    # computed per vocabulary word before the reduction instead of per group after it.
+    single = len(query_tokens) == 1
+    vocabulary = index.vocabulary
+    total = lowest = None
+    for query_token in query_tokens:
+        low = bisect_left(vocabulary, query_token)
+        high = bisect_left(vocabulary, query_token + _MAX_CHAR, low)
+        if low == high:
+            total = None
+            break
+        coverage = np.zeros(len(vocabulary) + 1, dtype=np.float64)
+        fraction = len(query_token) / index.vocabulary_lengths[low:high]
+        coverage[low:high] = WORD_MATCH_BASE + WORD_MATCH_RANGE * fraction if single else fraction
+        best = np.maximum.reduceat(coverage[index.token_slots], index.token_offsets)
+        if total is None:
+            total, lowest = best, best
+        else:
+            total, lowest = total + best, np.minimum(lowest, best)
+
+    group_scores = None
+    if total is not None:
+        group_scores = total if single else (
+            (lowest > 0) * (WORD_MATCH_BASE + WORD_MATCH_RANGE * (total / len(query_tokens))))
+
+    if single and len(query_tokens[0]) >= MIN_ACRONYM_LENGTH:
+        query_token = query_tokens[0]
+        text, starts = index.acronym_text, index.acronym_starts
+        acronym_scores = None
+        position = text.find(query_token)
+        while position != -1:
+            slot = bisect_right(starts, position) - 1
+            if acronym_scores is None:
+                acronym_scores = np.zeros(len(index.unique_acronyms), dtype=np.float64)
+            if not acronym_scores[slot]:
+                acronym_scores[slot] = _acronym_score(query_tokens, index.unique_acronyms[slot])
+            position = text.find(query_token, position + 1)
+        if acronym_scores is not None:
+            acronym_scores = acronym_scores[index.group_acronyms]
+            group_scores = acronym_scores if group_scores is None else np.maximum(group_scores, acronym_scores)
+
+    return None if group_scores is None else group_scores[index.token_groups]
+
+
+def _combine_scores(title_scores: np.ndarray, process_scores: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    """Applies field weights and substring bonuses to raw field scores."""
+    scores = (title_scores * TITLE_WEIGHT) + (process_scores * PROCESS_WEIGHT)
+    return np.where(bonus > 0, np.minimum(100.0, scores + bonus), scores)
+
+
+def _title_bound(lcs_upper: np.ndarray, total_lengths: np.ndarray) -> np.ndarray:
+    """Converts an upper bound on the title LCS into an upper bound on its ratio score."""
+    return np.minimum(100.0, 200.0 * lcs_upper / total_lengths)
+
+
+class _Selection:
+    """Outcome of a scoring pass: ranked positions plus title data for the windows visited.
+
+    ``visited`` lists every window whose substring flag was computed and ``scored``
+    the subset whose title ratio was computed, with the cutoff it was computed under.
+    """
+
+    __slots__ = ("ranked", "visited", "in_title", "scored", "title_scores", "cutoffs")
+
+    def __init__(self, ranked: np.ndarray, visited: np.ndarray, in_title: np.ndarray,
+                 scored: np.ndarray, title_scores: np.ndarray, cutoffs: np.ndarray):
+        self.ranked = ranked
+        self.visited = visited
+        self.in_title = in_title
+        self.scored = scored
+        self.title_scores = title_scores
+        self.cutoffs = cutoffs
+
+
+def _join(parts: List[Tuple[np.ndarray, ...]]) -> Tuple[np.ndarray, ...]:
+    """Concatenates per-chunk columns, skipping the copy when there was only one chunk."""
+    if len(parts) == 1:
+        return parts[0]
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def _select(query_lower: str, index: SearchIndex, ratio_bound: np.ndarray, title_possible: np.ndarray,
+            min_score: float, limit: Optional[int], candidates: Optional[np.ndarray] = None) -> _Selection:
+    """Scores windows that can still qualify and returns them ranked like a full stable sort.
+
+    A window's title score is the better of its full-title ``ratio`` and its token
+    score. ``ratio_bound`` caps the ratio and ``title_possible`` says whether the query
+    may still be a substring of the title. Token scores are exact and cheap, so the
+    ratio is only computed where it could beat them, and windows whose combined bound
+    is below the threshold are never scored; the index prior is added to both. With
+    a limit larger indexes are visited in descending bound order in chunks that double
+    in size, the threshold rises to the k-th best score found so far, and rapidfuzz's
+    score_cutoff follows it so hopeless titles are abandoned early. ``candidates``
+    restricts scoring to the ascending positions that passed a query's filters.
+    """
+    process_scores, in_process = _process_fields(query_lower, index)
+    token_scores = _token_fields(query_lower, index)
+    if token_scores is None:
+        needs_ratio = None
+        title_bound = ratio_bound
+    else:
+        needs_ratio = ratio_bound >= token_scores - _EPSILON
+        title_bound = np.maximum(ratio_bound, token_scores)
+    bonus_bound = np.where(title_possible, TITLE_MATCH_BONUS, np.where(in_process, PROCESS_MATCH_BONUS, 0.0))
+    bound = np.minimum(100.0, title_bound * TITLE_WEIGHT + process_scores * PROCESS_WEIGHT + bonus_bound)
+    bound += index.prior
+
+    count = len(index) if candidates is None else len(candidates)
+    in_order = limit is None or count <= max(TOP_K_CHUNK, 4 * limit)
+    if in_order:
+        order = np.arange(len(index)) if candidates is None else candidates
+        chunk_size = max(len(order), 1)
+    elif candidates is None:
+        order = np.argsort(-bound, kind="stable")
+        chunk_size = max(TOP_K_CHUNK, 4 * limit)
+    else:
+        order = candidates[np.argsort(-bound[candidates], kind="stable")]
+        chunk_size = max(TOP_K_CHUNK, 4 * limit)
+
+    threshold = min_score
+    kept = np.zeros(0, dtype=np.float64)
+    parts: List[Tuple[np.ndarray, ...]] = []
+    ratio_parts: List[Tuple[np.ndarray, ...]] = []
+
+    start = 0
+    while start < len(order):
+        chunk = order[start:start + chunk_size]
+        start += chunk_size
+        chunk_size *= 2
+        chunk = chunk[bound[chunk] >= threshold - _EPSILON]
+        if not len(chunk):
+            break
+
+        # A chunk holding the whole index in order reads the columns as views, not copies.
+        whole = in_order and len(chunk) == len(index)
+        rows = slice(None) if whole else chunk
+        titles = index.titles_lower if whole else [index.titles_lower[i] for i in chunk.tolist()]
+        in_title = np.fromiter((query_lower in title for title in titles), dtype=bool, count=len(chunk))
+        bonus = np.where(in_title, TITLE_MATCH_BONUS, np.where(in_process[rows], PROCESS_MATCH_BONUS, 0.0))
+        title_scores = token_scores[rows] if token_scores is not None else np.zeros(len(chunk))
+
+        required = (threshold - index.prior[rows] - process_scores[rows] * PROCESS_WEIGHT - bonus) / TITLE_WEIGHT
+        ratio_mask = ratio_bound[rows] >= required - _EPSILON
+        if needs_ratio is not None:
+            ratio_mask &= needs_ratio[rows]
+        selected = int(np.count_nonzero(ratio_mask))
+        if selected:
+            full = selected == len(chunk)
+            ratio_chunk = chunk if full else chunk[ratio_mask]
+            cutoff = min(100.0, max(0.0, float((required if full else required[ratio_mask]).min()) - _EPSILON))
+            ratio_titles = titles if full else list(compress(titles, ratio_mask.tolist()))
+            ratios = process.cdist([query_lower], ratio_titles, scorer=ratio,
+                                   score_cutoff=cutoff, dtype=np.float64)[0]
+            if full:
+                title_scores = np.maximum(ratios, title_scores)
+            else:
+                title_scores = title_scores.copy()
+                title_scores[ratio_mask] = np.maximum(ratios, title_scores[ratio_mask])
+            ratio_parts.append((ratio_chunk, ratios, np.full(selected, cutoff)))
+
+        scores = _combine_scores(title_scores, process_scores[rows], bonus)
+        scores += index.prior[rows]
+        parts.append((chunk, scores, in_title))
+
+        if limit is not None:
+            kept = np.concatenate([kept, scores[scores >= min_score]])
+            if len(kept) >= limit:
+                kth = float(np.partition(kept, len(kept) - limit)[len(kept) - limit])
+                threshold = max(min_score, kth)
+
+    empty = np.zeros(0, dtype=np.intp)
+    if not parts:
+        return _Selection(empty, empty, np.zeros(0, dtype=bool), empty, np.zeros(0), np.zeros(0))
+
+    visited, scores, in_title = _join(parts)
+    if ratio_parts:
+        scored, title_scores, cutoffs = _join(ratio_parts)
+    else:
+        scored, title_scores, cutoffs = empty, np.zeros(0), np.zeros(0)
+
+    qualifying = scores >= min_score
+    positions = visited[qualifying]
+    ranked = positions[np.lexsort((positions, -scores[qualifying]))]
+    if limit is not None:
+        ranked = ranked[:limit]
+    return _Selection(ranked, visited, in_title, scored, title_scores, cutoffs)
+
+
+def _unranked(windows: Union[List[Window], SearchIndex], limit: Optional[int],
+              candidates: Optional[np.ndarray] = None) -> List[Window]:
+    """Returns windows, or only the candidate positions, for an empty query: by prior for an index."""
+    if isinstance(windows, SearchIndex):
+        if candidates is None:
+            order = windows.prior_order
+        else:
+            order = candidates[np.argsort(-windows.prior[candidates], kind="stable")]
+        order = order if limit is None else order[:limit]
+        return [windows.windows[i] for i in order]
+    return list(windows) if limit is None else windows[:limit]
+
+
+@metrics.timed("search.search_windows")
+def search_windows(windows: Union[List[Window], SearchIndex], query: str, min_score: float = 0.0,
+                   limit: Optional[int] = None) -> List[Window]:
+    """Searches and ranks windows by relevance to the query string.
+
+    Accepts either a plain window list or a prebuilt SearchIndex; passing the index
+    avoids normalizing every title again, and its prior is added to each window's
+    score, so min_score applies to the blended value. With a limit, only the best
+    ``limit`` windows are returned and the rest are rejected by score bounds instead
+    of being sorted. An empty query returns windows in prior order. Field filters such
+    as ``p:chrome`` (see parse_query) are applied first, and only the windows passing
+    them are fuzzy-scored.
+    """
     logger = get_logger("search_engine")
-    
+    index = windows if isinstance(windows, SearchIndex) else None
+
     if not query or not query.strip():
         logger.debug("Empty query, returning all windows")
-        return windows
-    
-    if not windows:
+        return _unranked(index if index is not None else windows, limit)
+
+    if not len(windows):
         logger.debug("No windows to search")
         return []
-    
+
+    try:
+        if index is None:
+            index = SearchIndex(windows)
+        plan = parse_query(query)
+        candidates = plan.candidates(index)
+        if not plan.text:
+            return _unranked(index, limit, candidates)
+
+        query_lower = plan.text
+        lcs_upper = np.minimum(index.title_lengths, len(query_lower))
+        ratio_bound = _title_bound(lcs_upper, index.title_lengths + len(query_lower))
+        selection = _select(query_lower, index, ratio_bound, np.ones(len(index), dtype=bool), min_score, limit,
+                            candidates)
+        result = [index.windows[i] for i in selection.ranked.tolist()]
+        _search_log.debug("Searched %d windows for '%s': %d matches", len(index), query, len(result))
+        return result
+
+    except Exception as e:
+        log_exception(logger, e, "window search")
+        raise SearchEngineError("Failed to search windows") from e
+
+
+def search_windows_reference(windows: List[Window], query: str, min_score: float = 0.0) -> List[Window]:
+    """Ranks windows one at a time with _calculate_score; kept to cross-check the batch scorer."""
+    logger = get_logger("search_engine")
+
+    if not query or not query.strip():
+        return windows
+
     try:
-        logger.info(f"Searching {len(windows)} windows: '{query}'")
         scored_windows: List[Tuple[Window, float]] = []
-        
+
         for window in windows:
             try:
                 score = _calculate_score(window, query)
                 if score >= min_score:
                     scored_windows.append((window, score))
             except Exception as e:
-                logger.error(f"Failed to score window {window.handle}: {e}")
+                logger.error("Failed to score window %s: %s", window.handle, e)
                 continue
-        
+
         scored_windows.sort(key=lambda x: x[1], reverse=True)
-        
-        result = [window for window, score in scored_windows]
-        logger.info(f"Found {len(result)} matches")
-        return result
-        
+        return [window for window, score in scored_windows]
+
     except Exception as e:
-        log_exception(logger, e, "window search")
+        log_exception(logger, e, "reference window search")
         raise SearchEngineError("Failed to search windows") from e
+
+
+class _QueryResult:
+    """Per-query state kept by SearchCache: free-text title bounds, or None, and the ranked result."""
+
+    __slots__ = ("text", "title_lcs", "in_title", "windows")
+
+    def __init__(self, text: str, title_lcs: Optional[np.ndarray], in_title: Optional[np.ndarray],
+                 windows: List[Window]):
+        self.text = text
+        self.title_lcs = title_lcs
+        self.in_title = in_title
+        self.windows = windows
+
+
+class SearchCache:
+    """Memoizes ranked results for one SearchIndex generation.
+
+    Title scores come from ``ratio``, which is ``200 * LCS / (len(query) + len(title))``.
+    Appending k characters to a query can raise the LCS by at most k, so a window's best
+    possible score for an extended query is known without rescoring it. When the user
+    keeps typing, only windows whose bound can still reach the threshold are rescored.
+    Token scores are cheap and exact, so they are simply recomputed for each query.
+    Bounds only prune against a positive min_score or a limit; other queries are only
+    memoized.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE):
+        self.logger = get_logger("search_cache")
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index: Optional[SearchIndex] = None
+        self._results: "OrderedDict[Tuple[str, float, Optional[int]], _QueryResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.refinements = 0
+        self.rescored = 0
+
+    def invalidate(self) -> None:
+        """Drops all memoized results."""
+        with self._lock:
+            self._index = None
+            self._results.clear()
+
+    def _load_index(self, index: SearchIndex) -> None:
+        """Switches to a newly published index, dropping results for the old one."""
+        self._index = index
+        self._results.clear()
+        self.logger.debug("Search cache loaded generation %s (%s windows)", index.generation, len(index))
+
+    def _find_prefix(self, query_lower: str, text: str, min_score: float,
+                     limit: Optional[int]) -> Optional[_QueryResult]:
+        """Returns the longest cached prefix of the query with bounds for a prefix of text."""
+        # Bounds depend on the free text alone, so the prefix's filters need not match.
+        for end in range(len(query_lower) - 1, 0, -1):
+            entry = self._results.get((query_lower[:end], min_score, limit))
+            if entry is not None and entry.title_lcs is not None and text.startswith(entry.text):
+                return entry
+        return None
+
+    def _score(self, plan: QueryPlan, min_score: float, limit: Optional[int],
+               prefix: Optional[_QueryResult]) -> _QueryResult:
+        """Scores the query, skipping windows whose bound cannot reach the threshold."""
+        index = self._index
+        candidates = plan.candidates(index)
+        if not plan.text:
+            return _QueryResult("", None, None, _unranked(index, limit, candidates))
+
+        query_lower = plan.text
+        query_length = len(query_lower)
+        total_lengths = index.title_lengths + query_length
+        lcs_upper = np.minimum(index.title_lengths, query_length)
+
+        if min_score <= 0 and limit is None:
+            selection = _select(query_lower, index, _title_bound(lcs_upper, total_lengths),
+                                np.ones(len(index), dtype=bool), min_score, limit, candidates)
+            return _QueryResult(query_lower, None, None, [index.windows[i] for i in selection.ranked.tolist()])
+
+        if prefix is None:
+            in_title = np.ones(len(index), dtype=bool)
+        else:
+            lcs_upper = np.minimum(lcs_upper, prefix.title_lcs + (query_length - len(prefix.text)))
+            in_title = prefix.in_title.copy()
+
+        selection = _select(query_lower, index, _title_bound(lcs_upper, total_lengths), in_title, min_score, limit,
+                            candidates)
+
+        scored = selection.scored
+        exact = selection.title_scores >= selection.cutoffs
+        lcs_upper[scored] = np.where(exact,
+                                     np.rint(selection.title_scores * total_lengths[scored] / 200.0),
+                                     np.ceil(selection.cutoffs * total_lengths[scored] / 200.0))
+        in_title[selection.visited] = selection.in_title
+        self.rescored += len(scored)
+        metrics.record("search_cache.rescored_windows", len(scored), "windows")
+
+        windows = [index.windows[i] for i in selection.ranked.tolist()]
+        return _QueryResult(query_lower, lcs_upper, in_title, windows)
+
+    @metrics.timed("search.cache_search")
+    def search(self, index: SearchIndex, query: str, min_score: float = 0.0,
+               limit: Optional[int] = None) -> List[Window]:
+        """Searches an index like search_windows, reusing work from earlier keystrokes."""
+        if not query or not query.strip():
+            return _unranked(index, limit)
+
+        if not len(index):
+            return []
+
+        try:
+            with self._lock:
+                if index is not self._index:
+                    self._load_index(index)
+
+                query_lower = query.lower().strip()
+                key = (query_lower, min_score, limit)
+                entry = self._results.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    metrics.increment("search_cache.hits")
+                    self._results.move_to_end(key)
+                    return list(entry.windows)
+
+                self.misses += 1
+                metrics.increment("search_cache.misses")
+                plan = parse_query(query)
+                prefix = None
+                if min_score > 0 or limit is not None:
+                    prefix = self._find_prefix(query_lower, plan.text, min_score, limit)
+                if prefix is not None:
+                    self.refinements += 1
+                    metrics.increment("search_cache.refinements")
+
+                entry = self._score(plan, min_score, limit, prefix)
+                self._results[key] = entry
+                if len(self._results) > self._max_entries:
+                    self._results.popitem(last=False)
+                return list(entry.windows)
+
+        except Exception as e:
+            log_exception(self.logger, e, "cached window search")
+            raise SearchEngineError("Failed to search windows") from e
@@ -0,0 +1,137 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .window import Window
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Splits lowercased text into alphanumeric word tokens."""
+    return tuple(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def acronym(tokens: Tuple[str, ...]) -> str:
+    """Returns the first letter of each token, e.g. 'vsc' for Visual Studio Code."""
+    return "".join(token[0] for token in tokens)
+
+
+def process_keys(process_lower: str) -> Tuple[str, ...]:
+    """Returns the names a process can be looked up by: with and without its extension."""
+    stem = os.path.splitext(process_lower)[0]
+    return (process_lower, stem) if stem and stem != process_lower else (process_lower,)
+
+
+class SearchIndex:
+    """Lowercased, tokenized columns of a window list, built once per published list."""
+
+    __slots__ = ("windows", "generation", "titles_lower", "processes_lower",
+                 "title_tokens", "acronyms", "title_lengths", "unique_processes", "process_slots",
+                 "token_groups", "vocabulary", "vocabulary_lengths", "token_slots", "token_offsets",
+                 "group_acronyms", "unique_acronyms", "acronym_text", "acronym_starts", "prior", "prior_order",
+                 "minimized", "minimized_windows", "process_lookup", "process_windows", "filter_cache")
+
+    def __init__(self, windows: List[Window], generation: int = 0, previous: Optional["SearchIndex"] = None,
+                 prior: Optional[np.ndarray] = None):
+        self.windows = list(windows)
+        self.generation = generation
+        self.titles_lower = []
+        self.processes_lower = []
+        self.title_tokens = []
+        self.acronyms = []
+
+        # Windows whose title and process are unchanged reuse the previous index's fields.
+        reusable = previous._entries_by_handle() if previous is not None else {}
+        for window in self.windows:
+            entry = reusable.get(window.handle)
+            if entry is None or entry[0] != window.title or entry[1] != window.process_name:
+                title_lower = window.title.lower()
+                tokens = tokenize(title_lower)
+                entry = (window.title, window.process_name, title_lower,
+                         window.process_name.lower(), tokens, acronym(tokens))
+            self.titles_lower.append(entry[2])
+            self.processes_lower.append(entry[3])
+            self.title_tokens.append(entry[4])
+            self.acronyms.append(entry[5])
+
+        self.title_lengths = np.fromiter((len(title) for title in self.titles_lower),
+                                         dtype=np.float64, count=len(self.titles_lower))
+
+        # Many windows share a process, so process fields are scored once per distinct name.
+        slots: Dict[str, int] = {}
+        self.process_slots = np.fromiter((slots.setdefault(name, len(slots))
+                                          for name in self.processes_lower),
+                                         dtype=np.intp, count=len(self.processes_lower))
+        self.unique_processes = list(slots)
+
+        # Hash indexes for query filters: process name, with and without extension, to
+        # process slots; each slot's windows; the minimized windows.
+        self.process_lookup: Dict[str, List[int]] = {}
+        for slot, name in enumerate(self.unique_processes):
+            for key in process_keys(name):
+                self.process_lookup.setdefault(key, []).append(slot)
+        by_process = np.argsort(self.process_slots, kind="stable")
+        counts = np.bincount(self.process_slots, minlength=len(self.unique_processes))
+        self.process_windows = np.split(by_process, np.cumsum(counts)[:-1]) if len(counts) else []
+
+        self.minimized = np.fromiter((window.minimized for window in self.windows), dtype=bool,
+                                     count=len(self.windows))
+        self.minimized_windows = np.flatnonzero(self.minimized)
+        # Candidates of each query filter evaluated against this index.
+        self.filter_cache: Dict[tuple, np.ndarray] = {}
+
+        # Windows with identical title tokens share a token group, matched once per keystroke.
+        groups: Dict[Tuple[str, ...], int] = {}
+        self.token_groups = np.fromiter((groups.setdefault(tokens, len(groups)) for tokens in self.title_tokens),
+                                        dtype=np.intp, count=len(self.title_tokens))
+
+        # Sorted distinct title tokens, so the words starting with a prefix are one slice.
+        self.vocabulary = sorted({token for tokens in groups for token in tokens})
+        self.vocabulary_lengths = np.fromiter((len(token) for token in self.vocabulary),
+                                              dtype=np.float64, count=len(self.vocabulary))
+        vocabulary_slots = {token: slot for slot, token in enumerate(self.vocabulary)}
+        sentinel = len(self.vocabulary)
+        # Each group's vocabulary slots start at its offset, led by a sentinel slot past
+        # the end of the vocabulary so that no group's run is empty.
+        token_slots: List[int] = []
+        token_offsets: List[int] = []
+        for tokens in groups:
+            token_offsets.append(len(token_slots))
+            token_slots.append(sentinel)
+            token_slots.extend({vocabulary_slots[token] for token in tokens})
+        self.token_slots = np.array(token_slots, dtype=np.intp)
+        self.token_offsets = np.array(token_offsets, dtype=np.intp)
+
+        slots = {}
+        self.group_acronyms = np.fromiter((slots.setdefault(acronym(tokens), len(slots)) for tokens in groups),
+                                          dtype=np.intp, count=len(groups))
+        self.unique_acronyms = list(slots)
+        # Distinct acronyms joined by NUL, so one string search finds every match.
+        self.acronym_text = "\0".join(self.unique_acronyms)
+        self.acronym_starts = []
+        offset = 0
+        for value in self.unique_acronyms:
+            self.acronym_starts.append(offset)
+            offset += len(value) + 1
+
+        # Per-window ranking points such as frecency, added to every text score.
+        if prior is None:
+            self.prior = np.zeros(len(self.windows), dtype=np.float64)
+            self.prior_order = np.arange(len(self.windows))
+        else:
+            self.prior = np.asarray(prior, dtype=np.float64)
+            self.prior_order = np.argsort(-self.prior, kind="stable")
+
+    def _entries_by_handle(self) -> Dict[int, tuple]:
+        """Returns normalized fields per handle so a newer index can reuse them."""
+        return {
+            window.handle: (window.title, window.process_name, self.titles_lower[i],
+                            self.processes_lower[i], self.title_tokens[i], self.acronyms[i])
+            for i, window in enumerate(self.windows)
+        }
+
+    def __len__(self) -> int:
+        return len(self.windows)
@@ -0,0 +1,107 @@
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .window import Window
+from .window_source import ProcessInfo
+from ..utils.logger import get_logger, log_exception
+
+WARM_START_MAGIC = b"TBWS"
+WARM_START_VERSION = 2
+
+_HEADER = struct.Struct("<4sHII")
+_PROCESS = struct.Struct("<Id")
+_WINDOW = struct.Struct("<QI?")
+_LENGTH = struct.Struct("<H")
+_MAX_TEXT_BYTES = 0xFFFF
+
+
+def default_warm_start_path() -> Path:
+    """Returns the default warm-start file location, next to the frecency store."""
+    return Path(__file__).parent.parent / "data" / "warm_start.bin"
+
+
+def _pack_text(text: str) -> bytes:
+    """Encodes text as a length-prefixed UTF-8 string, truncating oversized values."""
+    data = text.encode("utf-8", errors="replace")[:_MAX_TEXT_BYTES]
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(buffer, offset: int) -> Tuple[str, int]:
+    """Decodes a length-prefixed string and returns it with the next offset."""
+    (length,) = _LENGTH.unpack_from(buffer, offset)
+    offset += _LENGTH.size
+    return bytes(buffer[offset:offset + length]).decode("utf-8", errors="replace"), offset + length
+
+
+def save_warm_start(path: Path, windows: List[Window], processes: List[ProcessInfo]) -> None:
+    """Writes the window list and the metadata of its processes as a compact binary file.
+
+    Layout: a header (magic, version, process count, window count), then one record
+    per process (pid, create time, name, exe) and one per window (handle, pid,
+    minimized, title),
+    with strings stored as a 16-bit length followed by UTF-8 bytes.
+    """
+    logger = get_logger("warm_start")
+    window_pids = {window.process_id for window in windows}
+    processes = [info for info in processes if info.process_id in window_pids]
+
+    parts = [_HEADER.pack(WARM_START_MAGIC, WARM_START_VERSION, len(processes), len(windows))]
+    for info in processes:
+        parts.append(_PROCESS.pack(info.process_id, info.create_time))
+        parts.append(_pack_text(info.name))
+        parts.append(_pack_text(info.exe))
+    for window in windows:
+        parts.append(_WINDOW.pack(window.handle, window.process_id, window.minimized))
+        parts.append(_pack_text(window.title))
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_bytes(b"".join(parts))
+        os.replace(temp_path, path)
+        logger.debug("Saved warm start with %s windows to %s", len(windows), path)
+    except Exception as e:
+        log_exception(logger, e, f"saving warm start {path}")
+
+
+def load_warm_start(path: Path) -> Optional[Tuple[List[Window], List[ProcessInfo]]]:
+    """Reads a warm-start file through a read-only memory map.
+
+    Returns None when the file is missing, empty, from another format version or
+    corrupt; a warm start is only an optimization, so callers fall back to a full load.
+    """
+    logger = get_logger("warm_start")
+    try:
+        if not path.exists() or path.stat().st_size < _HEADER.size:
+            return None
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version, process_count, window_count = _HEADER.unpack_from(buffer, 0)
+            if magic != WARM_START_MAGIC or version != WARM_START_VERSION:
+                logger.info("Ignoring warm start %s with unknown format", path)
+                return None
+
+            offset = _HEADER.size
+            processes = {}
+            for _ in range(process_count):
+                pid, create_time = _PROCESS.unpack_from(buffer, offset)
+                name, offset = _unpack_text(buffer, offset + _PROCESS.size)
+                exe, offset = _unpack_text(buffer, offset)
+                processes[pid] = ProcessInfo(pid, create_time, name, exe)
+
+            windows = []
+            for _ in range(window_count):
+                handle, pid, minimized = _WINDOW.unpack_from(buffer, offset)
+                title, offset = _unpack_text(buffer, offset + _WINDOW.size)
+                info = processes.get(pid)
+                if info is not None:
+                    windows.append(Window(handle, title, pid, info.name, minimized))
+
+        return windows, list(processes.values())
+
+    except Exception as e:
+        log_exception(logger, e, f"loading warm start {path}")
+        return None
@@ -0,0 +1,225 @@
+import ctypes
+from ctypes import wintypes
+from functools import lru_cache
+
+import psutil
+import win32gui
+import win32process
+import win32con
+from typing import List, Optional, Set
+
+from .window_events import WindowEventSource, WinEventHookSource
+from .window_source import IconImage, ProcessInfo, Rect, WindowSource
+from ..utils.logger import get_logger
+
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+
+class _ICONINFO(ctypes.Structure):
+    _fields_ = [("fIcon", wintypes.BOOL), ("xHotspot", wintypes.DWORD), ("yHotspot", wintypes.DWORD),
+                ("hbmMask", wintypes.HBITMAP), ("hbmColor", wintypes.HBITMAP)]
+
+
+class _BITMAP(ctypes.Structure):
+    _fields_ = [("bmType", wintypes.LONG), ("bmWidth", wintypes.LONG), ("bmHeight", wintypes.LONG),
+                ("bmWidthBytes", wintypes.LONG), ("bmPlanes", wintypes.WORD),
+                ("bmBitsPixel", wintypes.WORD), ("bmBits", wintypes.LPVOID)]
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD), ("biCompression", wintypes.DWORD),
+                ("biSizeImage", wintypes.DWORD), ("biXPelsPerMeter", wintypes.LONG),
+                ("biYPelsPerMeter", wintypes.LONG), ("biClrUsed", wintypes.DWORD), ("biClrImportant", wintypes.DWORD)]
+
+
+@lru_cache(maxsize=None)
+def _load_icon_apis():
+    """Returns private user32, gdi32 and shell32 with typed icon extraction signatures."""
+    # Untyped calls pass and return C ints, which would truncate 64-bit HDC, HBITMAP and HICON handles.
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+    shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+    shell32.SHDefExtractIconW.restype = wintypes.LONG
+    shell32.SHDefExtractIconW.argtypes = [wintypes.LPCWSTR, ctypes.c_int, wintypes.UINT,
+                                          ctypes.POINTER(wintypes.HICON), ctypes.POINTER(wintypes.HICON),
+                                          wintypes.UINT]
+    user32.GetIconInfo.restype = wintypes.BOOL
+    user32.GetIconInfo.argtypes = [wintypes.HICON, ctypes.POINTER(_ICONINFO)]
+    user32.DestroyIcon.restype = wintypes.BOOL
+    user32.DestroyIcon.argtypes = [wintypes.HICON]
+    user32.GetDC.restype = wintypes.HDC
+    user32.GetDC.argtypes = [wintypes.HWND]
+    user32.ReleaseDC.restype = ctypes.c_int
+    user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+    gdi32.GetObjectW.restype = ctypes.c_int
+    gdi32.GetObjectW.argtypes = [wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID]
+    gdi32.GetDIBits.restype = ctypes.c_int
+    gdi32.GetDIBits.argtypes = [wintypes.HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT, wintypes.LPVOID,
+                                ctypes.POINTER(_BITMAPINFOHEADER), wintypes.UINT]
+    gdi32.DeleteObject.restype = wintypes.BOOL
+    gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+    return user32, gdi32, shell32
+
+
+def _bitmap_pixels(gdi32, dc, bitmap, width: int, height: int) -> bytes:
+    """Reads a bitmap as top-down 32-bit BGRA rows."""
+    header = _BITMAPINFOHEADER(biSize=ctypes.sizeof(_BITMAPINFOHEADER), biWidth=width, biHeight=-height,
+                               biPlanes=1, biBitCount=32, biCompression=BI_RGB)
+    buffer = ctypes.create_string_buffer(width * height * 4)
+    if not gdi32.GetDIBits(dc, bitmap, 0, height, buffer, ctypes.byref(header), DIB_RGB_COLORS):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return buffer.raw
+
+
+def _icon_image(icon) -> Optional[IconImage]:
+    """Converts an HICON to pixels, deriving alpha from the mask for icons without it."""
+    user32, gdi32, _ = _load_icon_apis()
+    info = _ICONINFO()
+    if not user32.GetIconInfo(icon, ctypes.byref(info)):
+        return None
+
+    dc = user32.GetDC(None)
+    try:
+        if not info.hbmColor:
+            return None
+        bitmap = _BITMAP()
+        gdi32.GetObjectW(info.hbmColor, ctypes.sizeof(_BITMAP), ctypes.byref(bitmap))
+        width, height = bitmap.bmWidth, bitmap.bmHeight
+        pixels = bytearray(_bitmap_pixels(gdi32, dc, info.hbmColor, width, height))
+        if not any(pixels[3::4]):
+            mask = _bitmap_pixels(gdi32, dc, info.hbmMask, width, height)
+            pixels[3::4] = bytes(0 if value else 255 for value in mask[0::4])
+        return IconImage(width, height, bytes(pixels))
+    finally:
+        user32.ReleaseDC(None, dc)
+        if info.hbmColor:
+            gdi32.DeleteObject(info.hbmColor)
+        if info.hbmMask:
+            gdi32.DeleteObject(info.hbmMask)
+
+
+class Win32WindowSource(WindowSource):
+    """Window source backed by pywin32 and psutil."""
+
+    def __init__(self):
+        self.logger = get_logger("win32_source")
+
+    def enumerate_handles(self) -> List[int]:
+        """Returns all top-level window handles in z-order."""
+        handles: List[int] = []
+
+        def callback(handle: int, extra) -> bool:
+            """Collects each enumerated handle."""
+            handles.append(handle)
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        return handles
+
+    def is_window(self, handle: int) -> bool:
+        """Returns whether the handle still refers to a window."""
+        return bool(win32gui.IsWindow(handle))
+
+    def is_visible(self, handle: int) -> bool:
+        """Returns whether the window is visible."""
+        return bool(win32gui.IsWindowVisible(handle))
+
+    def get_title(self, handle: int) -> str:
+        """Returns the window title text."""
+        return win32gui.GetWindowText(handle)
+
+    def get_style(self, handle: int) -> int:
+        """Returns the window style bits."""
+        return win32gui.GetWindowLong(handle, win32con.GWL_STYLE)
+
+    def get_ex_style(self, handle: int) -> int:
+        """Returns the extended window style bits."""
+        return win32gui.GetWindowLong(handle, win32con.GWL_EXSTYLE)
+
+    def get_owner(self, handle: int) -> int:
+        """Returns the owner window handle, or 0 for unowned windows."""
+        return win32gui.GetWindow(handle, win32con.GW_OWNER)
+
+    def get_class_name(self, handle: int) -> str:
+        """Returns the window class name."""
+        return win32gui.GetClassName(handle)
+
+    def is_minimized(self, handle: int) -> bool:
+        """Returns whether the window is minimized."""
+        return bool(win32gui.IsIconic(handle))
+
+    def get_rect(self, handle: int) -> Rect:
+        """Returns the window rectangle as (left, top, right, bottom)."""
+        return win32gui.GetWindowRect(handle)
+
+    def get_process_id(self, handle: int) -> int:
+        """Returns the id of the process that owns the window."""
+        return win32process.GetWindowThreadProcessId(handle)[1]
+
+    def get_process_info(self, process_id: int) -> Optional[ProcessInfo]:
+        """Returns metadata for a process, or None if it cannot be read."""
+        try:
+            process = psutil.Process(process_id)
+            with process.oneshot():
+                name = process.name()
+                try:
+                    exe = process.exe()
+                except psutil.AccessDenied:
+                    exe = ""
+                return ProcessInfo(process_id, process.create_time(), name, exe)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def get_process_create_time(self, process_id: int) -> Optional[float]:
+        """Returns the creation time of a process, or None if it has exited."""
+        try:
+            return psutil.Process(process_id).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def list_process_ids(self) -> Set[int]:
+        """Returns the ids of all running processes."""
+        return set(psutil.pids())
+
+    def activate(self, handle: int) -> bool:
+        """Restores the window if needed and brings it to the foreground."""
+        if win32gui.IsIconic(handle):
+            win32gui.ShowWindow(handle, win32con.SW_RESTORE)
+        else:
+            win32gui.ShowWindow(handle, win32con.SW_SHOW)
+
+        win32gui.BringWindowToTop(handle)
+
+        if not win32gui.SetForegroundWindow(handle):
+            try:
+                win32gui.SetWindowPos(handle, win32con.HWND_TOP, 0, 0, 0, 0,
+                                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE |
+                                    win32con.SWP_SHOWWINDOW)
+            except Exception as pos_error:
+                self.logger.error("SetWindowPos failed %s: %s", handle, pos_error)
+                try:
+                    win32gui.ShowWindow(handle, win32con.SW_SHOW)
+                except Exception as show_error:
+                    self.logger.error("ShowWindow failed %s: %s", handle, show_error)
+                    return False
+
+        return True
+
+    def get_icon(self, exe: str, size: int) -> Optional[IconImage]:
+        """Extracts the first icon of an executable at size pixels through the shell."""
+        if not exe:
+            return None
+        user32, _, shell32 = _load_icon_apis()
+        icon = wintypes.HICON()
+        if shell32.SHDefExtractIconW(exe, 0, 0, ctypes.byref(icon), None, size) != 0 or not icon:
+            return None
+        try:
+            return _icon_image(icon)
+        finally:
+            user32.DestroyIcon(icon)
+
+    def create_event_source(self) -> Optional[WindowEventSource]:
+        """Returns the SetWinEventHook event source."""
+        return WinEventHookSource()
@@ -1,34 +1,29 @@
 class Window:
-    """Represents a window with its handle, title, and process information."""
+    """Represents a window with its handle, title, process information and state.
 
-    def __init__(self, handle: int, title: str, process_id: int, process_name: str):
-        self._handle = handle
-        self._title = title
-        self._process_id = process_id
-        self._process_name = process_name
+    Windows compare and hash by handle, so the same top-level window keeps its
+    identity across refreshes even when its title or state changes.
+    """
 
-    @property
-    def handle(self) -> int:
-        """Returns the window handle."""
-        return self._handle
+    __slots__ = ("handle", "title", "process_id", "process_name", "minimized")
 
-    @property
-    def title(self) -> str:
-        """Returns the window title."""
-        return self._title
+    def __init__(self, handle: int, title: str, process_id: int, process_name: str, minimized: bool = False):
+        self.handle = handle
+        self.title = title
+        self.process_id = process_id
+        self.process_name = process_name
+        self.minimized = minimized
 
-    @property
-    def process_id(self) -> int:
-        """Returns the process ID that owns this window."""
-        return self._process_id
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Window):
+            return NotImplemented
+        return self.handle == other.handle
 
-    @property
-    def process_name(self) -> str:
-        """Returns the name of the process that owns this window."""
-        return self._process_name
+    def __hash__(self) -> int:
+        return hash(self.handle)
 
     def __repr__(self) -> str:
-        return f"Window({self._handle}, {self._title}, {self._process_id}, {self._process_name})"
-    
+        return f"Window({self.handle}, {self.title}, {self.process_id}, {self.process_name})"
+
     def __str__(self) -> str:
-        return f"{self._title} ({self._process_name})"
+        return f"{self.title} ({self.process_name})"
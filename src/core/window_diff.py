@@ -0,0 +1,58 @@
+from typing import List
+
+from .window import Window
+
+
+class WindowDiff:
+    """Changes between two published window lists, keyed by handle.
+
+    ``retitled`` holds the new Window for handles whose title, process or minimized
+    state changed.
+    ``refocused`` holds the window that moved to the top of the z-order, if any.
+    ``reordered`` is set whenever the relative order of surviving windows changed.
+    """
+
+    __slots__ = ("generation", "added", "removed", "retitled", "refocused", "reordered")
+
+    def __init__(self, generation: int, added: List[Window], removed: List[Window],
+                 retitled: List[Window], refocused: List[Window], reordered: bool):
+        self.generation = generation
+        self.added = added
+        self.removed = removed
+        self.retitled = retitled
+        self.refocused = refocused
+        self.reordered = reordered
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.retitled or self.refocused or self.reordered)
+
+    def __repr__(self) -> str:
+        return (f"WindowDiff(generation={self.generation}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, retitled={len(self.retitled)}, "
+                f"refocused={len(self.refocused)}, reordered={self.reordered})")
+
+
+def diff_windows(old: List[Window], new: List[Window], generation: int) -> WindowDiff:
+    """Computes the diff from old to new; an empty diff is falsy."""
+    old_by_handle = {window.handle: window for window in old}
+    new_by_handle = {window.handle: window for window in new}
+
+    added = [window for window in new if window.handle not in old_by_handle]
+    removed = [window for window in old if window.handle not in new_by_handle]
+    retitled = []
+    for window in new:
+        previous = old_by_handle.get(window.handle)
+        if previous is not None and (previous.title, previous.process_id, previous.process_name,
+                                     previous.minimized) != (window.title, window.process_id,
+                                                             window.process_name, window.minimized):
+            retitled.append(window)
+
+    refocused = []
+    if new and new[0].handle in old_by_handle and (not old or old[0].handle != new[0].handle):
+        refocused.append(new[0])
+
+    surviving_old = [window.handle for window in old if window.handle in new_by_handle]
+    surviving_new = [window.handle for window in new if window.handle in old_by_handle]
+    reordered = surviving_old != surviving_new
+
+    return WindowDiff(generation, added, removed, retitled, refocused, reordered)
@@ -0,0 +1,294 @@
+import sys
+import threading
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .window import Window
+from ..utils.logger import get_logger, log_exception, WindowManagerError
+
+
+class WindowEventType(Enum):
+    """Kinds of top-level window changes reported by an event source."""
+    CREATED = "created"
+    DESTROYED = "destroyed"
+    SHOWN = "shown"
+    HIDDEN = "hidden"
+    NAME_CHANGED = "name_changed"
+    STATE_CHANGED = "state_changed"
+    FOREGROUND = "foreground"
+
+
+class WindowEvent:
+    """A single change notification for one window handle."""
+
+    __slots__ = ("type", "handle")
+
+    def __init__(self, event_type: WindowEventType, handle: int):
+        self.type = event_type
+        self.handle = handle
+
+    def __repr__(self) -> str:
+        return f"WindowEvent({self.type.value}, {self.handle})"
+
+
+EventCallback = Callable[[WindowEvent], None]
+WindowInspector = Callable[[int], Optional[Window]]
+ZOrderRanks = Callable[[], Dict[int, int]]
+
+_REMOVING_EVENTS = {WindowEventType.DESTROYED, WindowEventType.HIDDEN}
+
+
+def _insert_by_rank(windows: List[Window], window: Window, z_order: Optional[ZOrderRanks]) -> List[Window]:
+    """Inserts a window at its z-order position, or at the top when the order is unknown."""
+    ranks = z_order() if z_order is not None else {}
+    rank = ranks.get(window.handle)
+    if rank is None:
+        return [window] + windows
+
+    for i, existing in enumerate(windows):
+        if ranks.get(existing.handle, -1) > rank:
+            return windows[:i] + [window] + windows[i:]
+    return windows + [window]
+
+
+def apply_window_event(windows: List[Window], event: WindowEvent, inspect: WindowInspector,
+                       z_order: Optional[ZOrderRanks] = None) -> Optional[List[Window]]:
+    """Applies one event to a window list in z-order, returning None if nothing changed.
+
+    ``inspect`` re-reads a single handle and returns its Window, or None when the
+    handle should not be listed. ``z_order`` returns handle ranks from a handle-only
+    enumeration and is consulted only when a window has to be placed. Destroyed and
+    hidden handles are removed without inspection since they can no longer be queried.
+    """
+    position = next((i for i, window in enumerate(windows) if window.handle == event.handle), -1)
+
+    if event.type in _REMOVING_EVENTS:
+        if position < 0:
+            return None
+        return windows[:position] + windows[position + 1:]
+
+    window = inspect(event.handle)
+    if window is None:
+        if position < 0:
+            return None
+        return windows[:position] + windows[position + 1:]
+
+    if event.type == WindowEventType.FOREGROUND:
+        if position > 0:
+            return [window] + windows[:position] + windows[position + 1:]
+        if position < 0:
+            return [window] + windows
+
+    if position < 0:
+        return _insert_by_rank(windows, window, z_order)
+
+    if event.type == WindowEventType.STATE_CHANGED:
+        # Minimizing moves a window in the z-order, so place it again.
+        remaining = windows[:position] + windows[position + 1:]
+        updated = _insert_by_rank(remaining, window, z_order)
+        return None if updated == windows and _same_fields(windows[position], window) else updated
+
+    if _same_fields(windows[position], window):
+        return None
+
+    updated = list(windows)
+    updated[position] = window
+    return updated
+
+
+def _same_fields(current: Window, window: Window) -> bool:
+    """Returns whether two snapshots of the same handle are indistinguishable."""
+    return (current.title, current.process_id, current.process_name, current.minimized) == (
+        window.title, window.process_id, window.process_name, window.minimized)
+
+
+class WindowEventSource:
+    """Base class for backends that push window change events to the window manager."""
+
+    def start(self, callback: EventCallback) -> None:
+        """Begins delivering events to the callback, from any thread."""
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        """Stops delivering events and releases backend resources."""
+        raise NotImplementedError
+
+
+class ScriptedEventSource(WindowEventSource):
+    """In-memory event source that replays events pushed by the caller."""
+
+    def __init__(self):
+        self._callback: Optional[EventCallback] = None
+
+    @property
+    def running(self) -> bool:
+        """Returns whether the source currently has a subscriber."""
+        return self._callback is not None
+
+    def start(self, callback: EventCallback) -> None:
+        """Registers the callback that receives emitted events."""
+        self._callback = callback
+
+    def stop(self) -> None:
+        """Detaches the callback; later emits are dropped."""
+        self._callback = None
+
+    def emit(self, event_type: WindowEventType, handle: int) -> None:
+        """Delivers a single event synchronously on the calling thread."""
+        if self._callback is not None:
+            self._callback(WindowEvent(event_type, handle))
+
+    def play(self, events: Iterable[Tuple[WindowEventType, int]]) -> None:
+        """Delivers a scripted sequence of (event type, handle) pairs in order."""
+        for event_type, handle in events:
+            self.emit(event_type, handle)
+
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZESTART = 0x0016
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+GA_ROOT = 2
+WM_QUIT = 0x0012
+
+_WINEVENT_TYPES = {
+    EVENT_SYSTEM_FOREGROUND: WindowEventType.FOREGROUND,
+    EVENT_SYSTEM_MINIMIZESTART: WindowEventType.STATE_CHANGED,
+    EVENT_SYSTEM_MINIMIZEEND: WindowEventType.STATE_CHANGED,
+    EVENT_OBJECT_CREATE: WindowEventType.CREATED,
+    EVENT_OBJECT_DESTROY: WindowEventType.DESTROYED,
+    EVENT_OBJECT_SHOW: WindowEventType.SHOWN,
+    EVENT_OBJECT_HIDE: WindowEventType.HIDDEN,
+    EVENT_OBJECT_NAMECHANGE: WindowEventType.NAME_CHANGED,
+}
+
+_WINEVENT_RANGES = [
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+    (EVENT_SYSTEM_MINIMIZESTART, EVENT_SYSTEM_MINIMIZEEND),
+    (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE),
+    (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE),
+]
+
+
+def _load_user32():
+    """Returns a private user32 with typed hook signatures, and the WinEventProc type."""
+    import ctypes
+    from ctypes import wintypes
+
+    # Untyped calls pass and return C ints, which would truncate 64-bit hook handles.
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    win_event_proc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+    user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, win_event_proc,
+                                       wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+    user32.UnhookWinEvent.restype = wintypes.BOOL
+    user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    user32.GetAncestor.restype = wintypes.HWND
+    user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+    user32.PostThreadMessageW.restype = wintypes.BOOL
+    user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    return user32, win_event_proc
+
+
+class WinEventHookSource(WindowEventSource):
+    """Out-of-context SetWinEventHook backend running its own message loop thread."""
+
+    def __init__(self):
+        self.logger = get_logger("window_events")
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._started = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def start(self, callback: EventCallback) -> None:
+        """Installs the hooks on a dedicated thread and waits until they are active."""
+        if sys.platform != "win32":
+            raise WindowManagerError("WinEvent hooks are only available on Windows")
+
+        if self._thread is not None:
+            return
+
+        self._started.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(callback,), daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=2)
+
+        if self._error is not None or not self._started.is_set():
+            self._thread = None
+            raise WindowManagerError("Failed to install WinEvent hooks") from self._error
+
+    def _run(self, callback: EventCallback) -> None:
+        """Owns the hooks and pumps messages until WM_QUIT is posted."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32, WinEventProc = _load_user32()
+        kernel32 = ctypes.windll.kernel32
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, timestamp) -> None:
+            """Translates a raw WinEvent into a WindowEvent for top-level windows."""
+            try:
+                if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+                    return
+                event_type = _WINEVENT_TYPES.get(event)
+                if event_type is None:
+                    return
+                if event_type != WindowEventType.DESTROYED and user32.GetAncestor(hwnd, GA_ROOT) != hwnd:
+                    return
+                callback(WindowEvent(event_type, int(hwnd)))
+            except Exception as e:
+                self.logger.error("WinEvent callback failed for %s: %s", hwnd, e)
+
+        proc = WinEventProc(on_event)
+        hooks = []
+        try:
+            self._thread_id = kernel32.GetCurrentThreadId()
+            for event_min, event_max in _WINEVENT_RANGES:
+                hook = user32.SetWinEventHook(event_min, event_max, 0, proc, 0, 0,
+                                              WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+                if not hook:
+                    raise ctypes.WinError(ctypes.get_last_error())
+                hooks.append(hook)
+
+            self._started.set()
+            self.logger.debug("WinEvent hooks installed")
+
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        except Exception as e:
+            self._error = e
+            log_exception(self.logger, e, "WinEvent hook thread")
+        finally:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+            self.logger.debug("WinEvent hooks removed")
+
+    def stop(self) -> None:
+        """Posts WM_QUIT to the hook thread and waits for it to unhook."""
+        if self._thread is None:
+            return
+
+        try:
+            user32, _ = _load_user32()
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=1)
+            if self._thread.is_alive():
+                self.logger.error("WinEvent hook thread did not stop gracefully")
+        except Exception as e:
+            log_exception(self.logger, e, "stopping WinEvent hooks")
+        finally:
+            self._thread = None
@@ -1,51 +1,126 @@
-import psutil
-import win32gui
-import win32process
-import win32con
+import queue
 import threading
 import time
-from typing import Callable, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from .frecency import FrecencyStore, default_frecency_path
+from .process_cache import ProcessCache
+from .search_index import SearchIndex
+from .warm_start import default_warm_start_path, load_warm_start, save_warm_start
 from .window import Window
-from ..utils.logger import get_logger, log_exception, WindowManagerError
+from .window_diff import WindowDiff, diff_windows
+from .window_events import WindowEvent, WindowEventSource, WindowEventType, apply_window_event
+from .window_rules import WindowFacts, WindowFilter, default_rules_path
+from .window_snapshot import WindowSnapshot
+from .window_source import IconImage, ProcessInfo, WindowSource, default_window_source
+from ..utils.logger import get_logger, log_exception, SampledLogger, WindowManagerError
+from ..utils.metrics import metrics
+from ..utils.startup_timer import StartupTimer
 
-SYSTEM_PROCESSES = {
-    'dwm.exe',
-    'winlogon.exe',
-    'csrss.exe',
-    'TextInputHost.exe',
-}
+EVENT_COALESCE_DELAY = 0.05
+EVENT_RESYNC_INTERVAL = 60.0
 
-EXCLUDED_CLASSES = {
-    'Shell_TrayWnd',
-    'Progman',
-    'WorkerW',
-    'Button',
-    'DV2ControlHost',
-    'Windows.UI.Core.CoreWindow',
-    'ApplicationFrameWindow',
-}
+FRECENCY_SAVE_DELAY = 2.0
 
-MIN_WINDOW_WIDTH = 100
-MIN_WINDOW_HEIGHT = 50
+INSPECTION_WORKERS = 4
+PARALLEL_LOOKUP_THRESHOLD = 8
 
 
 class WindowManager:
-    """Manages window enumeration, filtering, and interaction on Windows."""
+    """Manages window enumeration, filtering, and interaction through a WindowSource."""
 
-    def __init__(self, auto_start_monitoring: bool = True):
+    def __init__(self, auto_start_monitoring: bool = True, source: Optional[WindowSource] = None,
+                 event_source: Optional[WindowEventSource] = None, use_events: bool = True,
+                 frecency: Optional[FrecencyStore] = None, warm_start_path: Optional[Path] = None,
+                 use_warm_start: bool = True, startup_timer: Optional[StartupTimer] = None,
+                 inspection_workers: int = INSPECTION_WORKERS, window_filter: Optional[WindowFilter] = None):
         self.logger = get_logger("window_manager")
-        self._cached_windows = []
+        self._hot_log = SampledLogger(self.logger)
+        self._source = source if source is not None else default_window_source()
+        self.process_cache = ProcessCache(self._source)
+        self._inspection_workers = inspection_workers
+        self._inspection_pool: Optional[ThreadPoolExecutor] = None
+        self.window_filter = window_filter if window_filter is not None else WindowFilter.from_file(default_rules_path())
+        self.frecency = frecency if frecency is not None else FrecencyStore(default_frecency_path())
+        self._snapshot = WindowSnapshot((), 0)
         self._last_refresh = 0
         self._refresh_interval = 2.0
         self._change_callbacks = []
+        self._pending_diffs: List[WindowDiff] = []
         self._lock = threading.Lock()
+        self._notify_lock = threading.Lock()
         self._monitoring_thread = None
         self._stop_monitoring = False
+        self._event_queue: "queue.Queue[Optional[WindowEvent]]" = queue.Queue()
+        self._switch_queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._switch_thread: Optional[threading.Thread] = None
+        self._switch_thread_lock = threading.Lock()
+        self._event_source = event_source
+        if self._event_source is None and use_events:
+            self._event_source = self._source.create_event_source()
+        self._event_driven = False
+        self._warm_start_path = None
+        if use_warm_start:
+            self._warm_start_path = warm_start_path if warm_start_path is not None else default_warm_start_path()
+        self._startup_timer = startup_timer
+        self.reconciled = threading.Event()
         
         if auto_start_monitoring:
+            restored = self._restore_warm_start()
             self._start_monitoring()
-            self._initial_load()
+            if restored:
+                self._start_reconcile()
+            else:
+                self._initial_load()
+                self._mark_startup("live_windows_loaded")
+                self.reconciled.set()
+
+    def _mark_startup(self, phase: str) -> None:
+        """Records a startup phase if a startup timer was supplied."""
+        if self._startup_timer is not None:
+            self._startup_timer.mark(phase)
+
+    def _restore_warm_start(self) -> bool:
+        """Publishes the window list saved by the previous run, if there is one.
+
+        Restored windows may be stale; they only serve searches until the background
+        reconciliation publishes the live list, normally a fraction of a second later.
+        """
+        if self._warm_start_path is None:
+            return False
+
+        restored = load_warm_start(self._warm_start_path)
+        if not restored or not restored[0]:
+            return False
+
+        windows, processes = restored
+        self.process_cache.seed(processes)
+        with self._lock:
+            self._publish(windows)
+        self.logger.debug("Restored %s windows from warm start", len(windows))
+        self._mark_startup("warm_start_restored")
+        return True
+
+    def _start_reconcile(self) -> None:
+        """Replaces the restored window list with a live enumeration on a background thread."""
+        def reconcile_thread():
+            try:
+                self._refresh()
+                self._mark_startup("live_windows_reconciled")
+            except Exception as e:
+                log_exception(self.logger, e, "warm start reconciliation")
+            finally:
+                self.reconciled.set()
+
+        threading.Thread(target=reconcile_thread, name="reconcile", daemon=True).start()
+
+    def save_warm_start(self) -> None:
+        """Writes the current window list and process metadata for the next launch."""
+        if self._warm_start_path is None or not self._last_refresh:
+            return
+        save_warm_start(self._warm_start_path, list(self._snapshot.windows), self.process_cache.known_processes())
         
     def _initial_load(self):
         """Performs initial loading of windows during startup."""
@@ -56,63 +131,121 @@ class WindowManager:
             log_exception(self.logger, e, "initial window load")
             raise WindowManagerError("Failed to load initial windows") from e
 
-    def _should_include_window(self, handle: int, process_name: str) -> bool:
-        """Determines if a window should be included in the window list."""
-        try:
-            ex_style = win32gui.GetWindowLong(handle, win32con.GWL_EXSTYLE)
-            if ex_style & (win32con.WS_EX_TOOLWINDOW | win32con.WS_EX_NOACTIVATE):
-                return False
-
-            if win32gui.GetWindow(handle, win32con.GW_OWNER) != 0:
-                return False
-
-            style = win32gui.GetWindowLong(handle, win32con.GWL_STYLE)
-            if not (style & win32con.WS_VISIBLE) or not (style & win32con.WS_CAPTION):
-                return False
-
-            class_name = win32gui.GetClassName(handle)
-            if class_name in EXCLUDED_CLASSES or process_name in SYSTEM_PROCESSES:
-                return False
-
-            title = win32gui.GetWindowText(handle)
-            if not title or not title.strip():
-                return False
+    def add_change_callback(self, callback: Callable[[WindowDiff], None]) -> None:
+        """Adds a callback that receives a WindowDiff for every published generation."""
+        self._change_callbacks.append(callback)
+        
+    def remove_change_callback(self, callback: Callable[[WindowDiff], None]) -> None:
+        """Removes a previously added window change callback."""
+        if callback in self._change_callbacks:
+            self._change_callbacks.remove(callback)
+            
+    def _notify_change_callbacks(self) -> None:
+        """Delivers pending diffs to all registered callbacks in generation order."""
+        with self._notify_lock:
+            with self._lock:
+                diffs, self._pending_diffs = self._pending_diffs, []
 
-            if not win32gui.IsIconic(handle):
+            for diff in diffs:
+                self.logger.debug("Window list changed: %s", diff)
+                for callback in list(self._change_callbacks):
                     try:
-                        rect = win32gui.GetWindowRect(handle)
-                        width, height = rect[2] - rect[0], rect[3] - rect[1]
-                        if width < MIN_WINDOW_WIDTH or height < MIN_WINDOW_HEIGHT:
-                            return False
+                        callback(diff)
                     except Exception as e:
-                        self.logger.error(f"Failed to get window rect for {handle}: {e}")
-                        return False
+                        log_exception(self.logger, e, "window change callback")
+                
+    def _start_event_source(self) -> bool:
+        """Subscribes to the event source, returning False to fall back to polling."""
+        if self._event_source is None:
+            return False
 
+        try:
+            self._event_source.start(self._event_queue.put)
+            self.logger.debug("Window events enabled via %s", type(self._event_source).__name__)
             return True
-            
         except Exception as e:
-            self.logger.error(f"Failed to check window properties for {handle}: {e}")
+            self.logger.error("Window event source unavailable, falling back to polling: %s", e)
             return False
 
-    def add_change_callback(self, callback: Callable[[], None]) -> None:
-        """Adds a callback function to be called when window list changes."""
-        self._change_callbacks.append(callback)
-        
-    def remove_change_callback(self, callback: Callable[[], None]) -> None:
-        """Removes a previously added window change callback."""
-        if callback in self._change_callbacks:
-            self._change_callbacks.remove(callback)
-            
-    def _notify_change_callbacks(self) -> None:
-        """Notifies all registered callbacks about window list changes."""
-        for callback in self._change_callbacks:
+    def _drain_events(self, first: WindowEvent) -> List[WindowEvent]:
+        """Collects events arriving shortly after the first so bursts publish once."""
+        events = [first]
+        deadline = time.monotonic() + EVENT_COALESCE_DELAY
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                callback()
-            except Exception as e:
-                log_exception(self.logger, e, "window change callback")
-                
+                event = self._event_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if event is None:
+                self._event_queue.put(None)
+                break
+            events.append(event)
+        return events
+
+    def _apply_events(self, events: List[WindowEvent]) -> bool:
+        """Applies a batch of events to the cached list and publishes the result."""
+        ranks = {}
+
+        def z_order():
+            """Enumerates handles at most once per batch, only if a window must be placed."""
+            if not ranks:
+                ranks.update((handle, i) for i, handle in enumerate(self._source.enumerate_handles()))
+            return ranks
+
+        with self._lock:
+            windows = list(self._snapshot.windows)
+            changed = False
+            for event in events:
+                if event.type == WindowEventType.DESTROYED:
+                    self._forget_process_of(windows, event.handle)
+                updated = apply_window_event(windows, event, self._inspect_window, z_order)
+                if updated is not None:
+                    windows = updated
+                    changed = True
+            if not changed:
+                return False
+            return self._publish(windows) is not None
+
+    def _forget_process_of(self, windows: List[Window], handle: int) -> None:
+        """Drops the cached process of a destroyed window, which may have exited with it.
+
+        Exited processes are otherwise only evicted by a full enumeration, and a pid
+        reused before then would be listed under the old process's name.
+        """
+        window = next((window for window in windows if window.handle == handle), None)
+        if window is not None:
+            self.process_cache.invalidate(window.process_id)
+
     def _start_monitoring(self) -> None:
         """Starts a background thread to monitor window changes."""
+        self._event_driven = self._start_event_source()
+
+        def event_thread():
+            self.logger.debug("Window event thread started")
+            while not self._stop_monitoring:
+                try:
+                    try:
+                        first = self._event_queue.get(timeout=EVENT_RESYNC_INTERVAL)
+                    except queue.Empty:
+                        self.get_all_windows(force_refresh=True)
+                        continue
+
+                    if self._stop_monitoring or first is None:
+                        break
+
+                    events = self._drain_events(first)
+                    if self._apply_events(events):
+                        self._hot_log.debug("Applied %d window events", len(events))
+                        self._notify_change_callbacks()
+
+                except Exception as e:
+                    log_exception(self.logger, e, "window event thread")
+                    if not self._stop_monitoring:
+                        time.sleep(1)
+
         def monitor_thread():
             self.logger.debug("Window monitoring thread started")
             while not self._stop_monitoring:
@@ -123,109 +256,333 @@ class WindowManager:
                         break
                         
                     if self._change_callbacks:
-                        old_count = len(self._cached_windows)
                         self.get_all_windows(force_refresh=True)
-                        new_count = len(self._cached_windows)
-                        
-                        if old_count != new_count:
-                            self.logger.debug(f"Window count changed: {old_count} -> {new_count}")
-                            self._notify_change_callbacks()
                             
                 except Exception as e:
                     log_exception(self.logger, e, "window monitoring thread")
                     if not self._stop_monitoring:
                         time.sleep(3)
                     
-        self._monitoring_thread = threading.Thread(target=monitor_thread, daemon=True)
+        target = event_thread if self._event_driven else monitor_thread
+        self._monitoring_thread = threading.Thread(target=target, daemon=True)
         self._monitoring_thread.start()
         
     def stop_monitoring(self):
-        """Stops the window monitoring thread."""
+        """Stops the window monitoring thread and saves the warm-start file."""
         self.logger.debug("Window monitoring stopping")
         self._stop_monitoring = True
+        if self._event_source is not None and self._event_driven:
+            self._event_source.stop()
+            self._event_driven = False
+            self._event_queue.put(None)
         if self._monitoring_thread:
             self._monitoring_thread.join(timeout=1)
             if self._monitoring_thread.is_alive():
                 self.logger.error("Monitor thread did not stop gracefully")
+        if self._inspection_pool is not None:
+            self._inspection_pool.shutdown(wait=False)
+            self._inspection_pool = None
+        self._stop_switch_recorder()
+        self.save_warm_start()
         
-    def _get_windows_now(self) -> List[Window]:
-        """Enumerates all current windows and returns filtered list."""
+    def _window_candidate(self, handle: int) -> Optional[Tuple[str, int, bool, Optional[WindowFacts]]]:
+        """Applies the window-level checks and filter rules and returns (title, pid, minimized, facts) on a pass.
+
+        Visibility and ownership are checked before anything else is read. Style,
+        class and size reads are plain window-structure lookups; the process checks
+        need a process lookup, the most expensive step by far, so they run afterwards
+        and only for windows the rules could not decide here. The returned facts are
+        None when the rules already included the window.
+        """
+        source = self._source
+        window_filter = self.window_filter
+        try:
+            if not source.is_visible(handle) or source.get_owner(handle) != 0:
+                return None
+
+            minimized = source.is_minimized(handle)
+            size = (0, 0)
+            if window_filter.needs_size and not minimized:
+                rect = source.get_rect(handle)
+                size = (rect[2] - rect[0], rect[3] - rect[1])
+            class_name = source.get_class_name(handle) if window_filter.needs_class_name else ""
+            title = source.get_title(handle)
+            if not title or not title.strip():
+                return None
+
+            facts = WindowFacts(source.get_style(handle), source.get_ex_style(handle), class_name,
+                                minimized, size, title)
+            verdict = window_filter.check_window(handle, facts)
+            if verdict is False:
+                return None
+            return title, source.get_process_id(handle), minimized, facts if verdict is None else None
+
+        except Exception as e:
+            self.logger.error("Failed to check window properties for %s: %s", handle, e)
+            return None
+
+    def _include_process(self, handle: int, process: Optional[ProcessInfo],
+                         facts: Optional[WindowFacts]) -> bool:
+        """Finishes filtering a window that passed the window-level checks."""
+        if process is None:
+            self._hot_log.debug("Process access denied for window %s", handle)
+            return False
+        return facts is None or self.window_filter.check_process(handle, facts, process.name)
+
+    def _inspect_window(self, handle: int) -> Optional[Window]:
+        """Reads a single window and returns it if it belongs in the window list."""
+        candidate = self._window_candidate(handle)
+        if candidate is None:
+            return None
+
+        title, pid, minimized, facts = candidate
+        try:
+            process = self.process_cache.get(pid)
+        except Exception as e:
+            self.logger.error("Failed to get process info for window %s: %s", handle, e)
+            return None
+
+        if not self._include_process(handle, process, facts):
+            return None
+        return Window(handle, title, pid, process.name, minimized)
+
+    def _lookup_process(self, pid: int) -> Tuple[bool, Optional[ProcessInfo]]:
+        """Resolves one process, returning (False, None) if the lookup itself failed."""
+        try:
+            return True, self.process_cache.get(pid)
+        except Exception as e:
+            self.logger.error("Failed to get process info for pid %s: %s", pid, e)
+            return False, None
+
+    def _resolve_processes(self, pids: Iterable[int]) -> Dict[int, Tuple[bool, Optional[ProcessInfo]]]:
+        """Resolves each distinct pid once, fanning uncached lookups out to the worker pool."""
+        pids = list(dict.fromkeys(pids))
+        uncached = [pid for pid in pids if self.process_cache.needs_lookup(pid)]
+        resolved: Dict[int, Tuple[bool, Optional[ProcessInfo]]] = {}
+
+        if self._inspection_workers > 1 and len(uncached) >= PARALLEL_LOOKUP_THRESHOLD:
+            if self._inspection_pool is None:
+                self._inspection_pool = ThreadPoolExecutor(max_workers=self._inspection_workers,
+                                                           thread_name_prefix="inspect")
+            resolved.update(zip(uncached, self._inspection_pool.map(self._lookup_process, uncached)))
+
+        for pid in pids:
+            if pid not in resolved:
+                resolved[pid] = self._lookup_process(pid)
+        return resolved
+
+    def _inspect_batch(self, handles: List[int]) -> List[Window]:
+        """Inspects every handle in two stages: window filters, then grouped process lookups."""
+        candidates = []
+        for handle in handles:
+            candidate = self._window_candidate(handle)
+            if candidate is not None:
+                candidates.append((handle,) + candidate)
+
+        processes = self._resolve_processes(candidate[2] for candidate in candidates)
         windows = []
+        for handle, title, pid, minimized, facts in candidates:
+            ok, process = processes[pid]
+            if ok and self._include_process(handle, process, facts):
+                windows.append(Window(handle, title, pid, process.name, minimized))
+        return windows
 
-        def callback(handle: int, extra) -> bool:
-            """Callback function for enumerating windows."""
-            if win32gui.IsWindowVisible(handle):
-                title = win32gui.GetWindowText(handle)
-                if title:
-                    try:
-                        pid = win32process.GetWindowThreadProcessId(handle)[1]
-                        process = psutil.Process(pid)
-                        process_name = process.name()
-
-                        if self._should_include_window(handle, process_name):
-                            windows.append(Window(handle, title, pid, process_name))
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                        self.logger.debug(f"Process access denied for window {handle}")
-                    except Exception as e:
-                        self.logger.error(f"Failed to get process info for window {handle}: {e}")
-            return True
+    def _get_windows_now(self) -> List[Window]:
+        """Enumerates all current windows and returns filtered list.
 
+        With inspection workers, handles are collected first and inspected as a batch;
+        with none, each handle is inspected in turn. Both produce the same list.
+        """
         try:
-            win32gui.EnumWindows(callback, None)
+            handles = self._source.enumerate_handles()
         except Exception as e:
             log_exception(self.logger, e, "enumerating windows")
             raise WindowManagerError("Failed to enumerate windows") from e
-            
+
+        self.process_cache.begin_pass()
+        self.window_filter.retain(handles)
+        if self._inspection_workers > 0:
+            windows = self._inspect_batch(handles)
+        else:
+            windows = [window for window in map(self._inspect_window, handles) if window is not None]
+
+        metrics.increment("windows.enumerations")
+        metrics.record("windows.handles_enumerated", len(handles), "handles")
+        metrics.record("windows.windows_listed", len(windows), "windows")
         return windows
 
-    def get_all_windows(self, force_refresh: bool = False) -> List[Window]:
-        """Returns a list of all windows, using cache when possible."""
+    def _publish(self, windows: List[Window]) -> Optional[WindowDiff]:
+        """Builds the next snapshot off to the side and swaps it in if anything changed.
+
+        Must be called with the writer lock held; readers never take it.
+        """
+        current = self._snapshot
+        diff = diff_windows(list(current.windows), windows, current.generation + 1)
+        if not diff:
+            return None
+
+        index = SearchIndex(windows, diff.generation, previous=current.index,
+                            prior=self.frecency.prior(windows))
+        self._snapshot = WindowSnapshot(tuple(windows), diff.generation, index)
+        self._pending_diffs.append(diff)
+        return diff
+
+    def _reprioritize(self) -> None:
+        """Republishes the current windows with a fresh frecency prior.
+
+        The window list and generation are unchanged, but the index is new, so
+        search caches keyed on it drop results ranked with the old prior.
+        """
+        with self._lock:
+            current = self._snapshot
+            windows = list(current.windows)
+            index = SearchIndex(windows, current.generation, previous=current.index,
+                                prior=self.frecency.prior(windows))
+            self._snapshot = WindowSnapshot(current.windows, current.generation, index)
+
+    @property
+    def generation(self) -> int:
+        """Returns a counter that increases whenever a different window list is published."""
+        return self._snapshot.generation
+
+    def get_snapshot(self) -> WindowSnapshot:
+        """Returns the current published snapshot without locking or copying."""
+        return self._snapshot
+
+    def _refresh(self) -> WindowSnapshot:
+        """Re-enumerates windows, publishes the result and notifies subscribers."""
         try:
             with self._lock:
-                current_time = time.time()
-                
-                if (force_refresh or not self._cached_windows or 
-                    current_time - self._last_refresh > self._refresh_interval):
-                    self._cached_windows = self._get_windows_now()
-                    self._last_refresh = current_time
-                    
-                return self._cached_windows.copy()
+                self._publish(self._get_windows_now())
+                self._last_refresh = time.time()
+                snapshot = self._snapshot
         except Exception as e:
             log_exception(self.logger, e, "getting all windows")
             raise WindowManagerError("Failed to get window list") from e
 
+        if self._pending_diffs:
+            self._notify_change_callbacks()
+        return snapshot
+
+    @metrics.timed("windows.get_all_windows")
+    def get_all_windows(self, force_refresh: bool = False) -> List[Window]:
+        """Returns a list of all windows, refreshing first if forced or stale.
+
+        Hot paths should prefer get_snapshot, which never blocks on a refresh.
+        """
+        snapshot = self._snapshot
+        stale = not self._event_driven and time.time() - self._last_refresh > self._refresh_interval
+        if force_refresh or not snapshot.windows or stale:
+            snapshot = self._refresh()
+        return list(snapshot.windows)
+
+    def get_search_index(self, force_refresh: bool = False) -> SearchIndex:
+        """Returns the search index of the current snapshot without blocking on writers.
+
+        Only the very first call blocks, and only if no warm start was restored.
+        """
+        if force_refresh or (not self._last_refresh and not self._snapshot.generation):
+            return self._refresh().index
+        return self._snapshot.index
+
+    def process_exe(self, process_id: int) -> str:
+        """Returns the executable path of a listed window's process from the cache, or ""."""
+        info = self.process_cache.peek(process_id)
+        return info.exe if info is not None else ""
+
+    def load_icon(self, exe: str, size: int) -> Optional[IconImage]:
+        """Reads an executable's icon through the window source; may block, so call it off the GUI thread."""
+        try:
+            return self._source.get_icon(exe, size)
+        except Exception as e:
+            log_exception(self.logger, e, f"loading icon of {exe}")
+            return None
+
+    @metrics.timed("windows.switch_to_window")
     def switch_to_window(self, handle: int) -> bool:
         """Switches to the specified window by handle."""
         try:
-            if not win32gui.IsWindow(handle) or not win32gui.IsWindowVisible(handle):
-                self.logger.error(f"Cannot switch to invalid or invisible window {handle}")
+            if not self._source.is_window(handle) or not self._source.is_visible(handle):
+                self.logger.error("Cannot switch to invalid or invisible window %s", handle)
                 return False
 
-            self.logger.debug(f"Switching to window {handle}")
-
-            if win32gui.IsIconic(handle):
-                win32gui.ShowWindow(handle, win32con.SW_RESTORE)
-            else:
-                win32gui.ShowWindow(handle, win32con.SW_SHOW)
-
-            win32gui.BringWindowToTop(handle)
+            self.logger.debug("Switching to window %s", handle)
 
-            if not win32gui.SetForegroundWindow(handle):
-                try:
-                    win32gui.SetWindowPos(handle, win32con.HWND_TOP, 0, 0, 0, 0,
-                                        win32con.SWP_NOMOVE | win32con.SWP_NOSIZE |
-                                        win32con.SWP_SHOWWINDOW)
-                except Exception as pos_error:
-                    self.logger.error(f"SetWindowPos failed {handle}: {pos_error}")
-                    try:
-                        win32gui.ShowWindow(handle, win32con.SW_SHOW)
-                    except Exception as show_error:
-                        self.logger.error(f"ShowWindow failed {handle}: {show_error}")
-                        return False
+            if not self._source.activate(handle):
+                return False
 
-            self.logger.info(f"Switched to window {handle}")
+            self.logger.info("Switched to window %s", handle)
+            self._record_switch(handle)
             return True
 
         except Exception as e:
             log_exception(self.logger, e, f"switching to window {handle}")
             return False
+
+    def _record_switch(self, handle: int) -> None:
+        """Queues a completed switch for the recorder thread, starting it on first use."""
+        with self._switch_thread_lock:
+            if self._switch_thread is None:
+                self._switch_thread = threading.Thread(target=self._run_switch_recorder,
+                                                       name="switch-recorder", daemon=True)
+                self._switch_thread.start()
+        self._switch_queue.put(handle)
+
+    def _run_switch_recorder(self) -> None:
+        """Feeds switches into the frecency store and the ranking prior, off the GUI thread.
+
+        Republishing the prior waits for the writer lock, which a refresh holds for a
+        whole enumeration, and saving writes to disk, so neither runs on the switch
+        path. Queued switches share one republish, and the store is saved once no
+        switch has arrived for FRECENCY_SAVE_DELAY, and again when stopping.
+        """
+        unsaved = False
+        running = True
+        while running:
+            try:
+                handles = [self._switch_queue.get(timeout=FRECENCY_SAVE_DELAY if unsaved else None)]
+            except queue.Empty:
+                self.frecency.save()
+                unsaved = False
+                continue
+
+            while True:
+                try:
+                    handles.append(self._switch_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in handles:
+                running = False
+                handles = handles[:handles.index(None)]
+
+            recorded = False
+            for handle in handles:
+                try:
+                    window = next((window for window in self._snapshot.windows if window.handle == handle), None)
+                    if window is None:
+                        window = self._inspect_window(handle)
+                    if window is not None:
+                        self.frecency.record(window)
+                        recorded = True
+                except Exception as e:
+                    log_exception(self.logger, e, f"recording switch to window {handle}")
+            if recorded:
+                try:
+                    self._reprioritize()
+                except Exception as e:
+                    log_exception(self.logger, e, "republishing the frecency prior")
+                unsaved = True
+
+        if unsaved:
+            self.frecency.save()
+
+    def _stop_switch_recorder(self) -> None:
+        """Records queued switches, saves the store and ends the recorder thread."""
+        with self._switch_thread_lock:
+            thread, self._switch_thread = self._switch_thread, None
+        if thread is None:
+            return
+        self._switch_queue.put(None)
+        thread.join(timeout=1)
+        if thread.is_alive():
+            self.logger.error("Switch recorder did not stop gracefully")
@@ -0,0 +1,403 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .window_source import WS_CAPTION, WS_EX_NOACTIVATE, WS_EX_TOOLWINDOW, WS_VISIBLE
+from ..utils.logger import get_logger, log_exception
+
+SYSTEM_PROCESSES = {
+    'dwm.exe',
+    'winlogon.exe',
+    'csrss.exe',
+    'TextInputHost.exe',
+}
+
+EXCLUDED_CLASSES = {
+    'Shell_TrayWnd',
+    'Progman',
+    'WorkerW',
+    'Button',
+    'DV2ControlHost',
+    'Windows.UI.Core.CoreWindow',
+    'ApplicationFrameWindow',
+}
+
+MIN_WINDOW_WIDTH = 100
+MIN_WINDOW_HEIGHT = 50
+
+RULE_ACTIONS = ("include", "exclude")
+
+_STYLE_COST = 0
+_CLASS_COST = 1
+_SIZE_COST = 2
+_TITLE_COST = 3
+_PROCESS_COST = 4
+
+_STYLE_ANY = "any"
+_STYLE_MISSING = "missing"
+_STYLE_NONE = "none"
+
+
+def default_rules_path() -> Path:
+    """Returns the default location of the user's filter rules, next to the frecency store."""
+    return Path(__file__).parent.parent / "data" / "filter_rules.json"
+
+
+class WindowFacts:
+    """The window properties filter rules can test, read once per inspection."""
+
+    __slots__ = ("style", "ex_style", "class_name", "minimized", "size", "title", "process_name")
+
+    def __init__(self, style: int, ex_style: int, class_name: str, minimized: bool,
+                 size: Tuple[int, int], title: str):
+        self.style = style
+        self.ex_style = ex_style
+        self.class_name = class_name
+        self.minimized = minimized
+        self.size = size
+        self.title = title
+        self.process_name: Optional[str] = None
+
+    def key(self) -> tuple:
+        """Returns the window-level properties as a tuple for cache validation."""
+        return (self.style, self.ex_style, self.class_name, self.minimized, self.size, self.title)
+
+
+class _StyleCondition:
+    """Matches when any bit of a mask is set, when any bit of it is missing, or when none is set."""
+
+    cost = _STYLE_COST
+
+    def __init__(self, extended: bool, mask: int, mode: str):
+        self.extended = extended
+        self.mask = mask
+        self.mode = mode
+
+    def merge_key(self) -> tuple:
+        # "None of A or none of B" is not "none of A | B", so those only merge with equal masks.
+        key = (type(self), self.extended, self.mode)
+        return key + (self.mask,) if self.mode == _STYLE_NONE else key
+
+    def merged(self, other: "_StyleCondition") -> "_StyleCondition":
+        return _StyleCondition(self.extended, self.mask | other.mask, self.mode)
+
+    def matches(self, facts: WindowFacts) -> bool:
+        bits = (facts.ex_style if self.extended else facts.style) & self.mask
+        if self.mode == _STYLE_MISSING:
+            return bits != self.mask
+        if self.mode == _STYLE_NONE:
+            return bits == 0
+        return bits != 0
+
+
+class _ClassCondition:
+    """Matches windows whose class name is in a set, optionally ignoring case."""
+
+    cost = _CLASS_COST
+
+    def __init__(self, names: Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.names = frozenset(name.lower() if ignore_case else name for name in names)
+
+    def merge_key(self) -> tuple:
+        return (type(self), self.ignore_case)
+
+    def merged(self, other: "_ClassCondition") -> "_ClassCondition":
+        return _ClassCondition(self.names | other.names, self.ignore_case)
+
+    def matches(self, facts: WindowFacts) -> bool:
+        name = facts.class_name
+        return (name.lower() if self.ignore_case else name) in self.names
+
+
+class _SizeCondition:
+    """Matches restored windows narrower or shorter than a minimum size."""
+
+    cost = _SIZE_COST
+
+    def __init__(self, min_width: int, min_height: int):
+        self.min_width = min_width
+        self.min_height = min_height
+
+    def merge_key(self) -> tuple:
+        return (type(self),)
+
+    def merged(self, other: "_SizeCondition") -> "_SizeCondition":
+        return _SizeCondition(max(self.min_width, other.min_width), max(self.min_height, other.min_height))
+
+    def matches(self, facts: WindowFacts) -> bool:
+        if facts.minimized:
+            return False
+        width, height = facts.size
+        return width < self.min_width or height < self.min_height
+
+
+def _compile_titles(patterns: Sequence[str]) -> "re.Pattern":
+    """Compiles title patterns as one case-insensitive alternation."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+class _TitleCondition:
+    """Matches titles containing a case-insensitive regular expression."""
+
+    cost = _TITLE_COST
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        self.regex = _compile_titles(self.patterns)
+
+    def merge_key(self) -> tuple:
+        # Joined patterns share group numbers and names, so patterns with groups stay separate.
+        return (type(self),) if not self.regex.groups else (type(self), id(self))
+
+    def merged(self, other: "_TitleCondition") -> "_TitleCondition":
+        return _TitleCondition(self.patterns + other.patterns)
+
+    def matches(self, facts: WindowFacts) -> bool:
+        return self.regex.search(facts.title) is not None
+
+
+class _ProcessCondition:
+    """Matches windows whose process name is in a set, optionally ignoring case."""
+
+    cost = _PROCESS_COST
+
+    def __init__(self, names: Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.names = frozenset(name.lower() if ignore_case else name for name in names)
+
+    def merge_key(self) -> tuple:
+        return (type(self), self.ignore_case)
+
+    def merged(self, other: "_ProcessCondition") -> "_ProcessCondition":
+        return _ProcessCondition(self.names | other.names, self.ignore_case)
+
+    def matches(self, facts: WindowFacts) -> bool:
+        name = facts.process_name
+        return (name.lower() if self.ignore_case else name) in self.names
+
+
+class WindowRule:
+    """One include or exclude rule; every condition it sets must match.
+
+    Process and class names are compared case-insensitively unless ``ignore_case``
+    is off, ``title`` is a case-insensitive regular expression searched anywhere in
+    the title, the style masks match when any of their bits is set (``*_any``), any
+    is missing (``*_missing``) or none is set (``*_none``), and
+    ``min_width``/``min_height`` match restored windows smaller than that size.
+    A rule without conditions matches every window.
+    """
+
+    __slots__ = ("action", "processes", "classes", "title", "style_any", "style_missing", "style_none",
+                 "ex_style_any", "ex_style_missing", "ex_style_none", "min_width", "min_height", "ignore_case")
+
+    def __init__(self, action: str, processes: Iterable[str] = (), classes: Iterable[str] = (),
+                 title: Optional[str] = None, style_any: int = 0, style_missing: int = 0,
+                 ex_style_any: int = 0, ex_style_missing: int = 0, min_width: int = 0, min_height: int = 0,
+                 ignore_case: bool = True, style_none: int = 0, ex_style_none: int = 0):
+        if action not in RULE_ACTIONS:
+            raise ValueError(f"Unknown rule action {action!r}")
+        if title is not None:
+            _compile_titles([title])
+        self.action = action
+        self.processes = tuple(processes)
+        self.classes = tuple(classes)
+        self.title = title
+        self.style_any = style_any
+        self.style_missing = style_missing
+        self.style_none = style_none
+        self.ex_style_any = ex_style_any
+        self.ex_style_missing = ex_style_missing
+        self.ex_style_none = ex_style_none
+        self.min_width = min_width
+        self.min_height = min_height
+        self.ignore_case = ignore_case
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WindowRule":
+        """Builds a rule from its JSON form; style masks may be ints or hex strings."""
+        def mask(name: str) -> int:
+            value = data.get(name, 0)
+            return int(value, 0) if isinstance(value, str) else int(value)
+
+        def names(name: str) -> List[str]:
+            value = data.get(name, [])
+            return [value] if isinstance(value, str) else list(value)
+
+        unknown = set(data) - {"action", "process", "class", "title", "style_any", "style_missing", "style_none",
+                               "ex_style_any", "ex_style_missing", "ex_style_none", "min_width", "min_height",
+                               "ignore_case"}
+        if unknown:
+            raise ValueError(f"Unknown rule keys {sorted(unknown)}")
+        return cls(data.get("action", ""), names("process"), names("class"), data.get("title"),
+                   mask("style_any"), mask("style_missing"), mask("ex_style_any"),
+                   mask("ex_style_missing"), int(data.get("min_width", 0)), int(data.get("min_height", 0)),
+                   bool(data.get("ignore_case", True)), mask("style_none"), mask("ex_style_none"))
+
+    def conditions(self) -> list:
+        """Returns the rule's conditions, cheapest first."""
+        conditions = []
+        for extended, mode, bits in ((False, _STYLE_ANY, self.style_any),
+                                     (False, _STYLE_MISSING, self.style_missing),
+                                     (False, _STYLE_NONE, self.style_none),
+                                     (True, _STYLE_ANY, self.ex_style_any),
+                                     (True, _STYLE_MISSING, self.ex_style_missing),
+                                     (True, _STYLE_NONE, self.ex_style_none)):
+            if bits:
+                conditions.append(_StyleCondition(extended, bits, mode))
+        if self.classes:
+            conditions.append(_ClassCondition(self.classes, self.ignore_case))
+        if self.min_width or self.min_height:
+            conditions.append(_SizeCondition(self.min_width, self.min_height))
+        if self.title is not None:
+            conditions.append(_TitleCondition([self.title]))
+        if self.processes:
+            conditions.append(_ProcessCondition(self.processes, self.ignore_case))
+        return sorted(conditions, key=lambda condition: condition.cost)
+
+
+# Exact-case, as the checks these rules replaced compared names with ``in``.
+DEFAULT_RULES = (
+    WindowRule("exclude", ex_style_any=WS_EX_TOOLWINDOW | WS_EX_NOACTIVATE),
+    WindowRule("exclude", style_missing=WS_VISIBLE),
+    # WS_CAPTION is WS_BORDER | WS_DLGFRAME; either bit alone still counts as a caption.
+    WindowRule("exclude", style_none=WS_CAPTION),
+    WindowRule("exclude", classes=EXCLUDED_CLASSES, ignore_case=False),
+    WindowRule("exclude", min_width=MIN_WINDOW_WIDTH, min_height=MIN_WINDOW_HEIGHT),
+    WindowRule("exclude", processes=SYSTEM_PROCESSES, ignore_case=False),
+)
+
+
+class _Step:
+    """A compiled rule: an action and its conditions, cheapest first."""
+
+    __slots__ = ("include", "conditions", "needs_process")
+
+    def __init__(self, include: bool, conditions: list):
+        self.include = include
+        self.conditions = conditions
+        self.needs_process = any(condition.cost == _PROCESS_COST for condition in conditions)
+
+    def matches(self, facts: WindowFacts) -> Optional[bool]:
+        """Returns whether every condition matches, or None if that needs the process name."""
+        for condition in self.conditions:
+            if condition.cost == _PROCESS_COST and facts.process_name is None:
+                return None
+            if not condition.matches(facts):
+                return False
+        return True
+
+
+def _compile(rules: Sequence[WindowRule]) -> List[_Step]:
+    """Turns rules into steps, merging neighbouring single-condition rules of one kind.
+
+    Rules are first-match, so only adjacent rules with the same action can be merged:
+    their class and process names become one set, their title patterns one regex
+    alternation and their style masks one mask.
+    """
+    steps: List[_Step] = []
+    for rule in rules:
+        include = rule.action == "include"
+        conditions = rule.conditions()
+        previous = steps[-1] if steps else None
+        if (previous is not None and previous.include == include and len(conditions) == 1
+                and len(previous.conditions) == 1
+                and previous.conditions[0].merge_key() == conditions[0].merge_key()):
+            steps[-1] = _Step(include, [previous.conditions[0].merged(conditions[0])])
+        else:
+            steps.append(_Step(include, conditions))
+    return steps
+
+
+class WindowFilter:
+    """First-match include/exclude rules compiled into a two-stage window predicate.
+
+    User rules are checked before the built-in defaults, and a window no rule
+    matches is included. check_window decides from window properties alone and
+    stops at the first rule that needs the process name, so process lookups are
+    only made for windows still undecided; check_process resumes from there.
+    Verdicts are cached per handle and reused while its properties and process
+    name are unchanged.
+    """
+
+    def __init__(self, rules: Sequence[WindowRule] = (), use_defaults: bool = True):
+        self.logger = get_logger("window_rules")
+        self.rules = tuple(rules) + (DEFAULT_RULES if use_defaults else ())
+        self._steps = _compile(self.rules)
+        self._cache: Dict[int, Tuple[tuple, Optional[bool], int, Optional[str], bool]] = {}
+        costs = {condition.cost for step in self._steps for condition in step.conditions}
+        self.needs_class_name = _CLASS_COST in costs
+        self.needs_size = _SIZE_COST in costs
+
+    @classmethod
+    def from_file(cls, path: Path) -> "WindowFilter":
+        """Loads user rules from a JSON file; a missing file gives the default rules.
+
+        The file holds ``{"rules": [...], "use_defaults": true}``. Invalid rules are
+        logged and skipped, and an unreadable file falls back to the defaults.
+        """
+        logger = get_logger("window_rules")
+        path = Path(path)
+        if not path.exists():
+            return cls()
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            log_exception(logger, e, f"loading filter rules {path}")
+            return cls()
+
+        rules = []
+        for index, entry in enumerate(data.get("rules", [])):
+            try:
+                rules.append(WindowRule.from_dict(entry))
+            except Exception as e:
+                log_exception(logger, e, f"filter rule {index} in {path}")
+        logger.info("Loaded %d filter rules from %s", len(rules), path)
+        return cls(rules, use_defaults=bool(data.get("use_defaults", True)))
+
+    def _evaluate(self, facts: WindowFacts, start: int) -> Tuple[Optional[bool], int]:
+        """Runs steps from start and returns (verdict, index) or (None, index) to resume at."""
+        for index in range(start, len(self._steps)):
+            step = self._steps[index]
+            matched = step.matches(facts)
+            if matched is None:
+                return None, index
+            if matched:
+                return step.include, index
+        return True, len(self._steps)
+
+    def check_window(self, handle: int, facts: WindowFacts) -> Optional[bool]:
+        """Returns the verdict from window properties, or None if it depends on the process."""
+        key = facts.key()
+        entry = self._cache.get(handle)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        verdict, resume = self._evaluate(facts, 0)
+        self._cache[handle] = (key, verdict, resume, None, False)
+        return verdict
+
+    def check_process(self, handle: int, facts: WindowFacts, process_name: str) -> bool:
+        """Finishes a verdict check_window left open, once the process name is known."""
+        key = facts.key()
+        entry = self._cache.get(handle)
+        if entry is None or entry[0] != key:
+            self.check_window(handle, facts)
+            entry = self._cache[handle]
+        if entry[1] is not None:
+            return entry[1]
+        if entry[3] == process_name:
+            return entry[4]
+
+        facts.process_name = process_name
+        verdict, _ = self._evaluate(facts, entry[2])
+        self._cache[handle] = (key, None, entry[2], process_name, verdict)
+        return verdict
+
+    def retain(self, handles: Iterable[int]) -> None:
+        """Drops cached verdicts for windows that no longer exist."""
+        live = set(handles)
+        for handle in [handle for handle in list(self._cache) if handle not in live]:
+            del self._cache[handle]
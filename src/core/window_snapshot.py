@@ -0,0 +1,29 @@
+import time
+from typing import Optional, Tuple
+
+from .search_index import SearchIndex
+from .window import Window
+
+
+class WindowSnapshot:
+    """Immutable published state of the window list.
+
+    WindowManager builds a new snapshot off to the side and swaps it in with a single
+    attribute assignment, so readers can hold on to a snapshot without locking or
+    copying while the next one is being prepared.
+    """
+
+    __slots__ = ("windows", "generation", "timestamp", "index")
+
+    def __init__(self, windows: Tuple[Window, ...], generation: int,
+                 index: Optional[SearchIndex] = None, timestamp: Optional[float] = None):
+        self.windows = windows
+        self.generation = generation
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.index = index if index is not None else SearchIndex(list(windows), generation)
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def __repr__(self) -> str:
+        return f"WindowSnapshot(generation={self.generation}, windows={len(self.windows)})"
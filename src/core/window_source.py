@@ -0,0 +1,121 @@
+from typing import List, Optional, Set, Tuple
+
+from .window_events import WindowEventSource
+
+WS_EX_TOOLWINDOW = 0x00000080
+WS_EX_NOACTIVATE = 0x08000000
+WS_VISIBLE = 0x10000000
+WS_CAPTION = 0x00C00000
+
+Rect = Tuple[int, int, int, int]
+
+
+class ProcessInfo:
+    """Metadata of one process, identified by its id and creation time."""
+
+    __slots__ = ("process_id", "create_time", "name", "exe")
+
+    def __init__(self, process_id: int, create_time: float, name: str, exe: str = ""):
+        self.process_id = process_id
+        self.create_time = create_time
+        self.name = name
+        self.exe = exe
+
+    def __repr__(self) -> str:
+        return f"ProcessInfo({self.process_id}, {self.name}, {self.exe})"
+
+
+class IconImage:
+    """Decoded application icon as 32-bit pixels in B, G, R, A byte order, rows top-down."""
+
+    __slots__ = ("width", "height", "pixels")
+
+    def __init__(self, width: int, height: int, pixels: bytes):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+
+    def __repr__(self) -> str:
+        return f"IconImage({self.width}x{self.height})"
+
+
+class WindowSource:
+    """Backend interface for the platform window APIs used by WindowManager.
+
+    Style values use the Win32 bit layout (see the WS_* constants above) so filtering
+    logic is identical for every backend.
+    """
+
+    def enumerate_handles(self) -> List[int]:
+        """Returns all top-level window handles in z-order."""
+        raise NotImplementedError
+
+    def is_window(self, handle: int) -> bool:
+        """Returns whether the handle still refers to a window."""
+        raise NotImplementedError
+
+    def is_visible(self, handle: int) -> bool:
+        """Returns whether the window is visible."""
+        raise NotImplementedError
+
+    def get_title(self, handle: int) -> str:
+        """Returns the window title text."""
+        raise NotImplementedError
+
+    def get_style(self, handle: int) -> int:
+        """Returns the window style bits."""
+        raise NotImplementedError
+
+    def get_ex_style(self, handle: int) -> int:
+        """Returns the extended window style bits."""
+        raise NotImplementedError
+
+    def get_owner(self, handle: int) -> int:
+        """Returns the owner window handle, or 0 for unowned windows."""
+        raise NotImplementedError
+
+    def get_class_name(self, handle: int) -> str:
+        """Returns the window class name."""
+        raise NotImplementedError
+
+    def is_minimized(self, handle: int) -> bool:
+        """Returns whether the window is minimized."""
+        raise NotImplementedError
+
+    def get_rect(self, handle: int) -> Rect:
+        """Returns the window rectangle as (left, top, right, bottom)."""
+        raise NotImplementedError
+
+    def get_process_id(self, handle: int) -> int:
+        """Returns the id of the process that owns the window."""
+        raise NotImplementedError
+
+    def get_process_info(self, process_id: int) -> Optional[ProcessInfo]:
+        """Returns metadata for a process, or None if it cannot be read."""
+        raise NotImplementedError
+
+    def get_process_create_time(self, process_id: int) -> Optional[float]:
+        """Returns the creation time of a process, or None if it has exited."""
+        raise NotImplementedError
+
+    def list_process_ids(self) -> Set[int]:
+        """Returns the ids of all running processes."""
+        raise NotImplementedError
+
+    def activate(self, handle: int) -> bool:
+        """Restores the window if needed and brings it to the foreground."""
+        raise NotImplementedError
+
+    def get_icon(self, exe: str, size: int) -> Optional[IconImage]:
+        """Returns the icon of an executable closest to size pixels, or None if it has none."""
+        return None
+
+    def create_event_source(self) -> Optional[WindowEventSource]:
+        """Returns a change-event source for this backend, or None to poll."""
+        return None
+
+
+def default_window_source() -> WindowSource:
+    """Returns the pywin32 backend; imported lazily so other backends work off Windows."""
+    from .win32_source import Win32WindowSource
+    return Win32WindowSource()
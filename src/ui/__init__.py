@@ -1,3 +1,13 @@
-from .searchbar import SearchBar
+from typing import TYPE_CHECKING
 
-__all__ = ["SearchBar"]
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .searchbar import SearchBar
+
+_EXPORTS = {
+    "SearchBar": ".searchbar",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
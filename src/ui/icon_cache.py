@@ -0,0 +1,149 @@
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Set
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QPixmap
+from PyQt5.QtWidgets import QApplication, QStyle
+
+from ..core.window_source import IconImage
+from ..utils.logger import get_logger, log_exception
+from ..utils.metrics import metrics
+
+ICON_SIZE = 20
+ICON_CACHE_ENTRIES = 128
+ICON_DISK_MAX_FILES = 512
+
+IconLoader = Callable[[str, int], Optional[IconImage]]
+
+
+def default_icon_cache_dir() -> Path:
+    """Returns the default on-disk icon cache location, next to the frecency store."""
+    return Path(__file__).parent.parent / "data" / "icons"
+
+
+class IconCache(QObject):
+    """Application icons by executable path, loaded off the GUI thread.
+
+    icon returns at once: a cached icon, or a placeholder while the real one is
+    loaded on a worker thread, which reads the on-disk cache first and asks the
+    loader only on a miss. Decoded pixmaps live in an LRU of a fixed number of
+    entries, including negative entries for executables without an icon, and
+    icon_ready is emitted on the GUI thread once an icon can be shown. Disk entries
+    are keyed by path, size and modification time, so an updated executable gets
+    its new icon.
+    """
+    icon_ready = pyqtSignal(str)
+    _loaded = pyqtSignal(str, object)
+
+    def __init__(self, loader: IconLoader, cache_dir: Optional[Path] = None, size: int = ICON_SIZE,
+                 capacity: int = ICON_CACHE_ENTRIES, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.logger = get_logger("icon_cache")
+        self._loader = loader
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else default_icon_cache_dir()
+        self._size = size
+        self._capacity = capacity
+        self._icons: "OrderedDict[str, Optional[QIcon]]" = OrderedDict()
+        self._pending: Set[str] = set()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="icons")
+        self.placeholder = QApplication.style().standardIcon(QStyle.SP_TitleBarMenuButton)  # type: ignore
+        self._loaded.connect(self._on_loaded, Qt.QueuedConnection)  # type: ignore
+        self._executor.submit(self._prune_disk)
+
+    def icon(self, exe: str) -> QIcon:
+        """Returns the icon of an executable, or the placeholder and a background request."""
+        if exe in self._icons:
+            self._icons.move_to_end(exe)
+            metrics.increment("icon_cache.hits")
+            return self._icons[exe] or self.placeholder
+        if exe:
+            self.request(exe)
+        return self.placeholder
+
+    def request(self, exe: str) -> None:
+        """Queues a background load unless the icon is cached or already loading."""
+        if exe in self._icons or exe in self._pending:
+            return
+        metrics.increment("icon_cache.misses")
+        self._pending.add(exe)
+        self._executor.submit(self._load, exe)
+
+    def shutdown(self) -> None:
+        """Stops the worker; queued loads are dropped."""
+        self._closed = True
+        self._executor.shutdown(wait=False)
+
+    def _disk_path(self, exe: str) -> Path:
+        """Returns the disk cache file of an executable at the current size and mtime."""
+        try:
+            mtime = os.stat(exe).st_mtime_ns
+        except OSError:
+            mtime = 0
+        key = hashlib.sha1(f"{exe.lower()}|{self._size}|{mtime}".encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{key}.png"
+
+    def _load(self, exe: str) -> None:
+        """Worker-thread body: reads the disk cache or the loader, then hands the image to the GUI thread."""
+        if self._closed:
+            return
+        image: Optional[QImage] = None
+        try:
+            with metrics.timer("icons.load"):
+                path = self._disk_path(exe)
+                if path.exists():
+                    image = QImage(str(path))
+                if image is None or image.isNull():
+                    image = self._decode(self._loader(exe, self._size))
+                    if image is not None:
+                        self._save(path, image)
+        except Exception as e:
+            log_exception(self.logger, e, f"loading icon of {exe}")
+            image = None
+        self._loaded.emit(exe, image)
+
+    def _decode(self, icon: Optional[IconImage]) -> Optional[QImage]:
+        """Turns loader pixels into an image at the cache size."""
+        if icon is None or not icon.width or not icon.height:
+            return None
+        image = QImage(icon.pixels, icon.width, icon.height, icon.width * 4, QImage.Format_ARGB32).copy()
+        if (image.width(), image.height()) != (self._size, self._size):
+            image = image.scaled(self._size, self._size, Qt.KeepAspectRatio,  # type: ignore
+                                 Qt.SmoothTransformation)  # type: ignore
+        return image
+
+    def _save(self, path: Path, image: QImage) -> None:
+        """Writes an icon to the disk cache atomically."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            if image.save(str(temp_path), "PNG"):
+                os.replace(temp_path, path)
+        except Exception as e:
+            log_exception(self.logger, e, f"saving icon {path}")
+
+    def _prune_disk(self) -> None:
+        """Deletes the least recently written disk entries beyond the file limit."""
+        try:
+            if not self._cache_dir.exists():
+                return
+            files = sorted(self._cache_dir.glob("*.png"), key=lambda path: path.stat().st_mtime)
+            for path in files[:max(0, len(files) - ICON_DISK_MAX_FILES)]:
+                path.unlink()
+        except Exception as e:
+            log_exception(self.logger, e, f"pruning icon cache {self._cache_dir}")
+
+    def _on_loaded(self, exe: str, image: Optional[QImage]) -> None:
+        """GUI-thread side of a load: converts to a pixmap, caches it and announces it."""
+        self._pending.discard(exe)
+        icon = QIcon(QPixmap.fromImage(image)) if image is not None else None
+        self._icons[exe] = icon
+        self._icons.move_to_end(exe)
+        while len(self._icons) > self._capacity:
+            self._icons.popitem(last=False)
+        if icon is not None:
+            self.icon_ready.emit(exe)
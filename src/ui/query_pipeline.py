@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from ..core.search_engine import SearchCache
+from ..core.window import Window
+from ..core.window_manager import WindowManager
+from ..utils.logger import get_logger, log_exception
+from ..utils.metrics import metrics
+
+SEARCH_DEBOUNCE_MS = 30
+
+
+class QueryPipeline(QObject):
+    """Runs debounced searches on a worker thread and reports only current results.
+
+    Every submitted query gets a sequence number. A worker job whose number is no
+    longer the latest is skipped before it starts, and results that arrive after a
+    newer query was submitted are dropped, so the GUI thread never waits on window
+    enumeration or scoring.
+    """
+    results_ready = pyqtSignal(int, str, object)
+    search_failed = pyqtSignal(int, str)
+
+    def __init__(self, window_manager: WindowManager, search_cache: SearchCache,
+                 limit: int, debounce_ms: int = SEARCH_DEBOUNCE_MS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.logger = get_logger("query_pipeline")
+        self._window_manager = window_manager
+        self._search_cache = search_cache
+        self._limit = limit
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._seq_lock = threading.Lock()
+        self._latest_seq = 0
+        self._pending_text = ""
+        self._future: Optional[Future] = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._dispatch)
+
+    def submit(self, text: str) -> None:
+        """Schedules a search for text once typing pauses for the debounce interval."""
+        self._pending_text = text
+        self._next_seq()
+        self._debounce.start()
+
+    def cancel(self) -> None:
+        """Drops any pending or running query."""
+        self._debounce.stop()
+        self._next_seq()
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def is_current(self, seq: int) -> bool:
+        """Returns whether seq belongs to the most recently submitted query."""
+        with self._seq_lock:
+            return seq == self._latest_seq
+
+    def shutdown(self) -> None:
+        """Cancels outstanding work and stops the worker thread."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _next_seq(self) -> int:
+        """Advances and returns the query sequence number."""
+        with self._seq_lock:
+            self._latest_seq += 1
+            return self._latest_seq
+
+    def _dispatch(self) -> None:
+        """Hands the latest pending query to the worker, cancelling an unstarted one."""
+        with self._seq_lock:
+            seq = self._latest_seq
+        if self._future is not None:
+            self._future.cancel()
+        self._future = self._executor.submit(self._run, seq, self._pending_text)
+
+    def _run(self, seq: int, text: str) -> None:
+        """Worker-thread body: searches unless a newer query has superseded this one."""
+        if not self.is_current(seq):
+            return
+
+        try:
+            search_index = self._window_manager.get_search_index()
+            if not self.is_current(seq):
+                return
+            with metrics.timer("search.pipeline_run"):
+                results: List[Window] = self._search_cache.search(search_index, text, limit=self._limit)
+        except Exception as e:
+            log_exception(self.logger, e, f"background search for '{text}'")
+            self.search_failed.emit(seq, str(e))
+            return
+
+        if self.is_current(seq):
+            self.results_ready.emit(seq, text, results)
@@ -0,0 +1,149 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+
+from ..core.window import Window
+from ..utils.logger import get_logger
+from .icon_cache import IconCache
+
+ROW_HEIGHT = 44
+MAX_TITLE_LENGTH = 50
+
+HandleRole = Qt.UserRole  # type: ignore
+
+
+def format_title(window: Window) -> str:
+    """Shortens a window title for display in the results list."""
+    title = window.title
+    if len(title) > MAX_TITLE_LENGTH:
+        title = title[:MAX_TITLE_LENGTH - 3] + "..."
+    return title
+
+
+class ResultsModel(QAbstractListModel):
+    """List model of search results that changes only the rows that differ.
+
+    set_windows turns the current rows into the new result list with row removals,
+    moves and insertions keyed by window handle, plus a dataChanged for rows whose
+    title changed, so the view keeps every other row and repaints only what moved.
+    Every row reports the same fixed size hint, so views never ask the style to
+    measure items. With an icon cache, rows show their application's icon, or its
+    placeholder until the icon has loaded and the row is refreshed.
+    """
+
+    def __init__(self, parent=None, row_height: int = ROW_HEIGHT, icons: Optional[IconCache] = None,
+                 exe_of: Optional[Callable[[Window], str]] = None):
+        super().__init__(parent)
+        self.logger = get_logger("results_model")
+        self._windows: List[Window] = []
+        self._row_size = QSize(0, row_height)
+        self._icons = icons
+        self._exe_of = exe_of
+        self.row_operations = 0
+        if icons is not None:
+            icons.icon_ready.connect(self.on_icon_ready)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore
+        """Returns the number of results; list models have no children."""
+        return 0 if parent.isValid() else len(self._windows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:  # type: ignore
+        """Returns the display title, icon, handle or fixed size hint for a row."""
+        if not index.isValid() or index.row() >= len(self._windows):
+            return None
+        if role == Qt.DisplayRole:  # type: ignore
+            return format_title(self._windows[index.row()])
+        if role == HandleRole:
+            return self._windows[index.row()].handle
+        if role == Qt.DecorationRole and self._icons is not None:  # type: ignore
+            return self._icons.icon(self._exe_of(self._windows[index.row()]))
+        if role == Qt.SizeHintRole:  # type: ignore
+            return self._row_size
+        return None
+
+    def window_at(self, row: int) -> Optional[Window]:
+        """Returns the window shown in a row, or None when the row does not exist."""
+        if 0 <= row < len(self._windows):
+            return self._windows[row]
+        return None
+
+    def on_icon_ready(self, exe: str) -> None:
+        """Repaints the icon of every row whose process runs exe."""
+        for row, window in enumerate(self._windows):
+            if self._exe_of(window) == exe:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])  # type: ignore
+
+    def clear(self) -> None:
+        """Removes every row."""
+        if not self._windows:
+            return
+        self.beginResetModel()
+        self._windows = []
+        self.endResetModel()
+        self.row_operations += 1
+
+    def set_windows(self, windows: List[Window]) -> None:
+        """Updates the rows to match windows with the fewest row changes.
+
+        Rows whose handle is gone are removed in contiguous runs, then the new list
+        is walked in order, moving rows that already exist into place and inserting
+        the rest. Results are capped to a handful of rows, so the linear lookups stay
+        cheap.
+        """
+        new_handles = {window.handle for window in windows}
+        if len(new_handles) != len(windows):
+            self.logger.debug("Duplicate handles in results, resetting model")
+            self.beginResetModel()
+            self._windows = list(windows)
+            self.endResetModel()
+            self.row_operations += 1
+            return
+
+        self._remove_missing(new_handles)
+
+        positions: Dict[int, int] = {window.handle: row for row, window in enumerate(self._windows)}
+        for row, window in enumerate(windows):
+            current = positions.get(window.handle)
+            if current is None:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._windows.insert(row, window)
+                self.endInsertRows()
+                self.row_operations += 1
+                positions = self._positions_from(row, positions)
+                continue
+
+            if current != row:
+                self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), row)
+                self._windows.insert(row, self._windows.pop(current))
+                self.endMoveRows()
+                self.row_operations += 1
+                positions = self._positions_from(row, positions)
+
+            previous = self._windows[row]
+            self._windows[row] = window
+            if format_title(previous) != format_title(window):
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])  # type: ignore
+                self.row_operations += 1
+
+    def _remove_missing(self, keep: set) -> None:
+        """Removes rows whose handle is not in keep, last run first."""
+        row = len(self._windows)
+        while row > 0:
+            row -= 1
+            if self._windows[row].handle in keep:
+                continue
+            last = row
+            while row > 0 and self._windows[row - 1].handle not in keep:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row, last)
+            del self._windows[row:last + 1]
+            self.endRemoveRows()
+            self.row_operations += 1
+
+    def _positions_from(self, row: int, positions: Dict[int, int]) -> Dict[int, int]:
+        """Refreshes handle positions from row onwards after a move or insertion."""
+        for offset, window in enumerate(self._windows[row:], start=row):
+            positions[window.handle] = offset
+        return positions
@@ -1,28 +1,62 @@
-from typing import List
+from typing import Dict, List, Optional
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, 
-                             QLineEdit, QListWidget, QListWidgetItem)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QKeyEvent, QFocusEvent, QCloseEvent
+                             QLineEdit, QListView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QModelIndex, QPoint, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QKeyEvent, QFocusEvent, QCloseEvent, QCursor, QPaintEvent, QScreen
 
 from ..core.window_manager import WindowManager
-from ..core.search_engine import search_windows
+from ..core.search_engine import SearchCache
 from ..core.window import Window
-from ..utils.logger import get_logger, log_exception, UIError, SearchEngineError, WindowManagerError
+from ..core.window_diff import WindowDiff
+from ..utils.logger import get_logger, log_exception, SampledLogger, UIError
+from ..utils.metrics import default_metrics_path, metrics
+from .icon_cache import ICON_SIZE, IconCache
+from .query_pipeline import QueryPipeline
+from .results_model import ROW_HEIGHT, HandleRole, ResultsModel
+
+MAX_RESULTS = 3
+BAR_WIDTH = 500
+COLLAPSED_HEIGHT = 55
+RESULTS_MAX_HEIGHT = 300
+PARKED_POSITION = QPoint(-32000, -32000)
 
 
 class SearchBar(QWidget):
-    """Main UI widget that provides a search interface for window switching."""
-    def __init__(self):
+    """Main UI widget that provides a search interface for window switching.
+
+    With prewarm on, the bar is polished, laid out and shown once at startup, then
+    parked off-screen whenever it is dismissed instead of being hidden. Opening it
+    moves it to a cached per-screen position and rewrites only the result rows whose
+    window changed, so no polish or window mapping happens on the hotkey path.
+    """
+    windows_changed = pyqtSignal(object)
+
+    def __init__(self, window_manager: Optional[WindowManager] = None, max_results: int = MAX_RESULTS,
+                 prewarm: bool = True):
         super().__init__()
         self.logger = get_logger("searchbar")
+        self._keystroke_log = SampledLogger(self.logger)
+        self.max_results = max_results
+        self.prewarmed = prewarm
+        self.parked = False
+        self._screen_positions: Dict[str, QPoint] = {}
+        self._paint_pending = False
         
         try:
-            self.window_manager = WindowManager()
-            self.window_manager.add_change_callback(self.on_windows_changed)
+            self.window_manager = window_manager if window_manager is not None else WindowManager()
+            self.search_cache = SearchCache()
+            self.query_pipeline = QueryPipeline(self.window_manager, self.search_cache, max_results, parent=self)
+            self.query_pipeline.results_ready.connect(self.on_results_ready)
+            self.query_pipeline.search_failed.connect(self.on_search_failed)
+            self.windows_changed.connect(self.on_windows_changed)
+            self.window_manager.add_change_callback(self._forward_windows_changed)
             
             self.setup_ui()
             self.setup_style()
             self.setup_behavior()
+            self.setup_screens()
+            if prewarm:
+                QTimer.singleShot(0, self.prewarm)
             
             self.logger.debug("Search bar initialized")
         except Exception as e:
@@ -41,10 +75,22 @@ class SearchBar(QWidget):
             self.search_input.setMinimumHeight(45)
             self.search_input.textChanged.connect(self.on_search_changed)
             
-            self.results_list = QListWidget()
-            self.results_list.setMaximumHeight(300)
-            self.results_list.itemClicked.connect(self.on_item_clicked)
+            self.icon_cache = IconCache(self.window_manager.load_icon, parent=self)
+            self.results_model = ResultsModel(self, icons=self.icon_cache,
+                                              exe_of=lambda window: self.window_manager.process_exe(window.process_id))
+            self.results_list = QListView()
+            self.results_list.setModel(self.results_model)
+            self.results_list.setUniformItemSizes(True)
+            self.results_list.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
+            self.results_list.setEditTriggers(QAbstractItemView.NoEditTriggers)  # type: ignore
+            self.results_list.setMaximumHeight(RESULTS_MAX_HEIGHT)
+            self.results_list.clicked.connect(self.on_item_clicked)
             self.results_list.hide()
+
+            self._layout_timer = QTimer(self)
+            self._layout_timer.setSingleShot(True)
+            self._layout_timer.setInterval(0)
+            self._layout_timer.timeout.connect(self.apply_layout)
             
             main_layout.addWidget(self.search_input)
             main_layout.addWidget(self.results_list)
@@ -79,7 +125,7 @@ class SearchBar(QWidget):
                 background-color: rgba(70, 70, 70, 220);
             }
             
-            QListWidget {
+            QListView {
                 background-color: rgba(50, 50, 50, 220);
                 border: 1px solid rgba(100, 100, 100, 100);
                 border-radius: 8px;
@@ -87,7 +133,7 @@ class SearchBar(QWidget):
                 padding: 5px;
             }
             
-            QListWidget::item {
+            QListView::item {
                 background-color: transparent;
                 border: none;
                 padding: 10px 15px;
@@ -96,12 +142,12 @@ class SearchBar(QWidget):
                 min-height: 20px;
             }
             
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: rgba(0, 120, 215, 180);
                 color: white;
             }
             
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: rgba(80, 80, 80, 150);
             }
         """)
@@ -113,130 +159,207 @@ class SearchBar(QWidget):
             self.setAttribute(Qt.WA_TranslucentBackground)  # type: ignore
             self.setFocusPolicy(Qt.StrongFocus)  # type: ignore
             
-            self.setFixedWidth(500)
-            self.resize(500, 55)
-            self.center_on_screen()
+            if self.prewarmed:
+                self.setAttribute(Qt.WA_ShowWithoutActivating)  # type: ignore
+            
+            self.setFixedWidth(BAR_WIDTH)
+            self.resize(BAR_WIDTH, COLLAPSED_HEIGHT)
             self.logger.debug("Behavior setup complete")
         except Exception as e:
             log_exception(self.logger, e, "UI behavior setup")
             raise UIError("Failed to setup UI behavior") from e
         
-    def on_windows_changed(self) -> None:
-        """Refreshes search results when window list changes."""
+    def setup_screens(self) -> None:
+        """Drops cached screen positions whenever screens are added, removed or change geometry."""
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screens_changed)  # type: ignore
+        app.screenRemoved.connect(self.on_screens_changed)  # type: ignore
+        app.primaryScreenChanged.connect(self.on_screens_changed)  # type: ignore
+        for screen in app.screens():  # type: ignore
+            self._watch_screen(screen)
+
+    def _watch_screen(self, screen: QScreen) -> None:
+        """Connects a screen's geometry signals to the position cache."""
+        screen.geometryChanged.connect(self.on_screens_changed)
+        screen.logicalDotsPerInchChanged.connect(self.on_screens_changed)
+
+    def on_screens_changed(self, screen: Optional[QScreen] = None) -> None:
+        """Forgets cached positions after a screen change."""
+        if screen is not None and screen in QApplication.screens():
+            self._watch_screen(screen)
+        self._screen_positions.clear()
+        self.logger.debug("Screens changed, position cache cleared")
+
+    def _forward_windows_changed(self, diff: WindowDiff) -> None:
+        """Re-emits monitor-thread change notifications onto the GUI thread."""
+        self.windows_changed.emit(diff)
+
+    def on_windows_changed(self, diff: WindowDiff) -> None:
+        """Refreshes search results, or the empty-query results, when the window list changes."""
         try:
-            if self.results_list.isVisible() and self.search_input.text().strip():
-                self.on_search_changed(self.search_input.text())
+            if not (diff.added or diff.removed or diff.retitled):
+                return
+            if self.search_input.text().strip():
+                if self.results_model.rowCount():
+                    self.on_search_changed(self.search_input.text())
+            elif self.parked or self.isVisible():
+                self.show_empty_results()
         except Exception as e:
             log_exception(self.logger, e, "window change callback")
-            self.results_list.hide()
-            self.resize(500, 55)
+            self.clear_results()
         
+    def overlay_position(self) -> QPoint:
+        """Returns the top-left corner for the screen under the cursor, cached per screen."""
+        screen = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+        position = self._screen_positions.get(screen.name())
+        if position is None:
+            geometry = screen.geometry()
+            position = QPoint(geometry.x() + (geometry.width() - BAR_WIDTH) // 2,
+                              geometry.y() + (geometry.height() - COLLAPSED_HEIGHT) // 3)
+            self._screen_positions[screen.name()] = position
+        return position
+
     def center_on_screen(self) -> None:
-        """Centers the search bar on the primary screen."""
+        """Moves the search bar to its position on the screen under the cursor."""
         try:
-            screen = QApplication.desktop().screenGeometry()  # type: ignore
-            size = self.geometry()
-            x = (screen.width() - size.width()) // 2
-            y = (screen.height() - size.height()) // 3
-            self.move(x, y)
+            self.move(self.overlay_position())
         except Exception as e:
-            self.logger.error(f"Failed to center on screen: {e}")
+            self.logger.error("Failed to center on screen: %s", e)
             self.move(100, 100)
+
+    def prewarm(self) -> None:
+        """Polishes, lays out and shows the search bar once, then parks it off-screen."""
+        try:
+            self.show_empty_results()
+            self.apply_layout()
+            self.move(PARKED_POSITION)
+            self.show()
+            self.parked = True
+            self.logger.debug("Search bar prewarmed")
+        except Exception as e:
+            log_exception(self.logger, e, "prewarming search UI")
+            self.prewarmed = False
+            self.hide()
         
+    @metrics.timed("ui.show_search")
     def show_search(self) -> None:
-        """Shows the search bar and prepares it for user input."""
+        """Shows the search bar with the empty-query results and prepares it for user input."""
         try:
             self.logger.info("Search bar shown")
-            self.search_input.clear()
-            self.results_list.clear()
-            self.results_list.hide()
-            self.resize(500, 55)
+            if not self.parked:
+                self.search_input.clear()
+            # Parked results miss focus and z-order changes, which do not refresh them.
+            self.show_empty_results()
+            self.apply_layout()
             self.center_on_screen()
+            self.parked = False
+            self._paint_pending = True
             self.show()
+            self.raise_()
             self.activateWindow()
             self.search_input.setFocus()
+            self.update()
+            metrics.observe_since("hotkey_pressed", "ui.hotkey_to_overlay", clear=False)
         except Exception as e:
             log_exception(self.logger, e, "showing search UI")
             raise UIError("Failed to show search bar") from e
         
     def hide_search(self) -> None:
-        """Hides the search bar and clears its contents."""
-        self.hide()
+        """Hides the search bar, or parks it off-screen when prewarmed, and clears its contents."""
+        if self.prewarmed:
+            self.move(PARKED_POSITION)
+            self.parked = True
+        else:
+            self.hide()
         self.search_input.clear()
-        self.results_list.clear()
+        self.search_cache.invalidate()
+        self.show_empty_results()
+        if self.prewarmed:
+            self.apply_layout()
         self.logger.info("Search bar hidden")
+
+    def show_empty_results(self) -> None:
+        """Lists the windows an empty query returns, read from the current snapshot."""
+        self.query_pipeline.cancel()
+        index = self.window_manager.get_snapshot().index
+        self.update_results(self.search_cache.search(index, "", limit=self.max_results))
         
     def on_search_changed(self, text: str) -> None:
-        """Handles search input changes and updates results display."""
+        """Queues a background search for the new input text."""
         if not text.strip():
-            self.results_list.hide()
-            self.resize(500, 55)
+            self.show_empty_results()
             return
             
         try:
-            self.logger.debug(f"Searching: '{text}'")
-            current_windows = self.window_manager.get_all_windows()
-            results = search_windows(current_windows, text)
-            self.update_results(results[:3])
-        except (SearchEngineError, WindowManagerError) as e:
-            self.logger.error(f"Search failed: {e}")
-            self.results_list.hide()
-            self.resize(500, 55)
-            raise
+            self._keystroke_log.debug("Searching: '%s'", text)
+            self.query_pipeline.submit(text)
         except Exception as e:
             log_exception(self.logger, e, "search changed")
-            self.results_list.hide()
-            self.resize(500, 55)
+            self.clear_results()
             raise UIError("Failed to process search query") from e
+
+    def on_results_ready(self, seq: int, text: str, results: List[Window]) -> None:
+        """Shows worker results if they still match the current input."""
+        if not self.query_pipeline.is_current(seq) or text != self.search_input.text():
+            return
+        self.update_results(results)
+
+    def on_search_failed(self, seq: int, message: str) -> None:
+        """Hides the results list when the current background search fails."""
+        if not self.query_pipeline.is_current(seq):
+            return
+        self.logger.error("Search failed: %s", message)
+        self.clear_results()
             
+    @metrics.timed("ui.update_results")
     def update_results(self, windows: List[Window]) -> None:
-        """Updates the results list with matching windows."""
+        """Updates the results list with matching windows, changing only rows that differ."""
         try:
-            self.results_list.clear()
-            
-            if not windows:
-                self.results_list.hide()
-                self.resize(500, 55)
-                return
-                
-            for window in windows:
-                try:
-                    item_text = self.format_window_item(window)
-                    item = QListWidgetItem(item_text)
-                    item.setData(Qt.UserRole, window.handle)  # type: ignore
-                    self.results_list.addItem(item)
-                except Exception as e:
-                    self.logger.error(f"Failed to create list item for window {window.handle}: {e}")
-                    continue
-                
-            self.results_list.show()
-            item_height = 44
-            list_height = min(len(windows) * item_height + 10, 300)
-            total_height = 55 + list_height + 5
-            self.resize(500, total_height)
-            
-            if self.results_list.count() > 0:
-                self.results_list.setCurrentRow(0)
+            operations = self.results_model.row_operations
+            self.results_model.set_windows(windows)
+            metrics.record("ui.result_row_changes", self.results_model.row_operations - operations)
+
+            if windows and self.results_list.currentIndex().row() != 0:
+                self.results_list.setCurrentIndex(self.results_model.index(0))
+            self.request_layout()
         except Exception as e:
             log_exception(self.logger, e, "updating results")
+            self.clear_results()
+
+    def clear_results(self) -> None:
+        """Empties the results list and collapses the search bar."""
+        self.results_model.clear()
+        self.request_layout()
+
+    def request_layout(self) -> None:
+        """Schedules one resize for the current rows, coalescing requests until the event loop runs."""
+        if not self._layout_timer.isActive():
+            self._layout_timer.start()
+
+    @metrics.timed("ui.apply_layout")
+    def apply_layout(self) -> None:
+        """Shows or hides the results list and sizes the search bar to fit its rows.
+
+        The layout is activated before resizing so a list that was just hidden no
+        longer counts towards the minimum height.
+        """
+        self._layout_timer.stop()
+        rows = self.results_model.rowCount()
+        if not rows:
             self.results_list.hide()
-            self.resize(500, 55)
-            
-    def format_window_item(self, window: Window) -> str:
-        """Formats a window title for display in the results list."""
-        try:
-            title = window.title
-            if len(title) > 50:
-                title = title[:47] + "..."
-            return title
-        except Exception as e:
-            self.logger.error(f"Failed to format window item: {e}")
-            return f"Window {window.handle}"
-        
-    def on_item_clicked(self, item: QListWidgetItem) -> None:
+            self.layout().activate()
+            self.resize(BAR_WIDTH, COLLAPSED_HEIGHT)
+            return
+
+        list_height = min(rows * ROW_HEIGHT + 10, RESULTS_MAX_HEIGHT)
+        self.results_list.show()
+        self.layout().activate()
+        self.resize(BAR_WIDTH, COLLAPSED_HEIGHT + list_height + 5)
+
+    def on_item_clicked(self, index: QModelIndex) -> None:
         """Handles mouse clicks on window items in the results list."""
         try:
-            window_handle = item.data(Qt.UserRole)  # type: ignore
+            window_handle = index.data(HandleRole)
             if window_handle is not None:
                 self.switch_to_window(window_handle)
             else:
@@ -247,45 +370,65 @@ class SearchBar(QWidget):
     def switch_to_window(self, window_handle: int) -> None:
         """Switches to the specified window using the window manager."""
         try:
-            self.logger.debug(f"Switching to window {window_handle}")
+            self.logger.debug("Switching to window %s", window_handle)
             success = self.window_manager.switch_to_window(window_handle)
             if success:
                 self.hide_search()
-                self.logger.info(f"Switched to window {window_handle}")
+                self.logger.info("Switched to window %s", window_handle)
             else:
-                self.logger.error(f"Failed to switch to window {window_handle}")
+                self.logger.error("Failed to switch to window %s", window_handle)
         except Exception as e:
             log_exception(self.logger, e, f"switching to window {window_handle}")
             
+    def on_metrics_requested(self, toggle: bool) -> None:
+        """F12 logs and dumps collected metrics; Ctrl+F12 turns collection on or off."""
+        try:
+            if toggle:
+                if metrics.enabled:
+                    metrics.disable()
+                else:
+                    metrics.enable()
+                return
+            metrics.log_summary()
+            metrics.dump(default_metrics_path())
+        except Exception as e:
+            log_exception(self.logger, e, "dumping metrics")
+
     def keyPressEvent(self, event: QKeyEvent) -> None:  # type: ignore
         """Handles keyboard events for navigation and actions."""
         if event.key() == Qt.Key_Escape:  # type: ignore
             self.hide_search()
+
+        elif event.key() == Qt.Key_F12:  # type: ignore
+            self.on_metrics_requested(bool(event.modifiers() & Qt.ControlModifier))  # type: ignore
             
         elif event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:  # type: ignore
-            if self.results_list.isVisible() and self.results_list.count() > 0:
-                current_item = self.results_list.currentItem()
-                if current_item:
-                    window_handle = current_item.data(Qt.UserRole)  # type: ignore
-                    self.switch_to_window(window_handle)
+            window = self.results_model.window_at(self.results_list.currentIndex().row())
+            if window is not None:
+                self.switch_to_window(window.handle)
                     
         elif event.key() == Qt.Key_Down:  # type: ignore
-            if self.results_list.isVisible() and self.results_list.count() > 0:
-                current_row = self.results_list.currentRow()
-                if current_row < self.results_list.count() - 1:
-                    self.results_list.setCurrentRow(current_row + 1)
+            current_row = self.results_list.currentIndex().row()
+            if current_row < self.results_model.rowCount() - 1:
+                self.results_list.setCurrentIndex(self.results_model.index(current_row + 1))
                     
         elif event.key() == Qt.Key_Up:  # type: ignore
-            if self.results_list.isVisible() and self.results_list.count() > 0:
-                current_row = self.results_list.currentRow()
-                if current_row > 0:
-                    self.results_list.setCurrentRow(current_row - 1)
+            current_row = self.results_list.currentIndex().row()
+            if current_row > 0:
+                self.results_list.setCurrentIndex(self.results_model.index(current_row - 1))
                     
         else:
             if not self.search_input.hasFocus():
                 self.search_input.setFocus()
             super().keyPressEvent(event)
             
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore
+        """Records hotkey-to-first-paint latency for the first frame after opening."""
+        super().paintEvent(event)
+        if self._paint_pending:
+            self._paint_pending = False
+            metrics.observe_since("hotkey_pressed", "ui.hotkey_to_first_paint")
+
     def focusOutEvent(self, event: QFocusEvent) -> None:  # type: ignore
         """Handles focus loss events to auto-hide the search bar."""
         QTimer.singleShot(150, self.check_focus)
@@ -293,17 +436,19 @@ class SearchBar(QWidget):
     def check_focus(self) -> None:
         """Checks if any part of the search bar has focus and hides if not."""
         try:
+            if self.parked or not self.isVisible():
+                return
             if not self.hasFocus() and not self.search_input.hasFocus() and not self.results_list.hasFocus():
                 self.hide_search()
         except Exception as e:
-            self.logger.error(f"Focus check failed: {e}")
+            self.logger.error("Focus check failed: %s", e)
             self.hide_search()
             
     def closeEvent(self, event: QCloseEvent) -> None:  # type: ignore
         """Handles application close event and performs cleanup."""
         try:
             self.logger.debug("Search bar closing")
-            self.window_manager.remove_change_callback(self.on_windows_changed)
+            self.window_manager.remove_change_callback(self._forward_windows_changed)
             super().closeEvent(event)
         except Exception as e:
             log_exception(self.logger, e, "cleanup during close")
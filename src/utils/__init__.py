@@ -1,4 +1,21 @@
-from .logger import get_logger, setup_logging, log_exception
-from .hotkey_listener import GlobalHotkeyListener
+from typing import TYPE_CHECKING
 
-__all__ = ["get_logger", "setup_logging", "log_exception", "GlobalHotkeyListener"]
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .logger import get_logger, setup_logging, log_exception
+    from .hotkey_listener import GlobalHotkeyListener, HotkeyRegistry
+    from .hotkey_backend import Chord, FakeHotkeyBackend
+
+_EXPORTS = {
+    "get_logger": ".logger",
+    "setup_logging": ".logger",
+    "log_exception": ".logger",
+    "GlobalHotkeyListener": ".hotkey_listener",
+    "HotkeyRegistry": ".hotkey_listener",
+    "Chord": ".hotkey_backend",
+    "FakeHotkeyBackend": ".hotkey_backend",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
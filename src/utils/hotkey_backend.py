@@ -0,0 +1,304 @@
+import sys
+import threading
+from typing import Callable, Dict, Mapping, Optional, Tuple, Union
+
+from .logger import get_logger, log_exception, HotkeyError
+
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+
+MODIFIER_NAMES = {"alt": MOD_ALT, "ctrl": MOD_CONTROL, "shift": MOD_SHIFT, "cmd": MOD_WIN, "win": MOD_WIN}
+_MODIFIER_ORDER = (("ctrl", MOD_CONTROL), ("alt", MOD_ALT), ("shift", MOD_SHIFT), ("cmd", MOD_WIN))
+
+NAMED_KEYS = {"space": 0x20, "tab": 0x09, "enter": 0x0D, "esc": 0x1B, "backspace": 0x08,
+              "insert": 0x2D, "delete": 0x2E, "home": 0x24, "end": 0x23,
+              "page_up": 0x21, "page_down": 0x22, "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28}
+NAMED_KEYS.update({f"f{n}": 0x70 + n - 1 for n in range(1, 25)})
+
+ChordCallback = Callable[[int], None]
+
+
+class Chord:
+    """A key combined with a set of modifiers, such as ``<alt>+<ctrl>+q``.
+
+    Modifiers use the Win32 MOD_* bit layout so every backend compares chords the same
+    way. Chords are hashable, so a backend can dispatch a key press with one lookup.
+    """
+
+    __slots__ = ("modifiers", "key")
+
+    def __init__(self, modifiers: int, key: str):
+        self.modifiers = modifiers
+        self.key = key
+
+    @classmethod
+    def parse(cls, text: str) -> "Chord":
+        """Parses pynput-style chord text; modifiers are ``<alt>``, ``<ctrl>``, ``<shift>`` and ``<cmd>``."""
+        modifiers = 0
+        key = None
+        for part in text.lower().replace(" ", "").split("+"):
+            name = part[1:-1] if part.startswith("<") and part.endswith(">") else part
+            if name in MODIFIER_NAMES:
+                modifiers |= MODIFIER_NAMES[name]
+            elif key is None and (name in NAMED_KEYS or (len(name) == 1 and name.isalnum())):
+                key = name
+            else:
+                raise HotkeyError(f"Invalid hotkey '{text}'")
+        if key is None or not modifiers:
+            raise HotkeyError(f"Hotkey '{text}' needs a key and at least one modifier")
+        return cls(modifiers, key)
+
+    @property
+    def virtual_key(self) -> int:
+        """Returns the Win32 virtual-key code of the key."""
+        return NAMED_KEYS.get(self.key) or ord(self.key.upper())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Chord) and (self.modifiers, self.key) == (other.modifiers, other.key)
+
+    def __hash__(self) -> int:
+        return hash((self.modifiers, self.key))
+
+    def __str__(self) -> str:
+        names = [f"<{name}>" for name, flag in _MODIFIER_ORDER if self.modifiers & flag]
+        return "+".join(names + [f"<{self.key}>" if self.key in NAMED_KEYS else self.key])
+
+    def __repr__(self) -> str:
+        return f"Chord({self})"
+
+
+class HotkeyBackend:
+    """Backend interface that reports presses of a fixed set of chords.
+
+    start registers every chord under its id and calls the callback with that id
+    whenever the chord is pressed, possibly from a backend thread. Changing the set
+    of chords means stopping and starting again.
+    """
+
+    def start(self, chords: Mapping[int, Chord], callback: ChordCallback) -> None:
+        """Registers the chords and starts delivering presses."""
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        """Unregisters every chord and stops delivering presses."""
+        raise NotImplementedError
+
+
+class FakeHotkeyBackend(HotkeyBackend):
+    """In-memory backend for tests and development; presses are simulated by the caller."""
+
+    def __init__(self, unavailable: Tuple[str, ...] = ()):
+        self._unavailable = {Chord.parse(text) for text in unavailable}
+        self._chords: Dict[Chord, int] = {}
+        self._callback: Optional[ChordCallback] = None
+
+    @property
+    def running(self) -> bool:
+        """Returns whether the backend currently has a subscriber."""
+        return self._callback is not None
+
+    @property
+    def registered(self) -> Tuple[Chord, ...]:
+        """Returns the chords currently registered."""
+        return tuple(self._chords)
+
+    def start(self, chords: Mapping[int, Chord], callback: ChordCallback) -> None:
+        """Registers the chords, failing like the OS does for chords another program owns."""
+        taken = [str(chord) for chord in chords.values() if chord in self._unavailable]
+        if taken:
+            raise HotkeyError(f"Hotkeys already registered elsewhere: {', '.join(taken)}")
+        self._chords = {chord: chord_id for chord_id, chord in chords.items()}
+        self._callback = callback
+
+    def stop(self) -> None:
+        """Drops the registered chords; later presses are ignored."""
+        self._chords = {}
+        self._callback = None
+
+    def press(self, chord: Union[str, Chord]) -> bool:
+        """Simulates a chord press synchronously and returns whether it was registered."""
+        if isinstance(chord, str):
+            chord = Chord.parse(chord)
+        chord_id = self._chords.get(chord)
+        if chord_id is None or self._callback is None:
+            return False
+        self._callback(chord_id)
+        return True
+
+
+class RegisteredHotkeyBackend(HotkeyBackend):
+    """RegisterHotKey backend running its own message loop thread.
+
+    The OS matches chords itself and posts WM_HOTKEY only when a registered chord is
+    pressed, so no code runs for other keystrokes anywhere on the machine.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("hotkey_backend")
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._started = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def start(self, chords: Mapping[int, Chord], callback: ChordCallback) -> None:
+        """Registers the chords on a dedicated thread and waits until they are active."""
+        if sys.platform != "win32":
+            raise HotkeyError("Registered hotkeys are only available on Windows")
+
+        if self._thread is not None:
+            return
+
+        self._started.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(dict(chords), callback),
+                                        name="hotkeys", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=2)
+
+        if self._error is not None or not self._started.is_set():
+            self._thread = None
+            raise HotkeyError(f"Failed to register hotkeys: {self._error}") from self._error
+
+    def _run(self, chords: Dict[int, Chord], callback: ChordCallback) -> None:
+        """Owns the registrations and pumps messages until WM_QUIT is posted."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        registered = []
+        try:
+            self._thread_id = kernel32.GetCurrentThreadId()
+            for chord_id, chord in chords.items():
+                if not user32.RegisterHotKey(None, chord_id, chord.modifiers | MOD_NOREPEAT, chord.virtual_key):
+                    raise HotkeyError(f"{chord} is already registered by another program")
+                registered.append(chord_id)
+
+            self._started.set()
+            self.logger.debug("Registered %d hotkeys", len(registered))
+
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message != WM_HOTKEY:
+                    continue
+                try:
+                    callback(int(msg.wParam))
+                except Exception as e:
+                    self.logger.error("Hotkey callback failed for %s: %s", msg.wParam, e)
+        except Exception as e:
+            self._error = e
+            log_exception(self.logger, e, "hotkey thread")
+        finally:
+            for chord_id in registered:
+                user32.UnregisterHotKey(None, chord_id)
+            self.logger.debug("Hotkeys unregistered")
+
+    def stop(self) -> None:
+        """Posts WM_QUIT to the hotkey thread and waits for it to unregister."""
+        if self._thread is None:
+            return
+
+        try:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=1)
+            if self._thread.is_alive():
+                self.logger.error("Hotkey thread did not stop gracefully")
+        except Exception as e:
+            log_exception(self.logger, e, "stopping hotkeys")
+        finally:
+            self._thread = None
+
+
+class PynputHotkeyBackend(HotkeyBackend):
+    """Keyboard-hook fallback for platforms without registered hotkeys.
+
+    Every keystroke still reaches the hook, but each press is a modifier update or a
+    single dictionary lookup rather than a pass through per-chord state machines.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("hotkey_backend")
+        self._listener = None
+
+    def start(self, chords: Mapping[int, Chord], callback: ChordCallback) -> None:
+        """Installs the keyboard hook."""
+        if self._listener is not None:
+            return
+
+        from pynput import keyboard
+
+        # AltGr is left out: layouts that type characters with it must not fire Alt chords.
+        modifier_keys = {keyboard.Key.alt: MOD_ALT, keyboard.Key.alt_l: MOD_ALT, keyboard.Key.alt_r: MOD_ALT,
+                         keyboard.Key.ctrl: MOD_CONTROL, keyboard.Key.ctrl_l: MOD_CONTROL,
+                         keyboard.Key.ctrl_r: MOD_CONTROL, keyboard.Key.shift: MOD_SHIFT,
+                         keyboard.Key.shift_l: MOD_SHIFT, keyboard.Key.shift_r: MOD_SHIFT,
+                         keyboard.Key.cmd: MOD_WIN, keyboard.Key.cmd_l: MOD_WIN, keyboard.Key.cmd_r: MOD_WIN}
+        named_keys = {getattr(keyboard.Key, name): name for name in NAMED_KEYS if hasattr(keyboard.Key, name)}
+        by_chord = {(chord.modifiers, chord.key): chord_id for chord_id, chord in chords.items()}
+        # Physical modifier keys down; left and right keys share a flag, so the mask is
+        # derived from the keys rather than cleared when either one is released.
+        held = set()
+        mask = [0]
+
+        def update_mask() -> None:
+            """Recomputes the modifier flags from the held keys."""
+            flags = 0
+            for modifier in held:
+                flags |= modifier_keys[modifier]
+            mask[0] = flags
+
+        def key_name(key) -> Optional[str]:
+            """Returns the chord key name of a pynput key; with Ctrl held, char is a control code."""
+            name = named_keys.get(key)
+            char = getattr(key, "char", None)
+            if name is None and char and char.isalnum():
+                name = char.lower()
+            if name is None and getattr(key, "vk", None) is not None and 0x30 <= key.vk <= 0x5A:
+                name = chr(key.vk).lower()
+            return name
+
+        def on_press(key) -> None:
+            """Updates held modifiers or dispatches a bound chord."""
+            if key in modifier_keys:
+                held.add(key)
+                update_mask()
+                return
+            chord_id = by_chord.get((mask[0], key_name(key))) if mask[0] else None
+            if chord_id is not None:
+                try:
+                    callback(chord_id)
+                except Exception as e:
+                    self.logger.error("Hotkey callback failed for %s: %s", chord_id, e)
+
+        def on_release(key) -> None:
+            """Clears a released modifier key."""
+            if key in held:
+                held.discard(key)
+                update_mask()
+
+        try:
+            self._listener = keyboard.Listener(on_press=on_press, on_release=on_release)
+            self._listener.start()
+        except Exception as e:
+            self._listener = None
+            raise HotkeyError("Failed to install keyboard hook") from e
+
+    def stop(self) -> None:
+        """Removes the keyboard hook."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+def default_hotkey_backend() -> HotkeyBackend:
+    """Returns registered hotkeys on Windows and the keyboard-hook fallback elsewhere."""
+    if sys.platform == "win32":
+        return RegisteredHotkeyBackend()
+    return PynputHotkeyBackend()
@@ -1,85 +1,180 @@
-from typing import Optional, Union
+import json
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
 from PyQt5.QtCore import QObject, pyqtSignal
-from pynput import keyboard
 
+from .hotkey_backend import Chord, HotkeyBackend, default_hotkey_backend
 from .logger import get_logger, log_exception, HotkeyError
+from .metrics import metrics
+
+SHOW_ACTION = "show"
+QUIT_ACTION = "quit"
+DEFAULT_BINDINGS = {SHOW_ACTION: "<alt>+w", QUIT_ACTION: "<alt>+<ctrl>+q"}
+
+
+def default_hotkeys_path() -> Path:
+    """Returns the default hotkey configuration location, next to the filter rules."""
+    return Path(__file__).parent.parent / "data" / "hotkeys.json"
+
+
+class HotkeyRegistry:
+    """Maps actions to chords and chord ids back to actions.
+
+    Every bound action gets a small integer id that backends report on a press, so
+    dispatch is a dictionary lookup however many chords are bound. A chord can only
+    be bound to one action.
+    """
+
+    def __init__(self, bindings: Optional[Mapping[str, str]] = None):
+        self.logger = get_logger("hotkey_listener")
+        self._chords: Dict[str, Chord] = {}
+        self._ids: Dict[str, int] = {}
+        self._actions: Dict[int, str] = {}
+        for action, text in (DEFAULT_BINDINGS if bindings is None else bindings).items():
+            self.bind(action, text)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "HotkeyRegistry":
+        """Loads bindings over the defaults from a JSON file; a missing file gives the defaults.
+
+        The file holds ``{"bindings": {"show": "<alt>+<space>"}}``. An invalid binding
+        keeps that action's default, and an unreadable file falls back to the defaults.
+        """
+        logger = get_logger("hotkey_listener")
+        registry = cls()
+        path = Path(path)
+        if not path.exists():
+            return registry
+
+        try:
+            bindings = json.loads(path.read_text(encoding="utf-8")).get("bindings", {})
+        except Exception as e:
+            log_exception(logger, e, f"loading hotkeys {path}")
+            return registry
+
+        for action, text in bindings.items():
+            try:
+                registry.bind(action, text)
+            except HotkeyError as e:
+                logger.error("Ignoring hotkey for '%s' in %s: %s", action, path, e)
+        logger.info("Loaded %d hotkey bindings from %s", len(bindings), path)
+        return registry
+
+    def bind(self, action: str, text: str) -> Chord:
+        """Binds an action to a chord, replacing its previous chord."""
+        chord = Chord.parse(text)
+        owner = next((name for name, bound in self._chords.items() if bound == chord), None)
+        if owner is not None and owner != action:
+            raise HotkeyError(f"{chord} is already bound to '{owner}'")
+
+        if action not in self._ids:
+            self._ids[action] = len(self._ids) + 1
+            self._actions[self._ids[action]] = action
+        self._chords[action] = chord
+        return chord
+
+    def unbind(self, action: str) -> None:
+        """Removes an action's chord; its id stays reserved."""
+        self._chords.pop(action, None)
+
+    def chord(self, action: str) -> Optional[Chord]:
+        """Returns the chord bound to an action."""
+        return self._chords.get(action)
+
+    def chords(self) -> Dict[int, Chord]:
+        """Returns the bound chords by id, as backends register them."""
+        return {self._ids[action]: chord for action, chord in self._chords.items()}
+
+    def action_for(self, chord_id: int) -> Optional[str]:
+        """Returns the action of a chord id, or None if it is not bound."""
+        action = self._actions.get(chord_id)
+        return action if action in self._chords else None
+
+    def describe(self) -> str:
+        """Returns the bindings as readable text, e.g. for the startup log."""
+        return ", ".join(f"{chord} to {action}" for action, chord in self._chords.items())
 
 
 class GlobalHotkeyListener(QObject):
-    """Handles global hotkey detection for Alt+W (show) and Alt+Ctrl+Q (quit)."""
+    """Delivers global hotkey presses from a backend as Qt signals.
+
+    Presses arrive on the backend's thread and are re-emitted as signals, which Qt
+    queues onto the receivers' threads. The show and quit actions keep their own
+    signals; every action is also reported through action_triggered.
+    """
     hotkey_pressed = pyqtSignal()
     quit_requested = pyqtSignal()
-    
-    def __init__(self):
+    action_triggered = pyqtSignal(str)
+
+    def __init__(self, backend: Optional[HotkeyBackend] = None, registry: Optional[HotkeyRegistry] = None):
         super().__init__()
         self.logger = get_logger("hotkey_listener")
-        self.listener: Optional[keyboard.Listener] = None
+        self.backend = backend if backend is not None else default_hotkey_backend()
+        self.registry = registry if registry is not None else HotkeyRegistry.from_file(default_hotkeys_path())
+        self.listening = False
         self.logger.debug("Hotkey listener initialized")
-        
+
     def start_listening(self) -> None:
-        """Starts the global hotkey listener for Alt+W and Alt+Ctrl+Q."""
-        try:            
-            if self.listener is not None:
+        """Registers the bound chords with the backend."""
+        try:
+            if self.listening:
                 self.logger.debug("Hotkey listener already running")
                 return
-            
-            show_hotkey = keyboard.HotKey(
-                keyboard.HotKey.parse('<alt>+w'),
-                self.on_show_pressed
-            )
-            
-            quit_hotkey = keyboard.HotKey(
-                keyboard.HotKey.parse('<alt>+<ctrl>+q'),
-                self.on_quit_pressed
-            )
-            
-            def on_press(key: Optional[Union[keyboard.Key, keyboard.KeyCode]]) -> None:
-                """Handles key press events."""
-                if key is not None:
-                    try:
-                        show_hotkey.press(listener.canonical(key))
-                        quit_hotkey.press(listener.canonical(key))
-                    except Exception as e:
-                        self.logger.error(f"Error in hotkey press handler: {e}")
-                
-            def on_release(key: Optional[Union[keyboard.Key, keyboard.KeyCode]]) -> None:
-                """Handles key release events."""
-                if key is not None:
-                    try:
-                        show_hotkey.release(listener.canonical(key))
-                        quit_hotkey.release(listener.canonical(key))
-                    except Exception as e:
-                        self.logger.error(f"Error in hotkey release handler: {e}")
-            
-            listener = keyboard.Listener(
-                on_press=on_press,
-                on_release=on_release
-            )
-            self.listener = listener
-            self.listener.start()
-            self.logger.info("Hotkey listener started")
-            
+
+            self.backend.start(self.registry.chords(), self.on_chord_pressed)
+            self.listening = True
+            self.logger.info("Hotkey listener started (%s)", self.registry.describe())
+
         except Exception as e:
             log_exception(self.logger, e, "starting hotkey listener")
             raise HotkeyError("Failed to start hotkey listener") from e
-        
-    def on_show_pressed(self) -> None:
-        """Emits signal when show hotkey is pressed."""
-        self.logger.info("Alt+W pressed - showing search")
-        self.hotkey_pressed.emit()
-    
-    def on_quit_pressed(self) -> None:
-        """Emits signal when quit hotkey is pressed."""
-        self.logger.info("Alt+Ctrl+Q pressed - quitting application")
-        self.quit_requested.emit()
-        
+
+    def rebind(self, action: str, text: str) -> None:
+        """Binds an action to a new chord, re-registering the chords if listening.
+
+        If the new chords cannot be registered, the previous binding is restored and
+        registered again before the error is raised.
+        """
+        previous = self.registry.chord(action)
+        self.registry.bind(action, text)
+        if not self.listening:
+            return
+
+        self.stop_listening()
+        try:
+            self.start_listening()
+        except HotkeyError:
+            if previous is None:
+                self.registry.unbind(action)
+            else:
+                self.registry.bind(action, str(previous))
+            self.start_listening()
+            raise
+
+    def on_chord_pressed(self, chord_id: int) -> None:
+        """Dispatches a backend press to the bound action."""
+        action = self.registry.action_for(chord_id)
+        if action is None:
+            self.logger.debug("Ignoring unbound hotkey %s", chord_id)
+            return
+
+        if action == SHOW_ACTION:
+            metrics.mark("hotkey_pressed")
+            self.logger.info("%s pressed - showing search", self.registry.chord(action))
+            self.hotkey_pressed.emit()
+        elif action == QUIT_ACTION:
+            self.logger.info("%s pressed - quitting application", self.registry.chord(action))
+            self.quit_requested.emit()
+        self.action_triggered.emit(action)
+
     def stop_listening(self) -> None:
-        """Stops the global hotkey listener and cleans up resources."""
+        """Unregisters the chords and stops the backend."""
         try:
-            if self.listener:
+            if self.listening:
                 self.logger.debug("Hotkey listener stopping")
-                self.listener.stop()
-                self.listener = None
+                self.backend.stop()
+                self.listening = False
                 self.logger.debug("Hotkey listener stopped")
         except Exception as e:
             log_exception(self.logger, e, "stopping hotkey listener")
@@ -1,8 +1,22 @@
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+SUBSYSTEM_LEVELS = {
+    "search_engine": "INFO",
+    "search_cache": "INFO",
+    "query_pipeline": "INFO",
+    "hotkey_listener": "INFO",
+}
+HOT_PATH_LOG_INTERVAL = 1.0
+
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 class CustomFormatter(logging.Formatter):
@@ -18,25 +32,49 @@ class CustomFormatter(logging.Formatter):
     def format(self, record):
         """Formats log records with color coding for console output."""
         if hasattr(record, 'levelname'):
+            record = logging.makeLogRecord(record.__dict__)
             color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
             record.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
         return super().format(record)
 
 
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler renders every record before enqueueing it, which puts the
+    %-formatting back on the logging thread. Records never leave this process, so
+    they can be queued as they are and formatted by the background writer.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 def setup_logging(
     name: str = "app",
     level: str = "DEBUG",
     log_to_file: bool = True,
     log_to_console: bool = True,
-    log_dir: Optional[str] = None
+    log_dir: Optional[str] = None,
+    levels: Optional[Dict[str, str]] = None
 ) -> logging.Logger:
-    """Sets up logging configuration with file and console handlers."""
+    """Sets up asynchronous logging with file and console handlers.
+
+    Loggers only enqueue records; a QueueListener thread formats them and does all
+    console and file I/O, so no caller ever waits on a stream or the disk.
+    ``levels`` overrides SUBSYSTEM_LEVELS, keyed by the name passed to get_logger.
+    """
+    global _listener
+    shutdown_logging()
     
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+
+    for subsystem, subsystem_level in {**SUBSYSTEM_LEVELS, **(levels or {})}.items():
+        logging.getLogger(f"{name}.{subsystem}").setLevel(getattr(logging, subsystem_level.upper()))
     
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'
@@ -45,11 +83,12 @@ def setup_logging(
         '%(asctime)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'
     )
     
+    handlers = []
     if log_to_console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     if log_to_file:
         if log_dir is None:
@@ -68,11 +107,79 @@ def setup_logging(
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     return logger
 
 
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the background log writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class SampledLogger:
+    """Rate-limited wrapper for log calls on per-keystroke or per-window paths.
+
+    Each message format is emitted at most once per interval; further calls with it
+    are counted and the count is appended to its next message that gets through. A
+    disabled level costs one isEnabledFor check and nothing is formatted for
+    suppressed messages.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = HOT_PATH_LOG_INTERVAL):
+        self._logger = logger
+        self._interval = interval
+        self._lock = threading.Lock()
+        # Message format -> [monotonic time it may next be emitted, calls suppressed since].
+        self._windows: Dict[str, list] = {}
+
+    def log(self, level: int, msg: str, *args) -> None:
+        """Logs msg % args unless msg was already emitted within the interval."""
+        self._log(level, msg, args)
+
+    def debug(self, msg: str, *args) -> None:
+        """Logs msg % args at DEBUG level, subject to sampling."""
+        self._log(logging.DEBUG, msg, args)
+
+    def info(self, msg: str, *args) -> None:
+        """Logs msg % args at INFO level, subject to sampling."""
+        self._log(logging.INFO, msg, args)
+
+    def _log(self, level: int, msg: str, args: tuple) -> None:
+        """Emits or counts one message, attributing it to the original call site."""
+        if not self._logger.isEnabledFor(level):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(msg)
+            if window is None:
+                window = self._windows[msg] = [0.0, 0]
+            if now < window[0]:
+                window[1] += 1
+                return
+            suppressed = window[1]
+            window[0], window[1] = now + self._interval, 0
+
+        if suppressed:
+            msg = f"{msg} (%d similar suppressed)"
+            args = args + (suppressed,)
+        self._logger.log(level, msg, *args, stacklevel=3)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Returns a logger instance with the specified name."""
     if name:
@@ -105,10 +212,13 @@ class UIError(AppError):
     pass
 
 
+class IpcError(AppError):
+    """Exception raised for IPC server and client related errors."""
+    pass
+
+
 def log_exception(logger: logging.Logger, exception: Exception, context: str = "") -> None:
     """Logs an exception with optional context information."""
     context_str = f" [{context}]" if context else ""
-    logger.error(f"Exception{context_str}: {type(exception).__name__}: {exception}", exc_info=True)
-
-
-main_logger = setup_logging()
+    logger.error("Exception%s: %s: %s", context_str, type(exception).__name__, exception,
+                 exc_info=True, stacklevel=2)
@@ -0,0 +1,246 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .logger import get_logger
+
+SUB_BUCKET_BITS = 5
+HISTOGRAM_MAX_SHIFT = 30
+METRICS_ENV_VAR = "TABBER_METRICS"
+REPORTED_PERCENTILES = (0.50, 0.90, 0.99, 0.999)
+
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = 2 * _SUB_BUCKETS
+_BUCKET_COUNT = _LINEAR_LIMIT + HISTOGRAM_MAX_SHIFT * _SUB_BUCKETS
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _bucket_index(value: int) -> int:
+    """Maps a non-negative integer to its log-linear bucket."""
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = min(value.bit_length() - (SUB_BUCKET_BITS + 1), HISTOGRAM_MAX_SHIFT)
+    mantissa = min(value >> shift, _LINEAR_LIMIT - 1)
+    return _LINEAR_LIMIT + (shift - 1) * _SUB_BUCKETS + (mantissa - _SUB_BUCKETS)
+
+
+def _bucket_upper(index: int) -> int:
+    """Returns the largest value that maps to a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = (index - _LINEAR_LIMIT) // _SUB_BUCKETS + 1
+    mantissa = (index - _LINEAR_LIMIT) % _SUB_BUCKETS + _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """Fixed-bucket, HDR-style histogram of non-negative integers.
+
+    Values below 64 get their own bucket; above that every power of two is split into
+    32 linear sub-buckets, so any recorded value is reported within about 3%. Memory
+    is a fixed array of counts however many values are recorded.
+    """
+
+    def __init__(self, unit: str = ""):
+        self.unit = unit
+        self._lock = threading.Lock()
+        self._counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int) -> None:
+        """Adds one value, clamping negatives to zero."""
+        value = max(0, int(value))
+        index = _bucket_index(value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction: float) -> int:
+        """Returns the upper bound of the bucket holding the given fraction of values."""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, int(round(fraction * self.count)))
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= target:
+                    return min(_bucket_upper(index), self.max)
+            return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns count, min, max, mean and the reported percentiles."""
+        result: Dict[str, Any] = {
+            "unit": self.unit,
+            "count": self.count,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+        for fraction in REPORTED_PERCENTILES:
+            result[f"p{fraction * 100:g}"] = self.percentile(fraction)
+        return result
+
+
+class _NullTimer:
+    """Context manager returned while metrics are disabled."""
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager that records its elapsed time in microseconds."""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.record((time.perf_counter() - self._start) * 1e6)
+
+
+class Metrics:
+    """Process-wide registry of latency histograms, value histograms and counters.
+
+    Every entry point first checks ``enabled``, so instrumentation left in hot paths
+    costs one attribute read while metrics are off. Timers use the monotonic
+    perf_counter clock and record microseconds.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.logger = get_logger("metrics")
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._marks: Dict[str, float] = {}
+
+    def enable(self) -> None:
+        """Starts recording."""
+        self.enabled = True
+        self.logger.info("Metrics enabled")
+
+    def disable(self) -> None:
+        """Stops recording; recorded values are kept until reset."""
+        self.enabled = False
+        self.logger.info("Metrics disabled")
+
+    def histogram(self, name: str, unit: str = "") -> Histogram:
+        """Returns the named histogram, creating it on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(unit))
+        return histogram
+
+    def timer(self, name: str):
+        """Returns a context manager that times its block into the named histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, "us"))
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator that times every call of the wrapped function."""
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self.histogram(name, "us")):
+                    return func(*args, **kwargs)
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    def record(self, name: str, value: float, unit: str = "") -> None:
+        """Adds a value, such as an enumeration size, to the named histogram."""
+        if self.enabled:
+            self.histogram(name, unit).record(value)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Adds to the named counter."""
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def mark(self, name: str) -> None:
+        """Remembers the current time so a later step, even on another thread, can be timed."""
+        if self.enabled:
+            self._marks[name] = time.perf_counter()
+
+    def observe_since(self, mark: str, name: str, clear: bool = True) -> None:
+        """Records the time since a mark into the named histogram, clearing the mark unless told not to."""
+        if not self.enabled:
+            return
+        started = self._marks.pop(mark, None) if clear else self._marks.get(mark)
+        if started is not None:
+            self.histogram(name, "us").record((time.perf_counter() - started) * 1e6)
+
+    def reset(self) -> None:
+        """Discards all recorded values."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._marks.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns every histogram summary and counter as plain data."""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "enabled": self.enabled,
+            "timestamp": time.time(),
+            "histograms": {name: histograms[name].summary() for name in sorted(histograms)},
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def dump(self, path: Path) -> None:
+        """Writes the current snapshot as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        self.logger.info("Metrics written to %s", path)
+
+    def log_summary(self, level: int = logging.INFO) -> None:
+        """Logs one line per histogram and counter."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for name, summary in snapshot["histograms"].items():
+            lines.append(f"{name:<32} n={summary['count']:<7} p50={summary['p50']} p99={summary['p99']} "
+                         f"max={summary['max']} {summary['unit']}")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<32} {value}")
+        self.logger.log(level, "Metrics summary:\n%s", "\n".join(lines) or "(no data)")
+
+
+def default_metrics_path() -> Path:
+    """Returns the default dump location, next to the log files."""
+    return Path(__file__).parent.parent / "logs" / "metrics.json"
+
+
+metrics = Metrics(enabled=os.environ.get(METRICS_ENV_VAR) == "1")
@@ -0,0 +1,44 @@
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .logger import get_logger
+
+
+class StartupTimer:
+    """Records when each startup phase finished, relative to a common origin.
+
+    Pass the perf_counter value taken before the heavy imports as the origin so the
+    report covers the whole launch. Phases may be marked from any thread.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.logger = get_logger("startup")
+        self._origin = time.perf_counter() if origin is None else origin
+        self._lock = threading.Lock()
+        self._phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """Records a phase as finished now and returns its elapsed time in seconds."""
+        elapsed = time.perf_counter() - self._origin
+        with self._lock:
+            self._phases.append((phase, elapsed))
+        self.logger.info("Startup phase '%s' reached after %.1f ms", phase, elapsed * 1000)
+        return elapsed
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """Returns the elapsed time recorded for a phase, if it has been reached."""
+        with self._lock:
+            return next((elapsed for name, elapsed in self._phases if name == phase), None)
+
+    def report(self) -> str:
+        """Returns a table of phases with their own duration and the running total."""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda phase: phase[1])
+
+        lines = [f"{'phase':<24} {'step ms':>9} {'total ms':>9}"]
+        previous = 0.0
+        for name, elapsed in phases:
+            lines.append(f"{name:<24} {(elapsed - previous) * 1000:>9.1f} {elapsed * 1000:>9.1f}")
+            previous = elapsed
+        return "\n".join(lines)
@@ -0,0 +1,117 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import (FRECENCY_FORMAT_VERSION, FRECENCY_PROCESS_SHARE, FRECENCY_WEIGHT,
+                               FrecencyStore)
+from src.core.window import Window
+from src.core.window_manager import WindowManager
+
+HALF_LIFE = 100.0
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_scores_halve_once_per_half_life(clock):
+    store = FrecencyStore(half_life=HALF_LIFE, clock=clock)
+    window = Window(1, "Inbox", 10, "chrome.exe")
+    store.record(window)
+    store.record(window)
+    fresh = 2.0 * (1 + FRECENCY_PROCESS_SHARE)
+    assert store.score(window) == pytest.approx(fresh)
+
+    clock.now += HALF_LIFE
+    assert store.score(window) == pytest.approx(fresh / 2)
+    store.record(window)
+    assert store.score(window) == pytest.approx(2.0 * (1 + FRECENCY_PROCESS_SHARE))
+
+    clock.now += 3 * HALF_LIFE
+    assert store.score(window) == pytest.approx(2.0 * (1 + FRECENCY_PROCESS_SHARE) / 8)
+
+
+def test_windows_share_their_process_score(clock):
+    store = FrecencyStore(half_life=HALF_LIFE, clock=clock)
+    store.record(Window(1, "Inbox", 10, "chrome.exe"))
+    store.record(Window(2, "Docs", 10, "Chrome.EXE"))
+
+    assert store.score(Window(1, "Inbox", 10, "chrome.exe")) == pytest.approx(1 + 2 * FRECENCY_PROCESS_SHARE)
+    assert store.score(Window(3, "News", 11, "chrome.exe")) == pytest.approx(2 * FRECENCY_PROCESS_SHARE)
+    assert store.score(Window(4, "Terminal", 12, "wt.exe")) == 0.0
+    # A recycled handle owned by another process does not inherit the old window's history.
+    assert store.score(Window(1, "Terminal", 12, "wt.exe")) == 0.0
+    store.record(Window(1, "Terminal", 12, "wt.exe"))
+    assert store.score(Window(1, "Terminal", 12, "wt.exe")) == pytest.approx(1 + FRECENCY_PROCESS_SHARE)
+
+
+def test_save_and_load_round_trip(tmp_path, clock):
+    path = tmp_path / "frecency.json"
+    store = FrecencyStore(path, half_life=HALF_LIFE, clock=clock)
+    windows = [Window(1, "Inbox", 10, "chrome.exe"), Window(2, "main.py", 20, "code.exe")]
+    for window in windows + windows[:1]:
+        store.record(window)
+    clock.now += HALF_LIFE
+    store.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["v"] == FRECENCY_FORMAT_VERSION
+
+    clock.now += HALF_LIFE
+    loaded = FrecencyStore(path, half_life=HALF_LIFE, clock=clock)
+    for window in windows + [Window(3, "News", 11, "chrome.exe")]:
+        assert loaded.score(window) == pytest.approx(store.score(window), abs=1e-3)
+
+
+@pytest.mark.parametrize("content", ["{not json", json.dumps({"v": FRECENCY_FORMAT_VERSION + 1, "t": 0,
+                                                                "w": [[1, "a.exe", 5.0]], "p": []})])
+def test_unreadable_or_unknown_stores_start_empty(tmp_path, clock, content):
+    path = tmp_path / "frecency.json"
+    path.write_text(content, encoding="utf-8")
+    assert FrecencyStore(path, clock=clock).score(Window(1, "t", 10, "a.exe")) == 0.0
+
+
+def test_prior_saturates_below_the_weight(clock):
+    store = FrecencyStore(half_life=HALF_LIFE, clock=clock)
+    windows = [Window(1, "Inbox", 10, "chrome.exe"), Window(2, "main.py", 20, "code.exe"),
+               Window(3, "Terminal", 30, "wt.exe")]
+    for _ in range(50):
+        store.record(windows[0])
+    store.record(windows[1])
+
+    prior = store.prior(windows)
+    assert prior.dtype == np.float64 and prior.shape == (3,)
+    assert prior[2] == 0.0
+    assert 0.0 < prior[1] < prior[0] < FRECENCY_WEIGHT
+    raw = store.score(windows[1])
+    assert prior[1] == pytest.approx(FRECENCY_WEIGHT * raw / (raw + 1.0))
+    assert len(store.prior([])) == 0
+
+
+def test_switches_are_recorded_and_saved_off_the_caller(tmp_path):
+    source = FakeWindowSource(seed=4)
+    source.populate(20)
+    path = tmp_path / "frecency.json"
+    manager = WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                            frecency=FrecencyStore(path), use_warm_start=False)
+    target = manager.get_all_windows(force_refresh=True)[-1]
+    position = [window.handle for window in manager.get_snapshot().windows].index(target.handle)
+
+    assert manager.switch_to_window(target.handle)
+    deadline = time.monotonic() + 2.0
+    while manager.get_snapshot().index.prior[position] == 0.0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.get_snapshot().index.prior[position] > 0.0
+
+    manager.stop_monitoring()
+    assert FrecencyStore(path).score(target) > 0.0
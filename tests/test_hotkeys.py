@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from src.utils.hotkey_backend import MOD_ALT, MOD_CONTROL, Chord, FakeHotkeyBackend
+from src.utils.hotkey_listener import QUIT_ACTION, SHOW_ACTION, GlobalHotkeyListener, HotkeyRegistry
+from src.utils.logger import HotkeyError
+
+
+@pytest.fixture
+def listener():
+    backend = FakeHotkeyBackend()
+    listener = GlobalHotkeyListener(backend=backend, registry=HotkeyRegistry())
+    fired = []
+    listener.hotkey_pressed.connect(lambda: fired.append("shown"))
+    listener.quit_requested.connect(lambda: fired.append("quit"))
+    listener.action_triggered.connect(fired.append)
+    listener.start_listening()
+    yield listener, backend, fired
+    listener.stop_listening()
+
+
+def test_chord_parse_normalizes_modifier_order():
+    chord = Chord.parse("<ctrl> + <ALT> + Q")
+    assert chord == Chord(MOD_ALT | MOD_CONTROL, "q")
+    assert chord == Chord.parse("<alt>+<ctrl>+q")
+    assert str(chord) == "<ctrl>+<alt>+q"
+    assert Chord.parse("<alt>+<space>").virtual_key == 0x20
+
+
+@pytest.mark.parametrize("text", ["q", "<alt>", "<alt>+q+w", "<hyper>+q", "<alt>+?"])
+def test_chord_parse_rejects_invalid_text(text):
+    with pytest.raises(HotkeyError):
+        Chord.parse(text)
+
+
+def test_registry_keeps_ids_across_rebinds():
+    registry = HotkeyRegistry()
+    show_id = next(chord_id for chord_id in registry.chords() if registry.action_for(chord_id) == SHOW_ACTION)
+    registry.bind(SHOW_ACTION, "<alt>+<space>")
+    assert registry.chords()[show_id] == Chord.parse("<alt>+<space>")
+    assert registry.action_for(show_id) == SHOW_ACTION
+
+    registry.unbind(SHOW_ACTION)
+    assert registry.action_for(show_id) is None
+    assert show_id not in registry.chords()
+
+
+def test_registry_rejects_a_chord_bound_to_another_action():
+    registry = HotkeyRegistry()
+    with pytest.raises(HotkeyError):
+        registry.bind("palette", "<alt>+w")
+    registry.bind(SHOW_ACTION, "<alt>+w")
+    assert registry.chord(SHOW_ACTION) == Chord.parse("<alt>+w")
+
+
+def test_registry_from_file_keeps_defaults_for_invalid_bindings(tmp_path):
+    path = tmp_path / "hotkeys.json"
+    path.write_text(json.dumps({"bindings": {SHOW_ACTION: "<alt>+<space>", QUIT_ACTION: "q"}}), encoding="utf-8")
+    registry = HotkeyRegistry.from_file(path)
+    assert registry.chord(SHOW_ACTION) == Chord.parse("<alt>+<space>")
+    assert registry.chord(QUIT_ACTION) == Chord.parse("<alt>+<ctrl>+q")
+
+    assert HotkeyRegistry.from_file(tmp_path / "missing.json").chords() == HotkeyRegistry().chords()
+    path.write_text("{not json", encoding="utf-8")
+    assert HotkeyRegistry.from_file(path).chords() == HotkeyRegistry().chords()
+
+
+def test_listener_emits_signals_for_bound_chords(listener):
+    listener, backend, fired = listener
+    assert set(backend.registered) == {Chord.parse("<alt>+w"), Chord.parse("<alt>+<ctrl>+q")}
+
+    assert backend.press("<alt>+w")
+    assert backend.press("<ctrl>+<alt>+q")
+    assert not backend.press("<alt>+x")
+    assert fired == ["shown", SHOW_ACTION, "quit", QUIT_ACTION]
+
+
+def test_listener_rebind_registers_the_new_chord(listener):
+    listener, backend, fired = listener
+    listener.rebind(SHOW_ACTION, "<alt>+<space>")
+    assert not backend.press("<alt>+w")
+    assert backend.press("<alt>+<space>")
+    assert fired == ["shown", SHOW_ACTION]
+
+    listener.registry.bind("palette", "<ctrl>+<shift>+p")
+    listener.rebind("palette", "<ctrl>+<shift>+p")
+    assert backend.press("<shift>+<ctrl>+p")
+    assert fired[-1] == "palette"
+
+
+def test_listener_stop_ignores_later_presses(listener):
+    listener, backend, fired = listener
+    listener.stop_listening()
+    assert not backend.running
+    assert not backend.press("<alt>+w")
+    assert fired == []
+
+
+def test_listener_fails_when_a_chord_is_taken():
+    listener = GlobalHotkeyListener(backend=FakeHotkeyBackend(unavailable=("<alt>+w",)), registry=HotkeyRegistry())
+    with pytest.raises(HotkeyError):
+        listener.start_listening()
+    assert not listener.listening
+
+
+@pytest.mark.parametrize("action, previous", [(SHOW_ACTION, "<alt>+w"), ("palette", None)])
+def test_failed_rebind_restores_the_previous_binding(action, previous):
+    backend = FakeHotkeyBackend(unavailable=("<alt>+<space>",))
+    listener = GlobalHotkeyListener(backend=backend, registry=HotkeyRegistry())
+    listener.start_listening()
+    with pytest.raises(HotkeyError):
+        listener.rebind(action, "<alt>+<space>")
+
+    assert listener.listening and backend.running
+    assert listener.registry.chord(action) == (Chord.parse(previous) if previous else None)
+    assert not backend.press("<alt>+<space>")
+    assert backend.press("<alt>+w")
+    listener.stop_listening()
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.ipc_client import IpcClient
+from src.core.ipc_server import IpcServer
+from src.core.search_engine import search_windows
+from src.core.window_manager import WindowManager
+from src.utils.logger import IpcError
+
+
+def _fields(windows):
+    return [(w.handle, w.title, w.process_id, w.process_name, w.minimized) for w in windows]
+
+
+@pytest.fixture
+def served(tmp_path):
+    source = FakeWindowSource(seed=5)
+    source.populate(80)
+    manager = WindowManager(auto_start_monitoring=False, source=source, use_events=False,
+                            frecency=FrecencyStore(), use_warm_start=False)
+    manager.get_all_windows(force_refresh=True)
+    if sys.platform == "win32":
+        address = rf"\\.\pipe\tabber-test-{os.getpid()}"
+    else:
+        address = str(tmp_path / "tabber.sock")
+    server = IpcServer(manager, address=address)
+    server.start()
+    client = IpcClient(server.address)
+    yield source, manager, client
+    client.close()
+    server.stop()
+
+
+def test_search_matches_in_process_search(served):
+    _, manager, client = served
+    windows = manager.get_all_windows()
+    for query, limit in (("chrome", 5), ("code main", None), ("term", 1), ("zz", 3), ("", 4)):
+        assert _fields(client.search(query, limit=limit)) == _fields(search_windows(windows, query, limit=limit))
+    assert _fields(client.search("slack", min_score=60)) == _fields(search_windows(windows, "slack", min_score=60))
+
+
+def test_windows_lists_the_snapshot(served):
+    _, manager, client = served
+    assert _fields(client.windows()) == _fields(manager.get_all_windows())
+
+
+def test_switch_focuses_the_window(served):
+    _, manager, client = served
+    target = manager.get_all_windows()[-1]
+    assert client.switch(target.handle)
+    assert _fields(manager.get_all_windows(force_refresh=True))[0] == _fields([target])[0]
+    assert not client.switch(max(w.handle for w in manager.get_all_windows()) + 1000)
+
+
+def test_batch_and_errors(served):
+    _, manager, client = served
+    found, missing, switched = client.batch([("search", {"query": "chrome", "limit": 2}), ("bogus", {}),
+                                             ("switch", {"handle": manager.get_all_windows()[1].handle})])
+    assert len(found) <= 2
+    assert isinstance(missing, IpcError)
+    assert switched is True
+    with pytest.raises(IpcError):
+        client.call("search")
+
+
+def test_subscribers_receive_change_events(served):
+    source, manager, client = served
+    generation = client.subscribe()
+    source.churn(3)
+    manager.get_all_windows(force_refresh=True)
+    event = client.next_event(timeout=2)
+    assert event is not None and event["generation"] > generation
+
+    client.unsubscribe()
+    source.churn(3)
+    manager.get_all_windows(force_refresh=True)
+    assert client.next_event(timeout=0.3) is None
@@ -0,0 +1,123 @@
+import os
+import random
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from src.core.query import QueryPlan, parse_query
+from src.core.search_engine import SearchCache, search_windows, search_windows_reference
+from src.core.search_index import SearchIndex
+
+SIZES = (0, 1, 50, 400)
+FILTERS = ["p:chrome", "-p:explorer", "p:code p:slack", "p:chr", "p:chrome.exe", "p:winword", "p:zzz",
+           "is:minimized", "-is:minimized", "is:min", "is:bogus", 't:"google chrome"', "t:stack", "-t:slack",
+           'p:msedge -t:"new tab"', "-p:c", "p:firefox is:minimized"]
+TEXTS = ["", "chrome", "code main", "vsc", "zz"]
+
+
+def _handles(windows):
+    return [window.handle for window in windows]
+
+
+def _process_matches(names, process, processes):
+    """A name matches its process exactly, with or without extension, else any process it prefixes."""
+    def keys(name):
+        return {name, os.path.splitext(name)[0]}
+
+    for name in names:
+        if any(name in keys(other) for other in processes):
+            if name in keys(process):
+                return True
+        elif process.startswith(name):
+            return True
+    return False
+
+
+def _filtered(windows, plan):
+    """Applies a plan's filters by brute force."""
+    processes = {window.process_name.lower() for window in windows}
+    kept = []
+    for window in windows:
+        process, title = window.process_name.lower(), window.title.lower()
+        if plan.processes and not _process_matches(plan.processes, process, processes):
+            continue
+        if plan.excluded_processes and _process_matches(plan.excluded_processes, process, processes):
+            continue
+        if not all(phrase in title for phrase in plan.phrases):
+            continue
+        if any(phrase in title for phrase in plan.excluded_phrases):
+            continue
+        if any(state != "minimized" or not window.minimized for state in plan.states):
+            continue
+        if "minimized" in plan.excluded_states and window.minimized:
+            continue
+        kept.append(window)
+    return kept
+
+
+@pytest.fixture(scope="module", params=SIZES)
+def corpus(request):
+    windows = generate_corpus(request.param, seed=request.param)
+    rng = random.Random(request.param)
+    for window in windows:
+        window.minimized = rng.random() < 0.3
+    return windows, SearchIndex(windows, 1)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Chrome", QueryPlan("chrome")),
+    ("p:chrome tabs", QueryPlan("tabs", processes=("chrome",))),
+    ("-p:Explorer -p:explorer", QueryPlan("", excluded_processes=("explorer",))),
+    ('t:"Stack Over" foo', QueryPlan("foo", phrases=("stack over",))),
+    ('-t:"new tab', QueryPlan("", excluded_phrases=("new tab",))),
+    ("is:min code", QueryPlan("code", states=("minimized",))),
+    ("-is:m", QueryPlan("", excluded_states=("minimized",))),
+    ("is:bogus", QueryPlan("", states=("bogus",))),
+    ("p: chrome", QueryPlan("chrome")),
+    ("p:", QueryPlan("")),
+    ("http://x this:y", QueryPlan("http://x this:y")),
+    ('p:code -p:slack t:"main" -is:minimized  read   me',
+     QueryPlan("read me", ("code",), ("slack",), ("main",), (), (), ("minimized",))),
+])
+def test_parse_query(query, expected):
+    plan = parse_query(query)
+    assert (plan.text, plan.filter_key()) == (expected.text, expected.filter_key())
+    assert plan.filtered == expected.filtered
+
+
+def test_candidates_match_brute_force(corpus):
+    windows, index = corpus
+    for query in FILTERS:
+        plan = parse_query(query)
+        assert _handles(windows[i] for i in plan.candidates(index)) == _handles(_filtered(windows, plan)), query
+    assert parse_query("chrome").candidates(index) is None
+
+
+@pytest.mark.parametrize("limit", [None, 3])
+def test_filtered_search_matches_reference(corpus, limit):
+    windows, index = corpus
+    for query in (f"{query_filter} {text}" for query_filter in FILTERS for text in TEXTS):
+        plan = parse_query(query)
+        kept = _filtered(windows, plan)
+        expected = _handles(search_windows_reference(kept, plan.text) if plan.text else kept)
+        expected = expected if limit is None else expected[:limit]
+        assert _handles(search_windows(index, query, limit=limit)) == expected, query
+
+
+def test_typed_phrases_narrow_cached_candidates(corpus):
+    windows, index = corpus
+    cache = SearchCache()
+    typed = 'p:chrome t:"google chrome" -t:new'
+    for end in range(1, len(typed) + 1):
+        query = typed[:end]
+        plan = parse_query(query)
+        kept = _filtered(windows, plan)
+        expected = _handles(search_windows_reference(kept, plan.text) if plan.text else kept)
+        assert _handles(cache.search(index, query)) == expected, query
+
+    # A longer phrase starts from the candidates cached for the phrase typed so far.
+    plan = parse_query('p:chrome t:"google chromebook"')
+    shorter = parse_query('p:chrome t:"google chrome"').candidates(index)
+    assert plan._phrase_prefix_candidates(index) is shorter
+    assert _handles(windows[i] for i in plan.candidates(index)) == _handles(_filtered(windows, plan))
+    assert parse_query('p:chrome t:"yahoo"')._phrase_prefix_candidates(index) is None
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+from PyQt5.QtCore import QCoreApplication, qInstallMessageHandler
+from PyQt5.QtTest import QAbstractItemModelTester
+
+from src.core.window import Window
+from src.ui.results_model import HandleRole, ResultsModel
+
+
+def _windows(handles, title="Window"):
+    return [Window(handle, f"{title} {handle}", 100, "app.exe") for handle in handles]
+
+
+def _rows(model):
+    return [model.index(row).data(HandleRole) for row in range(model.rowCount())]
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def model(app):
+    """A model checked by QAbstractItemModelTester; any warning it reports fails the test."""
+    problems = []
+
+    def collect(mode, context, message):
+        problems.append(message)
+
+    previous = qInstallMessageHandler(collect)
+    model = ResultsModel()
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    yield model
+    qInstallMessageHandler(previous)
+    del tester
+    assert problems == []
+
+
+def _update(model, handles, title="Window"):
+    """Sets rows and returns how many row operations that took."""
+    before = model.row_operations
+    model.set_windows(_windows(handles, title))
+    assert _rows(model) == list(handles)
+    return model.row_operations - before
+
+
+def test_reorder_moves_rows(model):
+    _update(model, [1, 2, 3, 4])
+    assert _update(model, [3, 1, 2, 4]) == 1
+    assert _update(model, [4, 2, 1, 3]) == 3
+    assert _update(model, [4, 2, 1, 3]) == 0
+
+
+def test_insert_only_inserts_rows(model):
+    _update(model, [1, 3])
+    assert _update(model, [1, 2, 3, 4]) == 2
+    assert _update(model, [0, 1, 2, 3, 4]) == 1
+
+
+def test_remove_only_removes_contiguous_runs(model):
+    _update(model, [1, 2, 3, 4, 5, 6])
+    assert _update(model, [1, 4, 5]) == 2
+    assert _update(model, [5]) == 1
+    assert _update(model, []) == 1
+
+
+def test_retitled_rows_change_in_place(model):
+    _update(model, [1, 2, 3])
+    assert _update(model, [1, 2, 3], title="Renamed") == 3
+    assert _update(model, [1, 2, 3], title="Renamed") == 0
+
+
+def test_duplicate_handles_reset_the_model(model):
+    _update(model, [1, 2])
+    before = model.row_operations
+    model.set_windows(_windows([3, 3]))
+    assert model.row_operations - before == 1
+    assert _rows(model) == [3, 3]
+
+
+def test_random_updates_end_in_the_target_rows(model):
+    rng = random.Random(7)
+    for _ in range(300):
+        handles = rng.sample(range(12), rng.randint(0, 8))
+        operations = _update(model, handles, title=rng.choice(["A", "B"]))
+        assert operations <= 2 * len(handles) + 12
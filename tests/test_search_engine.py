@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.corpus import KEYSTROKE_SESSIONS, generate_corpus, replay
+from src.core.search_engine import SearchCache, search_windows, search_windows_reference
+from src.core.search_index import SearchIndex
+
+SIZES = (0, 1, 7, 120, 600)
+LIMITS = (None, 1, 3, 10)
+QUERIES = ["chrome", "c", "vsc", "main py", "vis stu", "slack #dev", "zürich", "東京", "xyzzy", "a b", "  Code  "]
+QUERIES += sorted({query for session in KEYSTROKE_SESSIONS for query in replay(session) if query.strip()})
+
+
+def _handles(windows):
+    return [window.handle for window in windows]
+
+
+@pytest.fixture(scope="module", params=SIZES)
+def corpus(request):
+    windows = generate_corpus(request.param, seed=request.param)
+    return windows, SearchIndex(windows, 1)
+
+
+@pytest.mark.parametrize("min_score", [0.0, 40.0, 75.0])
+def test_batch_search_matches_reference(corpus, min_score):
+    windows, index = corpus
+    for query in QUERIES:
+        reference = _handles(search_windows_reference(windows, query, min_score))
+        for limit in LIMITS:
+            expected = reference if limit is None else reference[:limit]
+            assert _handles(search_windows(windows, query, min_score, limit=limit)) == expected, (query, limit)
+            assert _handles(search_windows(index, query, min_score, limit=limit)) == expected, (query, limit)
+
+
+def test_empty_query_keeps_window_order(corpus):
+    windows, index = corpus
+    assert _handles(search_windows(windows, "   ")) == _handles(windows)
+    assert _handles(search_windows(index, "", limit=3)) == _handles(windows[:3])
+
+
+@pytest.mark.parametrize("min_score, limit", [(0.0, None), (50.0, None), (0.0, 3), (30.0, 10)])
+def test_cache_matches_reference_while_typing(corpus, min_score, limit):
+    windows, index = corpus
+    cache = SearchCache()
+    for session in KEYSTROKE_SESSIONS:
+        for query in replay(session):
+            expected = _handles(search_windows_reference(windows, query, min_score))
+            if limit is not None and query.strip():
+                expected = expected[:limit]
+            elif limit is not None:
+                expected = _handles(windows[:limit])
+            assert _handles(cache.search(index, query, min_score, limit=limit)) == expected, query
+
+
+def test_cache_refines_only_with_a_cutoff():
+    index = SearchIndex(generate_corpus(300), 1)
+    unbounded, limited = SearchCache(), SearchCache()
+    for query in replay("chrome"):
+        unbounded.search(index, query)
+        limited.search(index, query, limit=3)
+    assert unbounded.refinements == 0
+    assert limited.refinements == len("chrome") - 1
@@ -0,0 +1,35 @@
+import struct
+
+from src.core.warm_start import WARM_START_MAGIC, load_warm_start, save_warm_start
+from src.core.window import Window
+from src.core.window_source import ProcessInfo
+
+
+def _fields(windows):
+    return [(w.handle, w.title, w.process_id, w.process_name, w.minimized) for w in windows]
+
+
+def test_round_trip_keeps_minimized_state(tmp_path):
+    path = tmp_path / "warm_start.bin"
+    processes = [ProcessInfo(10, 1.5, "chrome.exe", r"C:\chrome.exe"), ProcessInfo(20, 2.5, "code.exe")]
+    windows = [Window(0x1001, "Inbox - Google Chrome", 10, "chrome.exe"),
+               Window(0x1002, "main.py - Visual Studio Code", 20, "code.exe", minimized=True),
+               Window(0x1003, "Überblick ✓", 10, "chrome.exe", minimized=True)]
+    save_warm_start(path, windows, processes + [ProcessInfo(30, 3.5, "idle.exe")])
+
+    loaded_windows, loaded_processes = load_warm_start(path)
+    assert _fields(loaded_windows) == _fields(windows)
+    assert [(p.process_id, p.create_time, p.name, p.exe) for p in loaded_processes] == [
+        (10, 1.5, "chrome.exe", r"C:\chrome.exe"), (20, 2.5, "code.exe", "")]
+
+
+def test_other_versions_and_corrupt_files_are_ignored(tmp_path):
+    path = tmp_path / "warm_start.bin"
+    assert load_warm_start(path) is None
+
+    path.write_bytes(struct.pack("<4sHII", WARM_START_MAGIC, 1, 0, 0))
+    assert load_warm_start(path) is None
+
+    save_warm_start(path, [Window(1, "title", 10, "a.exe")], [ProcessInfo(10, 1.0, "a.exe")])
+    path.write_bytes(path.read_bytes()[:-10])
+    assert load_warm_start(path) is None
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+from src.core.fake_source import FakeWindowSource
+from src.core.frecency import FrecencyStore
+from src.core.window import Window
+from src.core.window_events import ScriptedEventSource, WindowEvent, WindowEventType, apply_window_event
+from src.core.window_manager import WindowManager
+
+SETTLE_TIMEOUT = 2.0
+
+
+def _fields(windows):
+    return [(w.handle, w.title, w.process_id, w.process_name, w.minimized) for w in windows]
+
+
+def _window(handle, title="title", minimized=False):
+    return Window(handle, title, 100, "app.exe", minimized)
+
+
+@pytest.fixture
+def scripted():
+    source = FakeWindowSource(seed=3)
+    source.populate(30)
+    events = ScriptedEventSource()
+    manager = WindowManager(source=source, event_source=events, frecency=FrecencyStore(),
+                            use_warm_start=False, inspection_workers=0)
+    yield source, events, manager
+    manager.stop_monitoring()
+
+
+def _assert_matches_enumeration(manager):
+    """Waits for the event thread to publish, then compares with a full enumeration."""
+    expected = _fields(manager._get_windows_now())
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    while _fields(manager.get_snapshot().windows) != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _fields(manager.get_snapshot().windows) == expected
+
+
+def test_scripted_events_keep_snapshot_equal_to_enumeration(scripted):
+    source, events, manager = scripted
+    handles = [window.handle for window in manager.get_snapshot().windows]
+    assert events.running
+
+    created = source.add_window("Release notes - Google Chrome", "chrome.exe")
+    events.play([(WindowEventType.CREATED, created)])
+    _assert_matches_enumeration(manager)
+
+    source.close_window(handles[0])
+    events.play([(WindowEventType.DESTROYED, handles[0])])
+    _assert_matches_enumeration(manager)
+
+    source.set_visible(handles[1], False)
+    events.play([(WindowEventType.HIDDEN, handles[1])])
+    _assert_matches_enumeration(manager)
+
+    source.set_visible(handles[1], True)
+    events.play([(WindowEventType.SHOWN, handles[1])])
+    _assert_matches_enumeration(manager)
+
+    source.set_title(handles[2], "Renamed window")
+    events.play([(WindowEventType.NAME_CHANGED, handles[2])])
+    _assert_matches_enumeration(manager)
+
+    source.set_minimized(handles[3], True)
+    events.play([(WindowEventType.STATE_CHANGED, handles[3])])
+    _assert_matches_enumeration(manager)
+
+    source.focus(handles[4])
+    events.play([(WindowEventType.FOREGROUND, handles[4])])
+    _assert_matches_enumeration(manager)
+
+
+def test_event_bursts_coalesce_into_one_consistent_snapshot(scripted):
+    source, events, manager = scripted
+    handles = [window.handle for window in manager.get_snapshot().windows]
+    script = []
+    for handle in handles[:5]:
+        source.set_title(handle, f"Burst {handle}")
+        script.append((WindowEventType.NAME_CHANGED, handle))
+    source.set_minimized(handles[5], True)
+    source.focus(handles[6])
+    source.close_window(handles[7])
+    script += [(WindowEventType.STATE_CHANGED, handles[5]), (WindowEventType.FOREGROUND, handles[6]),
+               (WindowEventType.DESTROYED, handles[7])]
+    events.play(script)
+    _assert_matches_enumeration(manager)
+
+
+
+def test_destroyed_window_releases_its_process_for_a_reused_pid(scripted):
+    source, events, manager = scripted
+    process_id = source.add_process("old.exe")
+    old = source.add_window("Old tool", "old.exe", process_id=process_id)
+    events.play([(WindowEventType.CREATED, old)])
+    _assert_matches_enumeration(manager)
+
+    source.close_window(old)
+    source.kill_process(process_id)
+    source.add_process("new.exe", process_id=process_id)
+    new = source.add_window("New tool", "new.exe", process_id=process_id)
+    events.play([(WindowEventType.DESTROYED, old), (WindowEventType.CREATED, new)])
+
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    while new not in [w.handle for w in manager.get_snapshot().windows] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    listed = {w.handle: w.process_name for w in manager.get_snapshot().windows}
+    assert old not in listed
+    assert listed[new] == "new.exe"
+
+def test_state_change_reranks_by_z_order():
+    windows = [_window(1), _window(2), _window(3)]
+    ranks = {2: 0, 3: 1, 1: 2}
+    updated = apply_window_event(windows, WindowEvent(WindowEventType.STATE_CHANGED, 1),
+                                 lambda handle: _window(handle, minimized=True), lambda: ranks)
+    assert [window.handle for window in updated] == [2, 3, 1]
+    assert updated[2].minimized
+
+
+def test_state_change_without_changes_is_ignored():
+    windows = [_window(1), _window(2)]
+    ranks = {1: 0, 2: 1}
+    assert apply_window_event(windows, WindowEvent(WindowEventType.STATE_CHANGED, 2),
+                              _window, lambda: ranks) is None
+
+
+def test_window_missing_from_z_order_is_inserted_at_top():
+    windows = [_window(1), _window(2)]
+    updated = apply_window_event(windows, WindowEvent(WindowEventType.CREATED, 9), _window, lambda: {1: 0, 2: 1})
+    assert [window.handle for window in updated] == [9, 1, 2]
+
+
+def test_shown_window_is_placed_by_z_order():
+    windows = [_window(1), _window(2)]
+    updated = apply_window_event(windows, WindowEvent(WindowEventType.SHOWN, 9), _window,
+                                 lambda: {1: 0, 9: 1, 2: 2})
+    assert [window.handle for window in updated] == [1, 9, 2]
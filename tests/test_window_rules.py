@@ -0,0 +1,98 @@
+import itertools
+import json
+import re
+
+import pytest
+
+from src.core.window_rules import (EXCLUDED_CLASSES, MIN_WINDOW_HEIGHT, MIN_WINDOW_WIDTH, SYSTEM_PROCESSES,
+                                   WindowFacts, WindowFilter, WindowRule)
+from src.core.window_source import WS_CAPTION, WS_EX_NOACTIVATE, WS_EX_TOOLWINDOW, WS_VISIBLE
+
+WS_EX_APPWINDOW = 0x00040000
+WS_BORDER = 0x00800000
+WS_DLGFRAME = 0x00400000
+
+STYLES = (WS_VISIBLE | WS_CAPTION, WS_VISIBLE | WS_BORDER, WS_VISIBLE | WS_DLGFRAME, WS_VISIBLE,
+          WS_CAPTION, WS_BORDER, 0)
+EX_STYLES = (0, WS_EX_APPWINDOW, WS_EX_TOOLWINDOW, WS_EX_NOACTIVATE)
+CLASSES = ("Chrome_WidgetWin_1", "Progman", "progman", "WORKERW", "Windows.UI.Core.CoreWindow")
+SIZES = ((1280, 720), (MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT), (MIN_WINDOW_WIDTH - 1, 600),
+         (800, MIN_WINDOW_HEIGHT - 1))
+PROCESSES = ("chrome.exe", "dwm.exe", "DWM.EXE", "TextInputHost.exe", "textinputhost.exe")
+
+
+def _baseline(facts, process_name):
+    """The hard-coded checks the default rules replaced."""
+    if facts.ex_style & (WS_EX_TOOLWINDOW | WS_EX_NOACTIVATE):
+        return False
+    if not (facts.style & WS_VISIBLE) or not (facts.style & WS_CAPTION):
+        return False
+    if facts.class_name in EXCLUDED_CLASSES:
+        return False
+    width, height = facts.size
+    if not facts.minimized and (width < MIN_WINDOW_WIDTH or height < MIN_WINDOW_HEIGHT):
+        return False
+    return process_name not in SYSTEM_PROCESSES
+
+
+def _verdict(window_filter, handle, facts, process_name):
+    verdict = window_filter.check_window(handle, facts)
+    return verdict if verdict is not None else window_filter.check_process(handle, facts, process_name)
+
+
+def test_default_rules_match_baseline_filter():
+    window_filter = WindowFilter()
+    cases = itertools.product(STYLES, EX_STYLES, CLASSES, (False, True), SIZES, PROCESSES)
+    for handle, (style, ex_style, class_name, minimized, size, process) in enumerate(cases, 1):
+        facts = WindowFacts(style, ex_style, class_name, minimized, size, "Title")
+        expected = _baseline(facts, process)
+        assert _verdict(window_filter, handle, facts, process) == expected, (
+            style, ex_style, class_name, minimized, size, process)
+
+
+def test_default_rules_compare_names_exactly():
+    window_filter = WindowFilter()
+    visible = WS_VISIBLE | WS_CAPTION
+    assert _verdict(window_filter, 1, WindowFacts(visible, 0, "Progman", False, (800, 600), "t"), "a.exe") is False
+    assert _verdict(window_filter, 2, WindowFacts(visible, 0, "progman", False, (800, 600), "t"), "a.exe") is True
+    assert _verdict(window_filter, 3, WindowFacts(visible, 0, "App", False, (800, 600), "t"), "dwm.exe") is False
+    assert _verdict(window_filter, 4, WindowFacts(visible, 0, "App", False, (800, 600), "t"), "Dwm.exe") is True
+
+
+@pytest.mark.parametrize("ignore_case, expected", [(True, False), (False, True)])
+def test_user_rules_ignore_case_unless_disabled(ignore_case, expected):
+    rule = WindowRule.from_dict({"action": "exclude", "process": "Spotify.exe", "class": "SpotifyMainWindow",
+                                 "ignore_case": ignore_case})
+    window_filter = WindowFilter([rule], use_defaults=False)
+    facts = WindowFacts(WS_VISIBLE | WS_CAPTION, 0, "spotifymainwindow", False, (800, 600), "Spotify")
+    assert _verdict(window_filter, 1, facts, "SPOTIFY.EXE") is expected
+
+
+def test_style_none_rules_are_not_merged_across_masks():
+    window_filter = WindowFilter([WindowRule("exclude", style_none=WS_BORDER),
+                                  WindowRule("exclude", style_none=WS_DLGFRAME)], use_defaults=False)
+    assert _verdict(window_filter, 1, WindowFacts(WS_BORDER, 0, "App", False, (800, 600), "t"), "a.exe") is False
+    assert _verdict(window_filter, 2, WindowFacts(WS_CAPTION, 0, "App", False, (800, 600), "t"), "a.exe") is True
+
+
+def test_title_patterns_that_cannot_be_merged_do_not_break_loading(tmp_path):
+    path = tmp_path / "filter_rules.json"
+    path.write_text(json.dumps({"rules": [
+        {"action": "exclude", "title": "(?i)zoom"},
+        {"action": "exclude", "title": "Teams"},
+        {"action": "exclude", "title": "(?P<app>Slack)"},
+        {"action": "exclude", "title": "(?P<app>Discord)"},
+        {"action": "exclude", "title": r"(ab)\1"},
+    ], "use_defaults": False}), encoding="utf-8")
+    window_filter = WindowFilter.from_file(path)
+    assert len(window_filter.rules) == 4
+
+    def excluded(handle, title):
+        facts = WindowFacts(WS_VISIBLE | WS_CAPTION, 0, "App", False, (800, 600), title)
+        return _verdict(window_filter, handle, facts, "a.exe") is False
+
+    assert [excluded(handle, title) for handle, title in enumerate(
+        ("Zoom Meeting", "Microsoft Teams", "Slack | general", "Discord", "abab", "ab"), 1)] == [
+        False, True, True, True, True, False]
+    with pytest.raises(re.error):
+        WindowRule("exclude", title="(?i)zoom")